@@ -4,15 +4,13 @@
 # ==============================================================================
 
 import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-from matplotlib.patches import FancyBboxPatch
 import numpy as np
 
-# Configurar fuente Palatino Linotype
-plt.rcParams['font.family'] = 'serif'
-plt.rcParams['font.serif'] = ['TeX Gyre Pagella', 'Palatino Linotype', 'Palatino', 'URW Palladio L', 'serif']
-#plt.rcParams['font.serif'] = ['Palatino Linotype', 'Palatino', 'URW Palladio L', 'TeX Gyre Pagella', 'serif']
-plt.rcParams['font.size'] = 16
+from arc_figures.style import PAGELLA, FigureSpec, apply_style, rounded_box, rounded_patch
+
+# Configurar fuente Palatino (TeX Gyre Pagella primero)
+SPEC = FigureSpec('Figure2_Technology_Taxonomy.png', font_size=16, serif=PAGELLA)
+apply_style(SPEC)
 
 # Datos del ARC Framework
 levels = {
@@ -74,12 +72,11 @@ for i, (level_key, level_data) in enumerate(levels.items()):
     x_left = x_center - width/2
     
     # Crear rectÃƒÂ¡ngulo con bordes redondeados
-    box = FancyBboxPatch((x_left, y), width, heights,
-                         boxstyle="round,pad=0.05",
-                         facecolor=level_data['color'],
-                         edgecolor='black',
-                         linewidth=2.5,
-                         alpha=0.85)
+    box = rounded_patch((x_left, y), width, heights, 0.05,
+                        facecolor=level_data['color'],
+                        edgecolor='black',
+                        linewidth=2.5,
+                        alpha=0.85)
     ax.add_patch(box)
     
     # Ajustes especÃƒÂ­ficos para Level 5 para evitar superposiciÃƒÂ³n
@@ -139,12 +136,8 @@ legend_text = (
 )
 ax.text(5, 1.2, legend_text,
        ha='center', va='top', fontsize=17, style='italic',
-       bbox=dict(boxstyle='round,pad=0.5', facecolor='#fff4e6', 
-                edgecolor='#ff9900', alpha=0.7))
+       bbox=rounded_box(0.5, facecolor='#fff4e6', edgecolor='#ff9900', alpha=0.7))
 
-plt.tight_layout()
-plt.savefig('Figure2_Technology_Taxonomy.png', dpi=300, bbox_inches='tight', 
-           facecolor='white')
-print("Figure 2 saved: Figure2_Technology_Taxonomy.png")
-print("Resolution: 300 DPI")
-plt.close()
\ No newline at end of file
+SPEC.save(fig)
+print(f"Figure 2 saved: {SPEC.output}")
+print(f"Resolution: {SPEC.dpi} DPI")
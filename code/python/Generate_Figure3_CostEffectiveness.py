@@ -6,16 +6,17 @@
 import matplotlib.pyplot as plt
 import numpy as np
 
+from arc_figures.costeff import COSTS, EFFECT_SIZES, TECHNOLOGIES
+from arc_figures.style import FigureSpec, apply_style, rounded_box
+
 # Configurar fuente Palatino Linotype
-plt.rcParams['font.family'] = 'serif'
-plt.rcParams['font.serif'] = ['Palatino Linotype', 'Palatino', 'URW Palladio L', 'serif']
-plt.rcParams['font.size'] = 14
+SPEC = FigureSpec('Figure3_Cost_Effectiveness.png', font_size=14)
+apply_style(SPEC)
 
 # Datos de cost-effectiveness
-technologies = ['Level 1:\nKits', 'Level 2:\nAdvanced', 'Level 3:\nDidactic',
-                'Level 4:\nSemi-Ind', 'Level 5:\nIndustrial', 'Remote Lab\n(Level 5)']
-costs = np.array([500, 800, 3500, 12000, 40000, 1500])
-effect_sizes = np.array([0.59, 0.64, 0.68, 0.73, 0.94, 0.89])
+technologies = list(TECHNOLOGIES)
+costs = COSTS
+effect_sizes = EFFECT_SIZES
 
 # Calcular impacto por $1000
 impact_per_1000 = (effect_sizes / costs) * 1000
@@ -46,8 +47,7 @@ for i in range(len(technologies)):
                xy=(costs[i], effect_sizes[i]),
                xytext=(costs[i] + offset_x, effect_sizes[i] + offset_y),
                fontsize=11, ha='center', va='bottom' if i != 4 else 'top',
-               bbox=dict(boxstyle='round,pad=0.4', 
-                        facecolor='white', edgecolor='gray', alpha=0.85),
+               bbox=rounded_box(0.4, facecolor='white', edgecolor='gray', alpha=0.85),
                fontweight='normal')
 
 # LÃ­nea de tendencia (physical labs)
@@ -91,15 +91,12 @@ insight_text = (
 )
 ax.text(0.98, 0.05, insight_text, transform=ax.transAxes,
        fontsize=13, ha='right', va='bottom',
-       bbox=dict(boxstyle='round,pad=0.6', facecolor='lightyellow',
-                edgecolor='orange', linewidth=2, alpha=0.9))
+       bbox=rounded_box(0.6, facecolor='lightyellow', edgecolor='orange',
+                        linewidth=2, alpha=0.9))
 
 # Ajustar tamaÃ±o de ticks
 ax.tick_params(axis='both', which='major', labelsize=11)
 
-plt.tight_layout()
-plt.savefig('Figure3_Cost_Effectiveness.png', dpi=300, bbox_inches='tight',
-           facecolor='white')
-print("Figure 3 saved: Figure3_Cost_Effectiveness.png")
-print("Resolution: 300 DPI")
-plt.close()
+SPEC.save(fig)
+print(f"Figure 3 saved: {SPEC.output}")
+print(f"Resolution: {SPEC.dpi} DPI")
@@ -4,27 +4,34 @@
 # ==============================================================================
 
 import matplotlib.pyplot as plt
-import pandas as pd
 import numpy as np
 
-# Configurar fuente Palatino Linotype
-plt.rcParams['font.family'] = 'serif'
-plt.rcParams['font.serif'] = ['Palatino Linotype', 'Palatino', 'URW Palladio L', 'serif']
-plt.rcParams['font.size'] = 11
-
-# Leer datos reales
-df = pd.read_csv('HRC_Aggregated_Fanuc.csv')
+from arc_figures.hrc import summarize_hrc
+from arc_figures.lod import minmax_indices, pixel_size, scatter_indices
+from arc_figures.style import FigureSpec, apply_style, rounded_box
 
-# Convertir Workload y Safety a escala 0-100 para mejor visualizaciÃ³n
-df['Workload_100'] = df['Workload'] * 100
-df['Safety_100'] = df['Safety'] * 100
+# Configurar fuente Palatino Linotype
+SPEC = FigureSpec('Figure4_HRC_Performance.png', font_size=11, layout_rect=(0, 0, 1, 0.99))
+apply_style(SPEC)
 
-# Tomar primeros 200 episodios
-df_plot = df.head(200).copy()
+# Leer datos reales por bloques (memoria acotada para logs de millones de episodios)
+# Workload y Safety se convierten a escala 0-100 para mejor visualizaciÃ³n
+window = 20
+n_episodes = 200  # Tomar primeros 200 episodios
+summary = summarize_hrc('HRC_Aggregated_Fanuc.csv', limit=n_episodes,
+                        keep=n_episodes, window=window)
+df_plot = summary.head
+episodes = df_plot['Episode'].to_numpy()
 
 # Crear figura con 4 subplots
+dpi = SPEC.dpi
 fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 11))
 
+# Nivel de detalle: como maximo primero/ultimo/min/max por columna de pixel a
+# la resolucion de salida (sin efecto mientras haya menos puntos que pixeles)
+def lod(ax, values):
+    return minmax_indices(episodes, values, pixel_size(ax, dpi)[0])
+
 # Colores profesionales
 color_throughput = '#2E86AB'
 color_workload = '#A23B72'
@@ -33,15 +40,16 @@ color_safety = '#F18F01'
 # ==============================================================================
 # Panel (a): Throughput Evolution
 # ==============================================================================
-ax1.plot(df_plot['Episode'], df_plot['Throughput'], 
+idx = lod(ax1, df_plot['Throughput'])
+ax1.plot(episodes[idx], df_plot['Throughput'].to_numpy()[idx], 
         linewidth=2.0, color=color_throughput, alpha=0.7)
-ax1.fill_between(df_plot['Episode'], df_plot['Throughput'], 
+ax1.fill_between(episodes[idx], df_plot['Throughput'].to_numpy()[idx], 
                  alpha=0.25, color=color_throughput)
 
 # Media mÃ³vil
-window = 20
-rolling_mean = df_plot['Throughput'].rolling(window=window).mean()
-ax1.plot(df_plot['Episode'], rolling_mean, 'r--', 
+rolling_mean = df_plot['Throughput_MA'].to_numpy()
+idx = lod(ax1, rolling_mean)
+ax1.plot(episodes[idx], rolling_mean[idx], 'r--', 
         linewidth=2.5, label=f'{window}-Episode Moving Avg', alpha=0.9)
 
 ax1.set_xlabel('Training Episode', fontsize=14, fontweight='bold')
@@ -52,27 +60,28 @@ ax1.legend(loc='lower right', fontsize=12, framealpha=0.95, edgecolor='black')
 ax1.tick_params(axis='both', labelsize=12)
 
 # EstadÃ­stica - mean line
-mean_throughput = df_plot['Throughput'].mean()
+mean_throughput = summary.means['Throughput']
 ax1.axhline(y=mean_throughput, color='green', linestyle=':', 
            linewidth=2.5, alpha=0.8, zorder=5)
 ax1.text(5, mean_throughput - 0.15, f'Mean: {mean_throughput:.2f}', 
         fontsize=12, color='green', fontweight='bold',
-        bbox=dict(boxstyle='round,pad=0.3', facecolor='white', 
-                 edgecolor='green', alpha=0.9))
+        bbox=rounded_box(0.3, facecolor='white', edgecolor='green', alpha=0.9))
 
 ax1.set_ylim([4.5, 7.0])
 
 # ==============================================================================
 # Panel (b): Human Workload (0-100 scale, lower is better)
 # ==============================================================================
-ax2.plot(df_plot['Episode'], df_plot['Workload_100'], 
+idx = lod(ax2, df_plot['Workload_100'])
+ax2.plot(episodes[idx], df_plot['Workload_100'].to_numpy()[idx], 
         linewidth=2.0, color=color_workload, alpha=0.7)
-ax2.fill_between(df_plot['Episode'], df_plot['Workload_100'], 
+ax2.fill_between(episodes[idx], df_plot['Workload_100'].to_numpy()[idx], 
                  alpha=0.25, color=color_workload)
 
 # Media mÃ³vil
-rolling_mean_wl = df_plot['Workload_100'].rolling(window=window).mean()
-ax2.plot(df_plot['Episode'], rolling_mean_wl, 'r--', 
+rolling_mean_wl = df_plot['Workload_100_MA'].to_numpy()
+idx = lod(ax2, rolling_mean_wl)
+ax2.plot(episodes[idx], rolling_mean_wl[idx], 'r--', 
         linewidth=2.5, label=f'{window}-Episode Moving Avg', alpha=0.9)
 
 ax2.set_xlabel('Training Episode', fontsize=14, fontweight='bold')
@@ -83,13 +92,12 @@ ax2.legend(loc='upper right', fontsize=12, framealpha=0.95, edgecolor='black')
 ax2.tick_params(axis='both', labelsize=12)
 
 # EstadÃ­stica - mean line
-mean_workload = df_plot['Workload_100'].mean()
+mean_workload = summary.means['Workload_100']
 ax2.axhline(y=mean_workload, color='blue', linestyle=':', 
            linewidth=2.5, alpha=0.8, zorder=5)
 ax2.text(5, mean_workload + 1.5, f'Mean: {mean_workload:.2f}', 
         fontsize=12, color='blue', fontweight='bold',
-        bbox=dict(boxstyle='round,pad=0.3', facecolor='white', 
-                 edgecolor='blue', alpha=0.9))
+        bbox=rounded_box(0.3, facecolor='white', edgecolor='blue', alpha=0.9))
 
 ax2.set_ylim([60, 90])
 ax2.invert_yaxis()  # Invertir porque menor es mejor
@@ -97,14 +105,16 @@ ax2.invert_yaxis()  # Invertir porque menor es mejor
 # ==============================================================================
 # Panel (c): Safety Score (0-100 scale, higher is better)
 # ==============================================================================
-ax3.plot(df_plot['Episode'], df_plot['Safety_100'], 
+idx = lod(ax3, df_plot['Safety_100'])
+ax3.plot(episodes[idx], df_plot['Safety_100'].to_numpy()[idx], 
         linewidth=2.0, color=color_safety, alpha=0.7)
-ax3.fill_between(df_plot['Episode'], df_plot['Safety_100'], 
+ax3.fill_between(episodes[idx], df_plot['Safety_100'].to_numpy()[idx], 
                  alpha=0.25, color=color_safety)
 
 # Media mÃ³vil
-rolling_mean_sf = df_plot['Safety_100'].rolling(window=window).mean()
-ax3.plot(df_plot['Episode'], rolling_mean_sf, 'r--', 
+rolling_mean_sf = df_plot['Safety_100_MA'].to_numpy()
+idx = lod(ax3, rolling_mean_sf)
+ax3.plot(episodes[idx], rolling_mean_sf[idx], 'r--', 
         linewidth=2.5, label=f'{window}-Episode Moving Avg', alpha=0.9)
 
 ax3.set_xlabel('Training Episode', fontsize=14, fontweight='bold')
@@ -115,21 +125,27 @@ ax3.legend(loc='lower right', fontsize=12, framealpha=0.95, edgecolor='black')
 ax3.tick_params(axis='both', labelsize=12)
 
 # EstadÃ­stica - mean line
-mean_safety = df_plot['Safety_100'].mean()
+mean_safety = summary.means['Safety_100']
 ax3.axhline(y=mean_safety, color='darkgreen', linestyle=':', 
            linewidth=2.5, alpha=0.8, zorder=5)
 ax3.text(5, mean_safety - 2.5, f'Mean: {mean_safety:.2f}', 
         fontsize=12, color='darkgreen', fontweight='bold',
-        bbox=dict(boxstyle='round,pad=0.3', facecolor='white', 
-                 edgecolor='darkgreen', alpha=0.9))
+        bbox=rounded_box(0.3, facecolor='white', edgecolor='darkgreen', alpha=0.9))
 
 ax3.set_ylim([85, 101])
 
 # ==============================================================================
 # Panel (d): Multi-Objective Trade-off Space
 # ==============================================================================
-scatter = ax4.scatter(df_plot['Throughput'], df_plot['Workload_100'], 
-                     c=df_plot['Safety_100'], cmap='RdYlGn', 
+# Un marcador por celda de medio diametro (s=100 -> 10 pt); las estrellas
+# del frente de Pareto se dibujan siempre completas
+xlim_d, ylim_d = [5.2, 7.0], [60, 85]
+cell = np.sqrt(100) / 72 * dpi / 2
+idx = scatter_indices(df_plot['Throughput'], df_plot['Workload_100'],
+                      xlim_d, ylim_d, pixel_size(ax4, dpi), cell=cell)
+df_scatter = df_plot.iloc[idx]
+scatter = ax4.scatter(df_scatter['Throughput'], df_scatter['Workload_100'], 
+                     c=df_scatter['Safety_100'], cmap='RdYlGn', 
                      s=100, alpha=0.7, edgecolors='black', linewidth=1.2,
                      vmin=90, vmax=100)
 
@@ -145,44 +161,33 @@ cbar = plt.colorbar(scatter, ax=ax4, pad=0.02)
 cbar.set_label('Safety Score', fontsize=13, fontweight='bold')
 cbar.ax.tick_params(labelsize=12)
 
-# Identificar regiÃ³n Pareto-optimal (alto throughput, bajo workload, alto safety)
-pareto_threshold = {
-    'throughput': df_plot['Throughput'].quantile(0.75),
-    'workload': df_plot['Workload_100'].quantile(0.25),
-    'safety': df_plot['Safety_100'].quantile(0.75)
-}
-
-pareto_points = df_plot[
-    (df_plot['Throughput'] >= pareto_threshold['throughput']) &
-    (df_plot['Workload_100'] <= pareto_threshold['workload']) &
-    (df_plot['Safety_100'] >= pareto_threshold['safety'])
-]
+# Frente de Pareto: episodios no dominados (alto throughput, bajo workload,
+# alto safety), calculado por ordenacion no dominada sobre los episodios
+# graficados (los primeros n_episodes del registro)
+pareto_points = summary.front
 
 if len(pareto_points) > 0:
     ax4.scatter(pareto_points['Throughput'], pareto_points['Workload_100'],
                s=200, marker='*', c='gold', edgecolors='darkgoldenrod', 
-               linewidth=2.5, label='Pareto-Optimal Region', zorder=10)
+               linewidth=2.5, label='Pareto Front (Non-Dominated)', zorder=10)
     ax4.legend(loc='lower left', fontsize=12, framealpha=0.95, edgecolor='black')
 
 # Ajustar lÃ­mites
-ax4.set_xlim([5.2, 7.0])
-ax4.set_ylim([60, 85])
+ax4.set_xlim(xlim_d)
+ax4.set_ylim(ylim_d)
 
 # TÃ­tulo general
 fig.suptitle('Adaptive Multi-Objective Reinforcement Learning for Human-Robot Collaboration\n' +
              'Performance Metrics: Fanuc M-20iA Industrial Manipulator',
              fontsize=17, fontweight='bold', y=0.995)
 
-plt.tight_layout(rect=[0, 0, 1, 0.99])
-plt.savefig('Figure4_HRC_Performance.png', dpi=300, bbox_inches='tight',
-           facecolor='white')
+SPEC.save(fig)
 
-print("Figure 4 saved: Figure4_HRC_Performance.png")
-print("Resolution: 300 DPI")
+print(f"Figure 4 saved: {SPEC.output}")
+print(f"Resolution: {SPEC.dpi} DPI")
 print("Data: Real Fanuc M-20iA metrics")
 print(f"\nStatistics:")
 print(f"  Throughput: Mean={mean_throughput:.3f} tasks/hour")
 print(f"  Workload: Mean={mean_workload:.2f}% (lower is better)")
 print(f"  Safety: Mean={mean_safety:.2f}% (higher is better)")
-print(f"  Pareto-optimal points: {len(pareto_points)}")
-plt.close()
+print(f"  Pareto-optimal (non-dominated) points: {len(pareto_points)}")
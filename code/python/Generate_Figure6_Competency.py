@@ -4,53 +4,19 @@
 # ==============================================================================
 
 import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-from matplotlib.patches import FancyBboxPatch, FancyArrowPatch
+from matplotlib.patches import FancyArrowPatch
 import numpy as np
 
-# Configurar fuente Palatino Linotype
-plt.rcParams['font.family'] = 'serif'
-plt.rcParams['font.serif'] = ['TeX Gyre Pagella', 'Palatino Linotype', 'Palatino', 'URW Palladio L', 'serif']
-plt.rcParams['font.size'] = 16
+from arc_figures.competency import COMPETENCY_LEVELS
+from arc_figures.progression import PRACTICE_HOURS, simulate
+from arc_figures.style import PAGELLA, FigureSpec, apply_style, rounded_box, rounded_patch
+
+# Configurar fuente Palatino (TeX Gyre Pagella primero)
+SPEC = FigureSpec('Figure6_Competency_Progression.png', font_size=16, serif=PAGELLA)
+apply_style(SPEC)
 
 # Definir niveles de competencia
-competency_levels = {
-    'Level 1': {
-        'name': 'Novice',
-        'description': 'Follows explicit instructions.\nLearns basic concepts.\nExplores robotics.',
-        'tech_level': 'Educational Kits\n(LEGO Mindstorms)',
-        'pedagogy': 'Direct instruction,\nDemonstrations,\nHands-on exploration',
-        'color': '#f3effa'
-    },
-    'Level 2': {
-        'name': 'Advanced Beginner',
-        'description': 'Operates systems with guidance.\nRecognizes patterns.\nBegins programming.',
-        'tech_level': 'Advanced Kits\n(LEGO EV3, Arduino)',
-        'pedagogy': 'Guided inquiry,\nScaffolded activities,\nPeer collaboration',
-        'color': '#d4ddf5'
-    },
-    'Level 3': {
-        'name': 'Competent',
-        'description': 'Plans and executes tasks\nwith industrial systems.\nApplies theory to practice.',
-        'tech_level': 'Advanced Educational\n(Dobot, Niryo)',
-        'pedagogy': 'Project-based learning,\nLab practicals,\nTeam challenges',
-        'color': '#b5cbf0'
-    },
-    'Level 4': {
-        'name': 'Proficient',
-        'description': 'Integrated system operation,\ntroubleshooting complex issues.\nDevelops solutions.',
-        'tech_level': 'Didactic Industrial\n(SCORBOT, UR3)',
-        'pedagogy': 'Capstone projects,\nCase-based learning,\nInternships',
-        'color': '#96b9ea'
-    },
-    'Level 5': {
-        'name': 'Expert',
-        'description': 'Autonomous problem-solving,\nsystem design, and optimization.\nMentors others.',
-        'tech_level': 'Industrial-Grade\n(UR5e, KUKA)',
-        'pedagogy': 'Self-directed projects,\nResearch & Development,\nIndustry partnerships',
-        'color': '#77a7e5'
-    }
-}
+competency_levels = COMPETENCY_LEVELS
 
 # Crear figura
 fig, ax = plt.subplots(figsize=(16, 11)) # (figsize=(14, 11))
@@ -77,8 +43,7 @@ for i, (level_key, level_data) in enumerate(competency_levels.items()):
     y = y_positions[i]
     
     # Caja principal (nivel de competencia)
-    main_box = FancyBboxPatch((0, y), 3.5, box_height,
-                             boxstyle="round,pad=0.08",
+    main_box = rounded_patch((0, y), 3.5, box_height, 0.08,
                              facecolor=level_data['color'],
                              edgecolor='black',
                              linewidth=2.5,
@@ -100,8 +65,7 @@ for i, (level_key, level_data) in enumerate(competency_levels.items()):
            multialignment='center')
     
     # Caja de tecnologÃ­a (derecha)
-    tech_box = FancyBboxPatch((4.0, y), 3.2, box_height,
-                             boxstyle="round,pad=0.08",
+    tech_box = rounded_patch((4.0, y), 3.2, box_height, 0.08,
                              facecolor='#5b9bd5',
                              edgecolor='black',
                              linewidth=2,
@@ -113,8 +77,7 @@ for i, (level_key, level_data) in enumerate(competency_levels.items()):
            multialignment='center', fontweight='bold')
     
     # Caja de pedagogÃ­a (extrema derecha)
-    ped_box = FancyBboxPatch((7.7, y), 3.8, box_height,
-                            boxstyle="round,pad=0.08",
+    ped_box = rounded_patch((7.7, y), 3.8, box_height, 0.08,
                             facecolor='#70ad47',
                             edgecolor='black',
                             linewidth=2,
@@ -145,48 +108,40 @@ for i in range(4):
 # Headers para las columnas
 ax.text(1.75, 10.8, 'Competency Level\n& Characteristics', 
        fontsize=16, fontweight='bold', ha='center',
-       bbox=dict(boxstyle='round,pad=0.5', facecolor='#d4ddf5', 
-                edgecolor='black', linewidth=2))
+       bbox=rounded_box(0.5, facecolor='#d4ddf5', edgecolor='black', linewidth=2))
 
 ax.text(5.6, 10.8, 'Technology\nLevel', 
        fontsize=16, fontweight='bold', ha='center',
-       bbox=dict(boxstyle='round,pad=0.5', facecolor='#77B5FE', 
-                edgecolor='black', linewidth=2))
+       bbox=rounded_box(0.5, facecolor='#77B5FE', edgecolor='black', linewidth=2))
 
 ax.text(9.6, 10.8, 'Pedagogical\nApproaches', 
        fontsize=16, fontweight='bold', ha='center',
-       bbox=dict(boxstyle='round,pad=0.5', facecolor='#3CB371', 
-                edgecolor='black', linewidth=2))
+       bbox=rounded_box(0.5, facecolor='#3CB371', edgecolor='black', linewidth=2))
 
-# Indicador de tiempo estimado
-time_labels = ['~3+ years', '~2 years', '~1.5 years', '~1 year', '~6 months']
+# Indicador de tiempo estimado (mediana simulada del tiempo hasta cada nivel)
+time_labels = simulate().labels()
 for i, time_label in enumerate(time_labels):
     y = y_positions[i] + box_height/2
     ax.text(12.0, y, time_label,
            fontsize=14, ha='left', va='center',
-           bbox=dict(boxstyle='round,pad=0.3', facecolor='#FFD300', 
-                    alpha=0.6, edgecolor='black'))
+           bbox=rounded_box(0.3, facecolor='#FFD300', alpha=0.6, edgecolor='black'))
 
 ax.text(12.0, 10.8, 'Typical\nDuration',
        fontsize=16, fontweight='bold', ha='left',
-       bbox=dict(boxstyle='round,pad=0.4', facecolor='#FED83A', 
-                edgecolor='black', linewidth=1.5))
+       bbox=rounded_box(0.4, facecolor='#FED83A', edgecolor='black', linewidth=1.5))
 
 # Nota metodolÃ³gica
 note_text = (
     "Progression Model based on Dreyfus Model of Skill Acquisition (Dreyfus & Dreyfus, 1980)\n"
     "adapted for industrial automation education. Advancement through levels requires\n"
-    "demonstrated competency mastery and typically involves 200-300 hours of practice per level."
+    f"demonstrated competency mastery and typically involves {PRACTICE_HOURS[0]:.0f}-"
+    f"{PRACTICE_HOURS[1]:.0f} hours of practice per level."
 )
 ax.text(6.5, 0.8, note_text,
        ha='center', va='center', fontsize=17, style='italic',
-       bbox=dict(boxstyle='round,pad=0.5', facecolor='#fff4e6',
-                edgecolor='#ff9900', linewidth=2, alpha=0.9))
-
-plt.tight_layout()
-plt.savefig('Figure6_Competency_Progression.png', dpi=300, bbox_inches='tight',
-           facecolor='white')
-print("Figure 6 saved: Figure6_Competency_Progression.png")
-print("Resolution: 300 DPI")
-plt.close()
-plt.close()
\ No newline at end of file
+       bbox=rounded_box(0.5, facecolor='#fff4e6', edgecolor='#ff9900',
+                        linewidth=2, alpha=0.9))
+
+SPEC.save(fig)
+print(f"Figure 6 saved: {SPEC.output}")
+print(f"Resolution: {SPEC.dpi} DPI")
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# ==============================================================================
+# FIGURE 7: Forest Plot - Industrial Robotics Education (12 of 52 studies)
+# ==============================================================================
+# Version Python de code/r/Paper_Figure_7.R (metafor::rma, method="REML")
+
+import matplotlib.pyplot as plt
+from matplotlib.patches import Patch, Polygon, Rectangle
+import numpy as np
+
+from arc_figures.meta import group_counts, rma, studies_table
+from arc_figures.style import FigureSpec, apply_style
+
+# Configurar fuente Palatino Linotype
+SPEC = FigureSpec('Figure7_Forest_Plot.png', font_size=11)
+apply_style(SPEC)
+
+# ==============================================================================
+# DATOS Y META-ANALISIS
+# ==============================================================================
+studies = studies_table()
+ma = rma(studies['g'], studies['Variance'], method='REML')
+
+# Subgrupos en una sola llamada vectorizada (una fila de conteos por grupo)
+groups, counts = group_counts(studies['Tech_Level'],
+                              ['Industrial', 'Educational', 'Semi-Industrial'])
+ma_groups = rma(studies['g'], studies['Variance'], counts, method='REML')
+
+# ==============================================================================
+# FIGURA
+# ==============================================================================
+k = len(studies)
+rows = np.arange(k, 0, -1)        # Estudio i en la fila k - i + 1
+xlim = (-1.0, 2.3)
+alim = (-0.2, 1.4)
+navy = 'navy'
+
+shading = {
+    'Industrial': (0.6, 0.75, 1, 0.70),
+    'Semi-Industrial': (0.8, 0.8, 0.8, 0.70),
+    'Educational': (1, 0.80, 0.45, 0.70),
+}
+
+fig, ax = plt.subplots(figsize=(1400 / 150, 1100 / 150))
+
+# Sombreado por nivel tecnologico
+for y, level in zip(rows, studies['Tech_Level']):
+    ax.add_patch(Rectangle((xlim[0], y - 0.45), xlim[1] - xlim[0], 0.9,
+                           facecolor=shading[level], edgecolor='none', zorder=0))
+
+# Intervalos de confianza y efectos individuales
+ci_half = 1.959964 * studies['SE']
+ax.hlines(rows, studies['g'] - ci_half, studies['g'] + ci_half,
+          color=navy, linewidth=1.0, zorder=2)
+ax.scatter(studies['g'], rows, marker='s', s=60, color=navy, zorder=3)
+
+# Diamante del efecto global (RE Model)
+ax.add_patch(Polygon([(ma.ci_lb, -1), (ma.estimate, -0.6),
+                      (ma.ci_ub, -1), (ma.estimate, -1.4)],
+                     closed=True, facecolor=navy, edgecolor=navy, zorder=3))
+
+# Linea de referencia y separadores
+ax.vlines(0, -1.5, k + 0.5, color='black', linestyle=':', linewidth=1.0)
+ax.hlines([0, k + 1], *xlim, color='black', linewidth=1.0)
+
+# Columnas de texto: estudio, N y tamano del efecto [IC 95%]
+text_size = 0.88 * 11
+for y, label, n, g, lo, hi in zip(rows, studies['Label'], studies['N'],
+                                  studies['g'], studies['g'] - ci_half,
+                                  studies['g'] + ci_half):
+    ax.text(xlim[0], y, label, ha='left', va='center', fontsize=text_size)
+    ax.text(-0.4, y, f'{n}', ha='left', va='center', fontsize=text_size)
+    ax.text(xlim[1], y, f'{g:.3f} [{lo:.3f}, {hi:.3f}]',
+            ha='right', va='center', fontsize=text_size)
+
+ax.text(xlim[0], -1, 'Overall Effect (RE Model)', ha='left', va='center',
+        fontsize=text_size)
+ax.text(xlim[1], -1, f'{ma.estimate:.3f} [{ma.ci_lb:.3f}, {ma.ci_ub:.3f}]',
+        ha='right', va='center', fontsize=text_size)
+
+# Encabezados
+header_y = k + 2
+ax.text(xlim[0], header_y, 'Study', ha='left', va='center',
+        fontsize=text_size, fontweight='bold')
+ax.text(-0.4, header_y, 'N', ha='left', va='center',
+        fontsize=text_size, fontweight='bold')
+ax.text(xlim[1], header_y, 'Effect Size [95% CI]', ha='right', va='center',
+        fontsize=text_size, fontweight='bold')
+
+# Eje x solo sobre el rango de efectos (alim), como forest() de metafor
+ax.set_xlim(xlim)
+ax.set_ylim(-2, k + 3)
+ax.set_xticks(np.arange(alim[0], alim[1] + 0.01, 0.2))
+ax.tick_params(axis='x', labelsize=text_size)
+ax.set_yticks([])
+for side in ('left', 'right', 'top'):
+    ax.spines[side].set_visible(False)
+ax.spines['bottom'].set_bounds(*alim)
+ax.set_xlabel("Hedges' g", fontsize=1.15 * 11)
+
+# Leyenda (3 niveles)
+legend_handles = [
+    Patch(facecolor=(0.6, 0.75, 1, 0.85), edgecolor=(0.3, 0.5, 0.9, 1),
+          label='Industrial-Grade Systems'),
+    Patch(facecolor=(0.8, 0.8, 0.8, 0.85), edgecolor=(0.5, 0.5, 0.5, 1),
+          label='Semi-Industrial'),
+    Patch(facecolor=(1, 0.80, 0.45, 0.85), edgecolor=(0.9, 0.6, 0.2, 1),
+          label='Educational Kits'),
+]
+legend = ax.legend(handles=legend_handles, title='Technology Level',
+                   loc='upper left', bbox_to_anchor=(0.345, k + 2.95),
+                   bbox_transform=ax.transData, fontsize=0.74 * 11,
+                   title_fontsize=0.78 * 11, frameon=True, fancybox=False)
+legend.get_frame().set_edgecolor('black')
+legend.get_frame().set_linewidth(1.2)
+legend.get_frame().set_alpha(1.0)
+
+SPEC.save(fig)
+
+# ==============================================================================
+# ESTADISTICAS
+# ==============================================================================
+print("=" * 80)
+print("META-ANALYSIS RESULTS - Forest Plot (12 representative studies from n=52)")
+print("=" * 80 + "\n")
+
+print("Overall Effect (Random-Effects Model):")
+print(f"  Hedges' g = {ma.estimate:.3f} [95% CI: {ma.ci_lb:.3f}, {ma.ci_ub:.3f}]")
+print(f"  Z = {ma.z:.3f}, p = {ma.p:.4f}\n")
+
+print("Heterogeneity Statistics:")
+print(f"  Q(df = {ma.Q_df}) = {ma.Q:.3f}, p = {ma.Q_p:.4f}")
+print(f"  I² = {ma.I2:.2f}%")
+print(f"  τ² = {ma.tau2:.4f}\n")
+
+print("Subgroup Analysis by Technology Level:")
+shade_names = {'Industrial': 'Industrial-Grade Systems (n = {}, BLUE shading)',
+               'Educational': 'Educational Kits (n = {}, ORANGE shading)',
+               'Semi-Industrial': 'Semi-Industrial (n = {}, GRAY shading)'}
+for i, group in enumerate(groups):
+    members = studies.loc[counts[i] > 0, 'Authors']
+    print(f"  {shade_names[group].format(len(members))}:")
+    if len(members) > 1:
+        print(f"    Pooled g = {ma_groups.estimate[i]:.3f} "
+              f"[95% CI: {ma_groups.ci_lb[i]:.3f}, {ma_groups.ci_ub[i]:.3f}]")
+        print(f"    Studies: {', '.join(members)}\n")
+    else:
+        print(f"    Studies: {', '.join(members)}")
+        print(f"    Effect size: g = {ma_groups.estimate[i]:.3f}\n")
+
+print("Between-Group Comparison:")
+diff_g = ma_groups.estimate[0] - ma_groups.estimate[1]
+print(f"  Difference: {diff_g:.3f} (Industrial > Educational)")
+print(f"  Relative improvement: {diff_g / ma_groups.estimate[1] * 100:.1f}%\n")
+
+print("Note: These 12 studies are representative of the full corpus of 52 studies")
+print("      analyzed in the systematic review (2019-2025).\n")
+print(f"Figure 7 saved: {SPEC.output}")
+print(f"Resolution: {SPEC.dpi} DPI")
+print("=" * 80)
@@ -0,0 +1,9 @@
+"""
+ARC Framework figure toolkit.
+
+Shared machinery behind the ``Generate_Figure*.py`` scripts in ``code/python``.
+Run ``python -m arc_figures --help`` from ``code/python`` for the command-line
+entry points.
+"""
+
+__version__ = "1.0.0"
@@ -0,0 +1,849 @@
+"""
+Command-line entry point: ``python -m arc_figures <command>``.
+
+Subcommand modules are imported lazily so that each command only pays for
+the libraries it actually uses.
+"""
+
+import argparse
+import sys
+import time
+
+
+def _cmd_build(args):
+    from .build import build, print_summary, select_figures
+    from .export import parse_exports
+
+    figures = select_figures(args.figures)
+    exports = parse_exports(args.formats)
+    start = time.perf_counter()
+    results = build(figures, jobs=args.jobs, force=args.force, exports=exports,
+                    optimize=args.optimize_png,
+                    profile=args.profile or ("full" if args.profile_dir else None),
+                    profile_dir=args.profile_dir)
+    failures = print_summary(results, time.perf_counter() - start)
+    return min(failures, 125)
+
+
+def _cmd_meta(args):
+    from pathlib import Path
+
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import pandas as pd
+
+    from .robustness import FIGURE_SPEC, load_studies, plot_influence, refits, summary_table
+    from .style import style_context
+
+    studies = load_studies(args.studies)
+    out = Path(args.out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    summaries, details = [], []
+    for by in [None, *args.by]:
+        grouping = by or "All"
+        table = refits(studies, by, args.method)
+        summary = summary_table(studies, by, args.method, n_boot=args.bootstrap,
+                                seed=args.seed, jobs=args.jobs, refit_table=table)
+        summaries.append(summary.assign(Grouping=grouping))
+        details.append(table.assign(Grouping=grouping))
+        if not args.no_plot:
+            suffix = f"_{by}" if by else ""
+            with style_context(FIGURE_SPEC):
+                plot_influence(table, summary, out / f"meta_influence{suffix}.png")
+
+    summary = pd.concat(summaries, ignore_index=True)
+    summary = summary[["Grouping", *summary.columns.drop("Grouping")]]
+    details = pd.concat(details, ignore_index=True)
+    details = details[["Grouping", *details.columns.drop("Grouping")]]
+    summary.to_csv(out / "meta_summary.csv", index=False)
+    details.to_csv(out / "meta_refits.csv", index=False)
+    with pd.option_context("display.width", 120, "display.max_columns", None,
+                           "display.precision", 3):
+        print(summary.drop(columns=["Q"]).to_string(index=False))
+    print(f"\nWrote {out / 'meta_summary.csv'} and {out / 'meta_refits.csv'}")
+    return 0
+
+
+def _cmd_sensitivity(args):
+    import matplotlib
+
+    matplotlib.use("Agg")
+    from .sensitivity import FIGURE_SPEC, load_sensitivity, plot_sensitivity
+    from .style import style_context
+
+    table = load_sensitivity(args.input)
+    if args.output:
+        table.to_csv(args.output, index=False)
+        print(f"Wrote {args.output} ({len(table)} configurations)")
+    if args.plot:
+        with style_context(FIGURE_SPEC):
+            plot_sensitivity(table, args.plot, dpi=args.dpi, per_row=args.per_row)
+        print(f"Wrote {args.plot}")
+    return 0
+
+
+def _cmd_gsa(args):
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import pandas as pd
+
+    from .gsa import (OATSurrogate, load_evaluator, morris_analysis, plot_indices,
+                      sobol_analysis)
+    from .sensitivity import FIGURE_SPEC, load_sensitivity
+    from .style import style_context
+
+    if args.evaluator:
+        evaluator = load_evaluator(args.evaluator)
+    else:
+        print("WARNING: no --evaluator given; using the additive interpolation of "
+              f"{args.sweep}, which has no interactions (S1 and ST coincide)",
+              file=sys.stderr)
+        evaluator = OATSurrogate(load_sensitivity(args.sweep))
+    bounds = (args.low, args.high)
+    if args.method == "sobol":
+        table = sobol_analysis(evaluator, n=args.samples, bounds=bounds,
+                               n_boot=args.bootstrap, seed=args.seed, jobs=args.jobs)
+    else:
+        table = morris_analysis(evaluator, r=args.trajectories, bounds=bounds,
+                                n_boot=args.bootstrap, seed=args.seed, jobs=args.jobs)
+    with pd.option_context("display.width", 120, "display.max_columns", None,
+                           "display.precision", 3):
+        print(table.to_string(index=False))
+    print(f"\n{table.attrs['evaluations']} model evaluations")
+    if args.output:
+        table.to_csv(args.output, index=False)
+        print(f"Wrote {args.output}")
+    if args.plot:
+        with style_context(FIGURE_SPEC):
+            plot_indices(table, args.plot, dpi=args.dpi)
+        print(f"Wrote {args.plot}")
+    return 0
+
+
+def _cmd_bench(args):
+    import json
+    from pathlib import Path
+
+    from .bench import compare, format_report, load_report, make_cases, run_suite
+    from .build import select_figures
+
+    cases = make_cases(select_figures(args.figures), args.episodes, args.rows)
+    baseline = load_report(args.compare) if args.compare else None
+    report = run_suite(cases, args.data_dir, args.repeat, args.warm_cache, args.seed,
+                       progress=lambda r: print(f"  {r.name}: "
+                                                + (f"{r.total:.2f} s" if not r.error
+                                                   else "FAILED"), flush=True))
+    print()
+    print(format_report(report))
+    Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nWrote {args.output}")
+    failed = sum(bool(c["error"]) for c in report["cases"])
+    if baseline is None:
+        return 1 if failed else 0
+    regressions = compare(report, baseline, args.threshold)
+    for name, phase, before, after in regressions:
+        print(f"REGRESSION {name} {phase}: {before:.3f} s -> {after:.3f} s "
+              f"({after / before if before else float('inf'):.2f}x)")
+    if not regressions:
+        print(f"No regressions against {args.compare} (threshold {args.threshold:.2f}x)")
+    return 1 if failed or regressions else 0
+
+
+def _cmd_stats(args):
+    import json
+    from pathlib import Path
+
+    from .stats import SECTIONS, collect
+
+    result = collect(args.only or SECTIONS, args.hrc, args.episodes or None, args.sensitivity)
+    text = json.dumps(result, indent=args.indent)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+def _episode_source(args, poll=None):
+    """Episode batches from the CSV or socket given to ``watch``/``dashboard``."""
+    from .live import POLL_SECONDS, listen, tail_csv
+
+    if (args.input is None) == (args.listen is None):
+        raise ValueError("give either a CSV to follow or --listen ADDRESS")
+    poll = POLL_SECONDS if poll is None else poll
+    if args.input is not None:
+        return tail_csv(args.input, poll, from_start=not args.from_end), args.input
+    return listen(args.listen, poll), args.listen
+
+
+def _cmd_compare(args):
+    import pandas as pd
+
+    from .compare import FIGURE_SPEC, bands_table, compare_runs, discover_runs, summary_table
+
+    start = time.perf_counter()
+    runs = discover_runs(args.runs, pattern=args.pattern) if args.pattern else \
+        discover_runs(args.runs)
+    robots = compare_runs(runs, window=args.window, jobs=args.jobs)
+    print(f"{len(runs)} runs, {len(robots)} robot(s), folded in "
+          f"{time.perf_counter() - start:.2f}s")
+    with pd.option_context("display.width", 120, "display.max_columns", None,
+                           "display.precision", 3):
+        print(summary_table(robots, args.confidence).to_string(index=False))
+    if args.output:
+        bands_table(robots, args.confidence).to_csv(args.output, index=False)
+        print(f"Wrote {args.output}")
+    if args.plot:
+        import matplotlib
+
+        matplotlib.use("Agg")
+        from .compare import plot_comparison
+        from .style import style_context
+
+        with style_context(FIGURE_SPEC):
+            plot_comparison(robots, args.plot, dpi=args.dpi, confidence=args.confidence,
+                            window=args.window)
+        print(f"Wrote {args.plot}")
+    return 0
+
+
+def _cmd_cea(args):
+    import numpy as np
+    import pandas as pd
+
+    from .costeff import FIGURE_SPEC, WTP_POINTS, simulate
+
+    start = time.perf_counter()
+    result = simulate(args.draws, seed=args.seed, chunk=args.chunk,
+                      wtp=np.linspace(0, args.wtp_max, WTP_POINTS))
+    print(f"{result.draws:,} draws in {time.perf_counter() - start:.2f}s")
+    with pd.option_context("display.width", 120, "display.max_columns", None,
+                           "display.precision", 3):
+        print(result.ranking_table().iloc[:, :6].to_string(index=False))
+    if args.output:
+        result.ranking_table().to_csv(args.output, index=False)
+        print(f"Wrote {args.output}")
+    if args.ceac:
+        result.ceac_table().to_csv(args.ceac, index=False)
+        print(f"Wrote {args.ceac}")
+    if args.plot:
+        import matplotlib
+
+        matplotlib.use("Agg")
+        from .costeff import plot_uncertainty
+        from .style import style_context
+
+        with style_context(FIGURE_SPEC):
+            plot_uncertainty(result, args.plot, dpi=args.dpi)
+        print(f"Wrote {args.plot}")
+    return 0
+
+
+def _cmd_portfolio(args):
+    import numpy as np
+    import pandas as pd
+
+    from .portfolio import FIGURE_SPEC, PortfolioOptimizer
+
+    optimizer = PortfolioOptimizer()
+    with pd.option_context("display.width", 120, "display.max_columns", None,
+                           "display.precision", 3):
+        if args.budget:
+            start = time.perf_counter()
+            allocations = [optimizer.solve(b, args.students, method=args.method)
+                           for b in args.budget]
+            elapsed = (time.perf_counter() - start) / len(allocations)
+            print(f"{args.students} students, {elapsed * 1000:.1f} ms per budget "
+                  f"({allocations[0].method})")
+            print(optimizer.table(allocations).to_string(index=False))
+        if args.frontier or args.plot:
+            start = time.perf_counter()
+            budgets = None
+            if args.max_budget:
+                budgets = np.linspace(0, args.max_budget, args.points + 1)
+            frontier = optimizer.frontier(args.students, budgets, method=args.method)
+            print(f"Frontier: {len(frontier)} budgets in {time.perf_counter() - start:.2f}s")
+            if args.frontier:
+                optimizer.table(frontier).to_csv(args.frontier, index=False)
+                print(f"Wrote {args.frontier}")
+            if args.plot:
+                import matplotlib
+
+                matplotlib.use("Agg")
+                from .portfolio import plot_frontier
+                from .style import style_context
+
+                with style_context(FIGURE_SPEC):
+                    plot_frontier(optimizer, frontier, args.plot, dpi=args.dpi)
+                print(f"Wrote {args.plot}")
+    return 0
+
+
+def _cmd_decide(args):
+    from .decision import WORKBOOK, load_model, recommend
+
+    start = time.perf_counter()
+    model = load_model(args.workbook or WORKBOOK, cache=not args.no_cache)
+    loaded = time.perf_counter()
+    table = recommend(args.profiles, model)
+    print(f"{len(table)} profiles scored in {time.perf_counter() - loaded:.3f}s "
+          f"(model ready in {loaded - start:.3f}s)")
+    counts = table.groupby(["Level", "Option"]).size().rename("Profiles").reset_index()
+    print(counts.to_string(index=False))
+    if args.output:
+        table.to_csv(args.output, index=False)
+        print(f"Wrote {args.output}")
+    return 0
+
+
+def _cmd_rubric(args):
+    from .competency import DREYFUS_LEVELS
+    from .rubrics import RUBRICS, load_rubrics, score_csv
+
+    rubrics = load_rubrics(args.workbook or RUBRICS)
+    if args.rubric not in rubrics:
+        raise ValueError(f"no rubric {args.rubric!r} (available: {', '.join(rubrics)})")
+    rubric = rubrics[args.rubric]
+    start = time.perf_counter()
+    counts = score_csv(args.records, rubric, args.output, chunksize=args.chunksize)
+    total = int(counts.sum())
+    print(f"{total} records scored against '{rubric.sheet}' in "
+          f"{time.perf_counter() - start:.2f}s")
+    for level, (name, count) in enumerate(zip(DREYFUS_LEVELS, counts), start=1):
+        share = count / total if total else 0.0
+        print(f"  Level {level} {name:<18} {count:>8} ({share:.1%})")
+    if args.output:
+        print(f"Wrote {args.output}")
+    return 0
+
+
+def _cmd_progression(args):
+    import pandas as pd
+
+    from .progression import FIGURE_SPEC, SCENARIOS, simulate, sweep
+
+    names = args.scenario or list(SCENARIOS)
+    start = time.perf_counter()
+    table = sweep({name: name for name in names}, learners=args.learners, seed=args.seed,
+                  jobs=args.jobs, horizon=args.horizon, hours_per_week=args.hours_per_week)
+    print(f"{len(names)} scenario(s) x {args.learners:,} learners in "
+          f"{time.perf_counter() - start:.2f}s")
+    columns = ["Scenario", "Level", "Competency", "P10_Years", "P50_Years", "P90_Years",
+               "Typical_Duration"] + (["Attained_By_Horizon"] if args.horizon else [])
+    with pd.option_context("display.width", 120, "display.max_columns", None,
+                           "display.precision", 2):
+        print(table[columns].to_string(index=False))
+    if args.output:
+        table.to_csv(args.output, index=False)
+        print(f"Wrote {args.output}")
+    if args.plot:
+        import matplotlib
+
+        matplotlib.use("Agg")
+        from .progression import plot_progression
+        from .style import style_context
+
+        result = simulate(names[0], learners=args.learners, seed=args.seed,
+                          hours_per_week=args.hours_per_week)
+        with style_context(FIGURE_SPEC):
+            plot_progression(result, args.plot, dpi=args.dpi)
+        print(f"Wrote {args.plot}")
+    return 0
+
+
+def _cmd_watch(args):
+    import json
+    import os
+    from pathlib import Path
+
+    from .live import OnlineHRC, watch
+    from .stats import json_number, summary_stats
+
+    source, label = _episode_source(args)
+
+    def report(aggregator):
+        stats = summary_stats(aggregator.snapshot(frames=False), label)
+        stats["rolling"] = {m: json_number(v) for m, v in aggregator.rolling().items()}
+        stats["skipped"] = aggregator.skipped
+        stats["updated"] = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+        text = json.dumps(stats, indent=2 if args.output else None)
+        if args.output:
+            out = Path(args.output)
+            tmp = out.with_name(f"{out.name}.tmp")
+            tmp.write_text(text + "\n", encoding="utf-8")
+            os.replace(tmp, out)
+        else:
+            print(text, flush=True)
+
+    aggregator = OnlineHRC(window=args.window, keep=0)
+    watch(source, aggregator, report, interval=args.interval, duration=args.duration)
+    return 0
+
+
+def _cmd_dashboard(args):
+    from pathlib import Path
+
+    from .dashboard import HRCDashboard, serve, write_page
+    from .live import POLL_SECONDS, OnlineHRC, watch
+
+    if args.serve is not None and args.headless is None:
+        raise ValueError("--serve needs --headless PNG")
+    source, label = _episode_source(args, poll=min(args.interval, POLL_SECONDS))
+    aggregator = OnlineHRC(window=args.window, keep=0)
+    if args.headless is None:
+        import matplotlib.pyplot as plt
+
+        dashboard = HRCDashboard(aggregator, dpi=args.dpi, span=args.span)
+        plt.show(block=False)
+
+        def alive():
+            if not plt.fignum_exists(dashboard.fig.number):
+                raise KeyboardInterrupt  # window closed
+
+        def update(board):
+            if plt.fignum_exists(board.fig.number):
+                board.refresh()
+
+        watch(source, dashboard, update, interval=args.interval, duration=args.duration,
+              on_poll=lambda: (alive(), dashboard.canvas.flush_events()))
+        return 0
+
+    png = Path(args.headless)
+    png.parent.mkdir(parents=True, exist_ok=True)
+    dashboard = HRCDashboard(aggregator, headless=True, dpi=args.dpi, span=args.span)
+    dashboard.write_png(png)
+    page = write_page(png, args.interval)
+    server = serve(png.parent, args.serve) if args.serve is not None else None
+    where = f"http://127.0.0.1:{args.serve}/{page.name}" if server else page
+    print(f"Dashboard of {label}: {png} (page: {where})", flush=True)
+
+    def update(board):
+        board.refresh()
+        board.write_png(png)
+
+    try:
+        watch(source, dashboard, update, interval=args.interval, duration=args.duration)
+    finally:
+        if server is not None:
+            server.shutdown()
+    return 0
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m arc_figures",
+        description="ARC Framework figure toolkit.",
+    )
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.required = True
+
+    build = commands.add_parser("build", help="render the paper figures in parallel")
+    build.add_argument(
+        "figures", nargs="*",
+        help="figure numbers or script names (default: all)",
+    )
+    build.add_argument(
+        "-j", "--jobs", type=int, default=None,
+        help="worker processes (default: available cores)",
+    )
+    build.add_argument(
+        "-f", "--force", action="store_true",
+        help="re-render figures even if their inputs are unchanged",
+    )
+    build.add_argument(
+        "--formats", metavar="LIST", default="",
+        help="extra outputs from the same draw, e.g. pdf,svg,tiff@600,png@96",
+    )
+    build.add_argument(
+        "--optimize-png", action="store_true",
+        help="losslessly optimize PNG outputs (smaller files, slower)",
+    )
+    build.add_argument(
+        "--profile", nargs="?", const="full", choices=("time", "full"), default=None,
+        help="report per-phase timings (full: also tracemalloc allocations); "
+             "re-renders every selected figure",
+    )
+    build.add_argument(
+        "--profile-dir", metavar="DIR", default=None,
+        help="write a cProfile dump and JSON report per figure (implies --profile)",
+    )
+    build.set_defaults(func=_cmd_build)
+
+    meta = commands.add_parser(
+        "meta", help="leave-one-out, cumulative and bootstrap meta-analysis re-fits",
+    )
+    meta.add_argument(
+        "--studies", metavar="CSV", default=None,
+        help="studies table with Authors, Year, g, SE (default: Figure 7 studies)",
+    )
+    meta.add_argument(
+        "--by", metavar="COLUMN", action="append", default=[],
+        help="also analyse subgroups of this column (repeatable)",
+    )
+    meta.add_argument("--method", choices=("REML", "DL"), default="REML")
+    meta.add_argument(
+        "--bootstrap", type=int, default=10_000, metavar="N",
+        help="bootstrap resamples per group (0 to skip; default: 10000)",
+    )
+    meta.add_argument("--seed", type=int, default=0, help="bootstrap seed")
+    meta.add_argument(
+        "-j", "--jobs", type=int, default=1,
+        help="worker processes for bootstrap chunks (default: 1)",
+    )
+    meta.add_argument(
+        "-o", "--out-dir", default=".",
+        help="directory for meta_summary.csv, meta_refits.csv and plots",
+    )
+    meta.add_argument("--no-plot", action="store_true", help="skip the influence plots")
+    meta.set_defaults(func=_cmd_meta)
+
+    sens = commands.add_parser(
+        "sensitivity", help="aggregate a parameter sweep and render it like Figure 5",
+    )
+    sens.add_argument(
+        "input", nargs="?", default="Sensitivity_Results_Fanuc_Shaded.csv",
+        help="per-trial (Parameter, Value, metrics) or aggregated sweep CSV",
+    )
+    sens.add_argument("-o", "--output", metavar="CSV", help="write the aggregated table")
+    sens.add_argument("--plot", metavar="PNG", help="render the grouped bar chart")
+    sens.add_argument("--dpi", type=int, default=300)
+    sens.add_argument(
+        "--per-row", type=int, default=12, metavar="N",
+        help="bars per row before the chart wraps (default: 12)",
+    )
+    sens.set_defaults(func=_cmd_sensitivity)
+
+    gsa = commands.add_parser(
+        "gsa", help="global Sobol or Morris sensitivity of the HRC parameters",
+    )
+    gsa.add_argument("--method", choices=("sobol", "morris"), default="sobol")
+    gsa.add_argument(
+        "--evaluator", metavar="MODULE:CALLABLE",
+        help="model mapping an (m, 4) array of multipliers to (m, 3) Throughput, "
+             "Workload and Safety outputs (default: interpolate --sweep)",
+    )
+    gsa.add_argument(
+        "--sweep", metavar="CSV", default="Sensitivity_Results_Fanuc_Shaded.csv",
+        help="one-at-a-time sweep interpolated as the model when no --evaluator "
+             "is given (default: Figure 5 sweep)",
+    )
+    gsa.add_argument(
+        "-n", "--samples", type=int, default=1024, metavar="N",
+        help="Sobol base samples, rounded up to a power of 2 (default: 1024)",
+    )
+    gsa.add_argument(
+        "-r", "--trajectories", type=int, default=100, metavar="R",
+        help="Morris trajectories (default: 100)",
+    )
+    gsa.add_argument("--low", type=float, default=0.9, help="lower multiplier bound")
+    gsa.add_argument("--high", type=float, default=1.1, help="upper multiplier bound")
+    gsa.add_argument(
+        "--bootstrap", type=int, default=1000, metavar="N",
+        help="bootstrap resamples for the confidence intervals (default: 1000)",
+    )
+    gsa.add_argument("--seed", type=int, default=0, help="sampling and bootstrap seed")
+    gsa.add_argument(
+        "-j", "--jobs", type=int, default=1,
+        help="worker processes for model evaluation (default: 1)",
+    )
+    gsa.add_argument("-o", "--output", metavar="CSV", help="write the indices table")
+    gsa.add_argument("--plot", metavar="PNG", help="render the tornado chart")
+    gsa.add_argument("--dpi", type=int, default=300)
+    gsa.set_defaults(func=_cmd_gsa)
+
+    stats = commands.add_parser(
+        "stats", help="Figure 4/5 statistics as JSON, without Matplotlib",
+    )
+    stats.add_argument(
+        "--only", choices=("hrc", "sensitivity"), action="append", default=None,
+        help="report only this section (repeatable; default: both)",
+    )
+    stats.add_argument(
+        "--hrc", metavar="CSV", default="HRC_Aggregated_Fanuc.csv",
+        help="HRC episode log (default: Figure 4 data)",
+    )
+    stats.add_argument(
+        "--episodes", type=int, default=200, metavar="N",
+        help="leading episodes summarised, as in Figure 4 (0: whole log; default: 200)",
+    )
+    stats.add_argument(
+        "--sensitivity", metavar="CSV", default="Sensitivity_Results_Fanuc_Shaded.csv",
+        help="per-trial or aggregated sweep (default: Figure 5 data)",
+    )
+    stats.add_argument("-o", "--output", metavar="JSON", help="write to a file instead of stdout")
+    stats.add_argument("--indent", type=int, default=2, help="JSON indentation (default: 2)")
+    stats.set_defaults(func=_cmd_stats)
+
+    compare = commands.add_parser(
+        "compare", help="compare HRC runs across robots and seeds (Figure 4 with CI bands)",
+    )
+    compare.add_argument(
+        "runs", nargs="+",
+        help="run CSVs, directories (searched recursively) or quoted glob patterns",
+    )
+    compare.add_argument(
+        "--pattern", metavar="REGEX",
+        help="regex with 'robot' and 'seed' groups matched against file names "
+             "(default: <robot>_seed<k>, else the sub-directory)",
+    )
+    compare.add_argument(
+        "--window", type=int, default=20,
+        help="rolling-mean window applied to each run (default: 20; 1 for raw episodes)",
+    )
+    compare.add_argument(
+        "--confidence", type=float, default=0.95, help="confidence level of the bands",
+    )
+    compare.add_argument(
+        "-j", "--jobs", type=int, default=None, help="loader threads (default: up to 8)",
+    )
+    compare.add_argument("-o", "--output", metavar="CSV", help="write the per-episode bands")
+    compare.add_argument("--plot", metavar="IMAGE", help="render the comparison figure")
+    compare.add_argument("--dpi", type=int, default=300)
+    compare.set_defaults(func=_cmd_compare)
+
+    cea = commands.add_parser(
+        "cea", help="Monte Carlo cost-effectiveness of the Figure 3 technologies",
+    )
+    cea.add_argument(
+        "--draws", type=int, default=1_000_000, help="Monte Carlo draws (default: 1000000)",
+    )
+    cea.add_argument(
+        "--chunk", type=int, default=250_000, help="draws per vectorized block (default: 250000)",
+    )
+    cea.add_argument("--seed", type=int, default=0, help="sampling seed")
+    cea.add_argument(
+        "--wtp-max", type=float, default=100_000, metavar="USD",
+        help="upper end of the willingness-to-pay axis of the CEAC (default: 100000)",
+    )
+    cea.add_argument("-o", "--output", metavar="CSV", help="write the ROI ranking table")
+    cea.add_argument("--ceac", metavar="CSV", help="write the acceptability curves")
+    cea.add_argument("--plot", metavar="IMAGE", help="render the uncertainty figure")
+    cea.add_argument("--dpi", type=int, default=300)
+    cea.set_defaults(func=_cmd_cea)
+
+    portfolio = commands.add_parser(
+        "portfolio", help="budget-constrained allocation of a cohort to the Figure 3 technologies",
+    )
+    portfolio.add_argument("--students", type=int, required=True, help="cohort size")
+    portfolio.add_argument(
+        "--budget", type=float, action="append", metavar="USD",
+        help="total budget to allocate (repeatable)",
+    )
+    portfolio.add_argument(
+        "--method", choices=("auto", "dp", "ilp"), default="auto",
+        help="exact solver (default: cached DP table or ILP for single budgets, DP for "
+             "frontiers while its table is small)",
+    )
+    portfolio.add_argument("--frontier", metavar="CSV", help="write the efficient frontier")
+    portfolio.add_argument(
+        "--max-budget", type=float, metavar="USD",
+        help="sweep evenly spaced budgets up to this value instead of the exact frontier",
+    )
+    portfolio.add_argument(
+        "--points", type=int, default=200, help="budgets in the --max-budget sweep (default: 200)",
+    )
+    portfolio.add_argument("--plot", metavar="IMAGE", help="render the frontier figure")
+    portfolio.add_argument("--dpi", type=int, default=300)
+    portfolio.set_defaults(func=_cmd_portfolio)
+
+    decide = commands.add_parser(
+        "decide", help="recommend a technology level for many institution profiles",
+    )
+    decide.add_argument(
+        "profiles",
+        help="CSV with budget, students, student_level, prior_experience, "
+             "learning_objectives, lab_space, safety_systems, support_staff",
+    )
+    decide.add_argument(
+        "--workbook", metavar="XLSX",
+        help="decision tool workbook (default: supplementary/Technology_Selection_Decision_Tool.xlsx)",
+    )
+    decide.add_argument(
+        "--no-cache", action="store_true", help="recompile the workbook instead of the cached model",
+    )
+    decide.add_argument("-o", "--output", metavar="CSV", help="write one recommendation per profile")
+    decide.set_defaults(func=_cmd_decide)
+
+    rubric = commands.add_parser(
+        "rubric", help="grade assessment records with the ARC rubrics (Dreyfus levels)",
+    )
+    rubric.add_argument(
+        "records", help="CSV with one row per student and one column per rubric criterion",
+    )
+    rubric.add_argument(
+        "--rubric", default="overall",
+        help="rubric sheet: overall, technical or project (default: overall)",
+    )
+    rubric.add_argument(
+        "--workbook", metavar="XLSX",
+        help="rubric workbook (default: supplementary/Assessment_Rubrics.xlsx)",
+    )
+    rubric.add_argument(
+        "--chunksize", type=int, default=100_000, help="records per chunk (default: 100000)",
+    )
+    rubric.add_argument("-o", "--output", metavar="CSV", help="write the graded records")
+    rubric.set_defaults(func=_cmd_rubric)
+
+    progression = commands.add_parser(
+        "progression", help="simulate cohorts through the Figure 6 competency levels",
+    )
+    progression.add_argument(
+        "--scenario", action="append",
+        help="technology mix: pathway, kits, remote, blended or a technology name "
+             "(repeatable; default: the four named mixes)",
+    )
+    progression.add_argument(
+        "--learners", type=int, default=100_000, help="simulated learners (default: 100000)",
+    )
+    progression.add_argument(
+        "--hours-per-week", type=float, default=10.0,
+        help="practice hours per week of the median learner (default: 10)",
+    )
+    progression.add_argument(
+        "--horizon", type=float, metavar="YEARS",
+        help="also report the share of learners at each level after this many years",
+    )
+    progression.add_argument("--seed", type=int, default=0, help="sampling seed")
+    progression.add_argument(
+        "-j", "--jobs", type=int, default=1, help="worker processes for the scenarios",
+    )
+    progression.add_argument("-o", "--output", metavar="CSV", help="write the distributions")
+    progression.add_argument(
+        "--plot", metavar="IMAGE", help="render the progression curves of the first scenario",
+    )
+    progression.add_argument("--dpi", type=int, default=300)
+    progression.set_defaults(func=_cmd_progression)
+
+    watch = commands.add_parser(
+        "watch", help="live Figure 4 statistics of a running HRC training job",
+    )
+    watch.add_argument(
+        "input", nargs="?", default=None,
+        help="episode CSV to follow as it grows (like tail -f)",
+    )
+    watch.add_argument(
+        "--listen", metavar="ADDRESS",
+        help="receive CSV episode lines on a local socket (host:port or a Unix socket path)",
+    )
+    watch.add_argument(
+        "--from-end", action="store_true",
+        help="ignore episodes already in the CSV",
+    )
+    watch.add_argument("--window", type=int, default=20, help="rolling-mean window (default: 20)")
+    watch.add_argument(
+        "--interval", type=float, default=5.0, metavar="SECONDS",
+        help="seconds between snapshots (default: 5)",
+    )
+    watch.add_argument(
+        "--duration", type=float, default=None, metavar="SECONDS",
+        help="stop after this long (default: until interrupted)",
+    )
+    watch.add_argument(
+        "-o", "--output", metavar="JSON",
+        help="snapshot file, replaced atomically (default: one JSON line per snapshot on stdout)",
+    )
+    watch.set_defaults(func=_cmd_watch)
+
+    dashboard = commands.add_parser(
+        "dashboard", help="live-updating Figure 4 panels of a running HRC training job",
+    )
+    dashboard.add_argument(
+        "input", nargs="?", default=None,
+        help="episode CSV to follow as it grows (like tail -f)",
+    )
+    dashboard.add_argument(
+        "--listen", metavar="ADDRESS",
+        help="receive CSV episode lines on a local socket (host:port or a Unix socket path)",
+    )
+    dashboard.add_argument(
+        "--from-end", action="store_true",
+        help="ignore episodes already in the CSV",
+    )
+    dashboard.add_argument(
+        "--window", type=int, default=20, help="rolling-mean window (default: 20)",
+    )
+    dashboard.add_argument(
+        "--span", type=int, default=None, metavar="EPISODES",
+        help="show only the latest EPISODES episodes and their Pareto front "
+             "(default: the whole run)",
+    )
+    dashboard.add_argument(
+        "--interval", type=float, default=0.5, metavar="SECONDS",
+        help="seconds between refreshes (default: 0.5)",
+    )
+    dashboard.add_argument(
+        "--dpi", type=int, default=100, help="canvas resolution (default: 100)",
+    )
+    dashboard.add_argument(
+        "--headless", metavar="PNG",
+        help="no window: re-encode the figure to PNG after each refresh, with an "
+             "auto-reloading PNG-stem.html page next to it",
+    )
+    dashboard.add_argument(
+        "--serve", type=int, default=None, metavar="PORT",
+        help="with --headless, serve the page on http://127.0.0.1:PORT/",
+    )
+    dashboard.add_argument(
+        "--duration", type=float, default=None, metavar="SECONDS",
+        help="stop after this long (default: until interrupted)",
+    )
+    dashboard.set_defaults(func=_cmd_dashboard)
+
+    bench = commands.add_parser(
+        "bench", help="time the figure build on synthetic inputs of increasing size",
+    )
+    bench.add_argument(
+        "figures", nargs="*",
+        help="figure numbers or script names (default: all)",
+    )
+    bench.add_argument(
+        "--episodes", type=int, nargs="+", default=[1_000, 100_000, 10_000_000],
+        metavar="N", help="HRC log sizes for Figure 4 (default: 1000 100000 10000000)",
+    )
+    bench.add_argument(
+        "--rows", type=int, nargs="+", default=[12, 100, 1_000], metavar="N",
+        help="sweep sizes for Figure 5 (default: 12 100 1000)",
+    )
+    bench.add_argument(
+        "--repeat", type=int, default=3, metavar="N",
+        help="runs per case; medians are reported (default: 3)",
+    )
+    bench.add_argument(
+        "--warm-cache", action="store_true",
+        help="keep the CSV, font and text caches between runs of a case",
+    )
+    bench.add_argument("--seed", type=int, default=0, help="synthetic data seed")
+    bench.add_argument(
+        "--data-dir", metavar="DIR", default=None,
+        help="where synthetic inputs are generated and kept (default: temp dir)",
+    )
+    bench.add_argument(
+        "-o", "--output", metavar="JSON", default="arc_bench.json",
+        help="report file (default: arc_bench.json)",
+    )
+    bench.add_argument(
+        "--compare", metavar="JSON",
+        help="baseline report; exit 1 if a case or phase got slower",
+    )
+    bench.add_argument(
+        "--threshold", type=float, default=1.10,
+        help="slowdown ratio flagged as a regression (default: 1.10)",
+    )
+    bench.set_defaults(func=_cmd_bench)
+
+    return parser
+
+
+def main(argv=None):
+    args = make_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except ValueError as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,346 @@
+"""
+Benchmark suite for the figure build.
+
+Runs each figure script (and the full-log Figure 4 statistics) in a fresh
+interpreter on synthetic inputs of controlled size, and reports the wall time
+of each phase of :mod:`arc_figures.profiling` (import, CSV parse, load,
+transform, draw, layout, render, encode; exclusive, so ``total`` is their
+sum) and the peak RSS. Each case runs ``repeat`` times
+with an empty cache directory (cold CSV, font and text caches) unless
+``warm_cache`` is set; medians are reported. Results are stored as JSON so
+that runs can be compared (:func:`compare`) and regressions flagged.
+
+Usage (from ``code/python``)::
+
+    python -m arc_figures bench                         # every case
+    python -m arc_figures bench 4 --episodes 1000 100000 -o run.json
+    python -m arc_figures bench --compare baseline.json # flag regressions
+"""
+
+import json
+import math
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from .profiling import PHASES, ProfileSession
+
+# Heavy imports (NumPy, pandas, the build module) are deferred so that the
+# child interpreters time them in their ``import`` phase.
+PYTHON_DIR = Path(__file__).resolve().parent.parent
+
+DEFAULT_EPISODES = (1_000, 100_000, 10_000_000)
+DEFAULT_ROWS = (12, 100, 1_000)
+DEFAULT_REPEAT = 3
+# A phase regresses when slower than baseline x threshold and by at least
+# MIN_REGRESSION seconds (sub-50 ms phases are mostly noise).
+DEFAULT_THRESHOLD = 1.10
+MIN_REGRESSION = 0.05
+BENCH_VERSION = 2
+WRITE_CHUNK = 1_000_000
+
+HRC_FILE = "HRC_Aggregated_Fanuc.csv"
+SENSITIVITY_FILE = "Sensitivity_Results_Fanuc_Shaded.csv"
+
+
+@dataclass
+class Case:
+    """
+    One benchmark case.
+
+    Attributes:
+        name: Unique label, e.g. ``Figure4[100000]``.
+        script: Figure script to run, or None for the full-log HRC summary.
+        episodes: Rows of the synthetic HRC log (if the case reads it).
+        rows: Rows of the synthetic sensitivity table (if the case reads it).
+    """
+
+    name: str
+    script: str = None
+    episodes: int = None
+    rows: int = None
+
+
+@dataclass
+class CaseResult:
+    """Median phase timings (seconds) and peak RSS (MiB) of a case."""
+
+    name: str
+    seconds: dict
+    peak_rss_mib: float
+    runs: list = field(default_factory=list)
+    error: str = ""
+
+    @property
+    def total(self):
+        return sum(self.seconds.values())
+
+
+# ==============================================================================
+# Synthetic inputs
+# ==============================================================================
+
+def synthetic_hrc(path, episodes, seed=0):
+    """
+    Write an HRC episode log shaped like ``HRC_Aggregated_Fanuc.csv``.
+
+    Throughput, workload and safety follow noisy learning curves in the
+    ranges of the shipped log.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    path = Path(path)
+    with open(path, "w", encoding="utf-8", newline="") as fh:
+        fh.write("Episode,Throughput,Workload,Safety\n")
+        for start in range(0, episodes, WRITE_CHUNK):
+            n = min(WRITE_CHUNK, episodes - start)
+            episode = np.arange(start + 1, start + n + 1)
+            progress = 1 - np.exp(-episode / max(episodes / 5, 1))
+            throughput = 5.6 + 0.6 * progress + rng.normal(0, 0.25, n)
+            workload = 0.8 - 0.08 * progress + rng.normal(0, 0.04, n)
+            safety = np.minimum(1.0, 0.95 + 0.04 * progress + rng.normal(0, 0.02, n))
+            block = np.column_stack([episode, throughput, workload, safety])
+            np.savetxt(fh, block, fmt=["%d", "%.10g", "%.10g", "%.10g"], delimiter=",")
+    return path
+
+
+def synthetic_sensitivity(path, rows, seed=0):
+    """
+    Write an aggregated one-at-a-time sweep with ``rows`` configurations.
+
+    Parameters get an odd number of levels around the 1.0 baseline (3 for
+    the shipped 12-row size, up to 11 for larger sweeps).
+    """
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    levels = min(11, max(3, 2 * int(math.sqrt(rows) / 2) + 1))
+    n_params = math.ceil(rows / levels)
+    values = np.round(np.linspace(0.9, 1.1, levels), 4)
+    records = []
+    for p in range(n_params):
+        effect = rng.normal(0, 1, 3)
+        for v in values:
+            shift = (v - 1) * effect
+            records.append({
+                "Parameter": f"param{p + 1}", "Value": v,
+                "Throughput": 3.5 * (1 + shift[0]), "Workload": 1230 * (1 + shift[1]),
+                "Safety": min(1.0, 0.999 * (1 + 0.01 * shift[2])),
+                "Std_Throughput": 0.1, "Std_Workload": 30.0, "Std_Safety": 0.002,
+            })
+    pd.DataFrame(records[:rows]).to_csv(path, index=False)
+    return Path(path)
+
+
+def prepare_inputs(case, data_dir, seed=0):
+    """
+    Directory holding the synthetic inputs of ``case`` under their usual names.
+
+    Inputs are generated once per size and seed and reused across runs.
+    """
+    parts = []
+    if case.episodes is not None:
+        parts.append(f"e{case.episodes}")
+    if case.rows is not None:
+        parts.append(f"r{case.rows}")
+    workdir = Path(data_dir) / ("_".join(parts) or "static") / f"seed{seed}"
+    workdir.mkdir(parents=True, exist_ok=True)
+    if case.episodes is not None and not (workdir / HRC_FILE).is_file():
+        synthetic_hrc(workdir / f"{HRC_FILE}.tmp", case.episodes, seed).rename(workdir / HRC_FILE)
+    if case.rows is not None and not (workdir / SENSITIVITY_FILE).is_file():
+        synthetic_sensitivity(workdir / f"{SENSITIVITY_FILE}.tmp", case.rows, seed) \
+            .rename(workdir / SENSITIVITY_FILE)
+    return workdir
+
+
+# ==============================================================================
+# Cases
+# ==============================================================================
+
+def make_cases(figures=None, episodes=DEFAULT_EPISODES, rows=DEFAULT_ROWS):
+    """
+    Benchmark cases for the selected figure records.
+
+    Figure 4 gets one case per log size plus an ``hrc_summary`` case over
+    the whole log (the script itself only plots the first 200 episodes);
+    Figure 5 gets one case per sweep size; the other figures have fixed
+    inputs and one case each.
+    """
+    from .build import FIGURES
+
+    cases = []
+    for figure in figures or FIGURES:
+        if HRC_FILE in figure.inputs:
+            for n in episodes:
+                cases.append(Case(f"{Path(figure.script).stem}[{n}]", figure.script, episodes=n))
+                cases.append(Case(f"hrc_summary[{n}]", episodes=n))
+        elif SENSITIVITY_FILE in figure.inputs:
+            cases += [Case(f"{Path(figure.script).stem}[{n}]", figure.script, rows=n)
+                      for n in rows]
+        else:
+            cases.append(Case(Path(figure.script).stem, figure.script))
+    return cases
+
+
+# ==============================================================================
+# Child process
+# ==============================================================================
+
+def _peak_rss_mib():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def _child(case_json):
+    """Run one case in this (fresh) interpreter; print its timings as JSON."""
+    import contextlib
+    import io
+    import runpy
+
+    case = Case(**json.loads(case_json))
+    with contextlib.redirect_stdout(io.StringIO()), ProfileSession(case.name) as session:
+        if case.script:
+            runpy.run_path(str(PYTHON_DIR / case.script), run_name="__main__")
+        else:
+            from .hrc import summarize_hrc
+
+            summarize_hrc(HRC_FILE, keep=0)
+    seconds = {p: row["seconds"] for p, row in session.report()["phases"].items()}
+    print(json.dumps({"seconds": seconds, "peak_rss_mib": _peak_rss_mib()}))
+
+
+def run_case(case, data_dir, repeat=DEFAULT_REPEAT, warm_cache=False, seed=0):
+    """
+    Run ``case`` ``repeat`` times, each in a fresh interpreter.
+
+    Returns:
+        CaseResult with the median of every phase and the largest peak RSS.
+    """
+    workdir = prepare_inputs(case, data_dir, seed)
+    cache = Path(data_dir) / "cache" / case.name
+    env = dict(os.environ, MPLBACKEND="Agg", ARC_CACHE_DIR=str(cache),
+               PYTHONPATH=os.pathsep.join(filter(None, [str(PYTHON_DIR),
+                                                        os.environ.get("PYTHONPATH")])))
+    env.pop("ARC_EXPORT", None)
+    runs = []
+    for _ in range(repeat):
+        if not warm_cache:
+            shutil.rmtree(cache, ignore_errors=True)
+        proc = subprocess.run(
+            [sys.executable, "-m", "arc_figures.bench", json.dumps(asdict(case))],
+            cwd=workdir, env=env, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            return CaseResult(case.name, {}, None, runs, proc.stderr.strip()[-2000:])
+        runs.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+    seconds = {p: statistics.median(r["seconds"][p] for r in runs) for p in PHASES}
+    rss = [r["peak_rss_mib"] for r in runs if r["peak_rss_mib"] is not None]
+    return CaseResult(case.name, seconds, max(rss) if rss else None, runs)
+
+
+def run_suite(cases, data_dir=None, repeat=DEFAULT_REPEAT, warm_cache=False, seed=0,
+              progress=None):
+    """
+    Run every case and collect the results into a JSON-serialisable report.
+
+    Args:
+        data_dir: Where synthetic inputs and caches are kept (default: a
+            ``bench`` directory in the system temp dir, reused across runs).
+        progress: Optional callable receiving each CaseResult as it finishes.
+    """
+    import matplotlib
+    import numpy as np
+    import pandas as pd
+
+    data_dir = Path(data_dir or Path(tempfile.gettempdir()) / "arc_bench")
+    results = []
+    for case in cases:
+        result = run_case(case, data_dir, repeat, warm_cache, seed)
+        results.append(result)
+        if progress:
+            progress(result)
+    return {
+        "version": BENCH_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "matplotlib": matplotlib.__version__,
+        },
+        "settings": {"repeat": repeat, "warm_cache": warm_cache, "seed": seed},
+        "cases": [
+            {"name": r.name, "seconds": r.seconds, "total": r.total,
+             "peak_rss_mib": r.peak_rss_mib, "error": r.error}
+            for r in results
+        ],
+    }
+
+
+# ==============================================================================
+# Reporting
+# ==============================================================================
+
+def compare(report, baseline, threshold=DEFAULT_THRESHOLD, min_delta=MIN_REGRESSION):
+    """
+    Flag cases and phases slower than in ``baseline``.
+
+    Returns:
+        List of ``(case, phase, baseline_seconds, seconds)`` regressions;
+        ``phase`` is ``"total"`` for the whole case.
+    """
+    previous = {c["name"]: c for c in baseline.get("cases", []) if not c.get("error")}
+    regressions = []
+    for case in report["cases"]:
+        old = previous.get(case["name"])
+        if old is None or case["error"]:
+            continue
+        pairs = [("total", old["total"], case["total"])]
+        pairs += [(p, old["seconds"].get(p, 0.0), case["seconds"][p]) for p in PHASES]
+        for phase, before, after in pairs:
+            if after > before * threshold and after - before >= min_delta:
+                regressions.append((case["name"], phase, before, after))
+    return regressions
+
+
+def format_report(report):
+    """Fixed-width table of a report's cases."""
+    width = max([len("case")] + [len(c["name"]) for c in report["cases"]])
+    header = f"{'case':<{width}} " + " ".join(f"{p:>9}" for p in PHASES) \
+        + f" {'total':>8} {'RSS MiB':>8}"
+    lines = [header, "-" * len(header)]
+    for case in report["cases"]:
+        if case["error"]:
+            lines.append(f"{case['name']:<{width}} FAILED: {case['error'].splitlines()[-1]}")
+            continue
+        cells = " ".join(f"{case['seconds'][p]:9.3f}" for p in PHASES)
+        rss = "-" if case["peak_rss_mib"] is None else f"{case['peak_rss_mib']:.0f}"
+        lines.append(f"{case['name']:<{width}} {cells} {case['total']:8.3f} {rss:>8}")
+    return "\n".join(lines)
+
+
+def load_report(path):
+    """Read a JSON report written by ``python -m arc_figures bench -o``."""
+    report = json.loads(Path(path).read_text(encoding="utf-8"))
+    if report.get("version") != BENCH_VERSION:
+        raise ValueError(f"{path}: not a version {BENCH_VERSION} benchmark report")
+    return report
+
+
+if __name__ == "__main__":
+    _child(sys.argv[1])
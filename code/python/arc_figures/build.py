@@ -0,0 +1,318 @@
+"""
+Parallel build orchestrator for the ARC Framework figures.
+
+Runs the ``Generate_Figure*.py`` scripts from a pool of warm worker processes
+instead of starting one cold interpreter per script, and reports the same
+per-figure success/failure summary as ``generate_all_figures.sh``.
+
+Figures whose script, inputs and style configuration are unchanged since
+the last successful build are skipped (see :mod:`arc_figures.cache`).
+
+Usage (from ``code/python``)::
+
+    python -m arc_figures build            # all out-of-date figures
+    python -m arc_figures build 4 5 -j 2   # Figures 4 and 5 on two workers
+    python -m arc_figures build --force    # ignore the build manifest
+    python -m arc_figures build --formats pdf,svg,tiff@600,png@96
+    python -m arc_figures build 4 --profile --profile-dir prof/
+"""
+
+import contextlib
+import io
+import os
+import runpy
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+from .cache import MANIFEST_NAME, BuildManifest, figure_fingerprint, style_digest
+from .datasets import resolve_data_path
+from .fonts import build_font_index
+from .profiling import ProfileSession, requested_dump_dir, requested_mode
+from .style import PAGELLA, PALATINO
+
+PYTHON_DIR = Path(__file__).resolve().parent.parent
+
+
+@dataclass(frozen=True)
+class Figure:
+    """
+    A figure script and everything its output depends on.
+
+    Attributes:
+        script: Script file name in ``code/python``.
+        outputs: Files the script writes, relative to its working directory.
+        inputs: Data files the script reads (see
+            :func:`arc_figures.datasets.resolve_data_path`).
+        sources: ``arc_figures`` modules the script renders through.
+        dpi: Output resolution.
+    """
+
+    script: str
+    outputs: tuple
+    inputs: tuple = ()
+    sources: tuple = ()
+    dpi: int = 300
+
+
+# Toolkit modules every figure renders through.
+STYLE_SOURCES = ("style.py", "fonts.py")
+
+FIGURES = (
+    Figure("Generate_Figure2_Taxonomy.py", ("Figure2_Technology_Taxonomy.png",),
+           sources=STYLE_SOURCES),
+    Figure("Generate_Figure3_CostEffectiveness.py", ("Figure3_Cost_Effectiveness.png",),
+           sources=(*STYLE_SOURCES, "costeff.py")),
+    Figure("Generate_Figure4_HRC.py", ("Figure4_HRC_Performance.png",),
+           inputs=("HRC_Aggregated_Fanuc.csv",),
+           sources=(*STYLE_SOURCES, "hrc.py", "datasets.py", "lod.py", "pareto.py")),
+    Figure("Generate_Figure5_Sensitivity.py", ("Figure5_Sensitivity_Analysis.png",),
+           inputs=("Sensitivity_Results_Fanuc_Shaded.csv",),
+           sources=(*STYLE_SOURCES, "datasets.py", "sensitivity.py")),
+    Figure("Generate_Figure6_Competency.py", ("Figure6_Competency_Progression.png",),
+           sources=(*STYLE_SOURCES, "competency.py", "progression.py", "costeff.py")),
+    Figure("Generate_Figure7_Forest.py", ("Figure7_Forest_Plot.png",),
+           sources=(*STYLE_SOURCES, "meta.py")),
+)
+
+
+@dataclass
+class FigureResult:
+    """Outcome of rendering one figure script."""
+
+    script: str
+    ok: bool
+    seconds: float
+    output: str = ""
+    error: str = ""
+    cached: bool = False
+    reasons: tuple = ()
+
+
+def available_cores():
+    """Number of CPU cores this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return os.cpu_count() or 1
+
+
+def select_figures(names):
+    """
+    Map command-line figure selectors to figure records.
+
+    Args:
+        names: Script names or figure numbers (``"4"``, ``"Figure4"``).
+            An empty selection means every figure in :data:`FIGURES`.
+
+    Returns:
+        Tuple of Figure records, in build order.
+    """
+    if not names:
+        return FIGURES
+    selected = []
+    for name in names:
+        key = name[:-3] if name.endswith(".py") else name
+        if key.isdigit():
+            key = f"Figure{key}_"
+        matches = [f for f in FIGURES if key in f.script]
+        if not matches:
+            raise ValueError(f"Unknown figure: {name}")
+        selected.extend(m for m in matches if m not in selected)
+    return tuple(selected)
+
+
+def _init_worker():
+    """Import the plotting stack and resolve the figure fonts once per worker, headless."""
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot  # noqa: F401
+    import numpy  # noqa: F401
+    import pandas  # noqa: F401
+
+    from .style import resolve_serif
+
+    for serif in (PALATINO, PAGELLA):
+        resolve_serif(serif)
+
+
+def render_script(script, workdir=PYTHON_DIR):
+    """
+    Execute one figure script inside the current (warm) interpreter.
+
+    The script runs as ``__main__`` with ``workdir`` as working directory, as
+    if launched with ``python <script>``. rcParams changes made by the script
+    are rolled back afterwards so that figures sharing a worker do not leak
+    style settings into each other. When ``ARC_PROFILE`` is set, the run is
+    instrumented (see :mod:`arc_figures.profiling`) and its phase table is
+    appended to the captured output.
+
+    Args:
+        script: File name of the script inside ``workdir``.
+        workdir: Directory the script is run from.
+
+    Returns:
+        FigureResult with captured stdout and, on failure, the traceback.
+    """
+    import matplotlib
+    import matplotlib.pyplot as plt
+
+    path = Path(workdir) / script
+    previous_dir = os.getcwd()
+    stdout = io.StringIO()
+    mode = requested_mode()
+    start = time.perf_counter()
+    try:
+        os.chdir(workdir)
+        with matplotlib.rc_context(), contextlib.redirect_stdout(stdout):
+            if mode is None:
+                runpy.run_path(str(path), run_name="__main__")
+            else:
+                with ProfileSession(script, memory=mode == "full",
+                                    dump_dir=requested_dump_dir()) as session:
+                    runpy.run_path(str(path), run_name="__main__")
+                print(session.format())
+        ok, error = True, ""
+    except SystemExit as exc:
+        ok, error = exc.code in (None, 0), f"SystemExit: {exc.code}"
+    except Exception:
+        ok, error = False, traceback.format_exc()
+    finally:
+        plt.close("all")
+        os.chdir(previous_dir)
+    elapsed = time.perf_counter() - start
+    return FigureResult(script, ok, elapsed, stdout.getvalue(), "" if ok else error)
+
+
+def _render_all(scripts, jobs, workdir):
+    jobs = min(jobs or available_cores(), len(scripts))
+    if jobs == 1:
+        _init_worker()
+        return [render_script(s, workdir) for s in scripts]
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as pool:
+        futures = [pool.submit(render_script, s, workdir) for s in scripts]
+        return [f.result() for f in futures]
+
+
+def with_exports(figure, exports):
+    """Figure record whose outputs include the files of ``exports``."""
+    extra = [str(e.path(o, figure.dpi)) for o in figure.outputs for e in exports]
+    return replace(figure, outputs=tuple(dict.fromkeys([*figure.outputs, *extra])))
+
+
+@contextlib.contextmanager
+def _script_environment(settings):
+    """Pass ``settings`` to the figure scripts (and pool workers) as environment variables."""
+    previous = {key: os.environ.get(key) for key in settings}
+    os.environ.update(settings)
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def build(figures=FIGURES, jobs=None, workdir=PYTHON_DIR, force=False, exports=(),
+          optimize=False, profile=None, profile_dir=None):
+    """
+    Render out-of-date figures concurrently.
+
+    Args:
+        figures: Figure records to build.
+        jobs: Worker processes; defaults to the available cores, capped at
+            the number of figures to render. ``1`` renders serially in this
+            process.
+        workdir: Directory the scripts are run from.
+        force: Re-render every figure regardless of the build manifest.
+        exports: Extra formats/resolutions written from each figure's single
+            layout pass (see :func:`arc_figures.export.parse_exports`).
+        optimize: Losslessly optimize the PNG outputs.
+        profile: Instrument each render, ``"time"`` or ``"full"`` (with
+            tracemalloc); defaults to ``ARC_PROFILE``. Implies ``force``.
+        profile_dir: Directory for per-figure cProfile and JSON dumps;
+            defaults to ``ARC_PROFILE_DIR``.
+
+    Returns:
+        List of FigureResult in the same order as ``figures``; up-to-date
+        figures are reported with ``cached=True``.
+    """
+    figures = tuple(with_exports(f, exports) for f in figures)
+    profile = profile or requested_mode()
+    profile_dir = profile_dir or requested_dump_dir()
+    manifest = BuildManifest.load(Path(workdir) / MANIFEST_NAME)
+    style = style_digest()
+
+    results = {}
+    stale = []
+    for figure in figures:
+        fingerprint = figure_fingerprint(figure, workdir, style, resolve_data_path)
+        if exports or optimize:
+            fingerprint["exports"] = ",".join(map(str, exports)) + (" optimize" if optimize else "")
+        reasons = manifest.stale_components(figure, fingerprint, workdir)
+        if force:
+            reasons = ["forced"]
+        elif profile:
+            reasons = ["profiling"]
+        if reasons:
+            stale.append((figure, fingerprint, tuple(reasons)))
+        else:
+            results[figure.script] = FigureResult(figure.script, True, 0.0, cached=True)
+
+    if stale:
+        # Resolve the font fallback chains once, for every worker.
+        build_font_index((PALATINO, PAGELLA))
+        settings = {"ARC_EXPORT": ",".join(map(str, exports)),
+                    "ARC_PNG_OPTIMIZE": "1" if optimize else "0",
+                    "ARC_PROFILE": profile or "0",
+                    "ARC_PROFILE_DIR": str(Path(profile_dir).resolve()) if profile_dir else ""}
+        with _script_environment(settings):
+            rendered = _render_all([f.script for f, _, _ in stale], jobs, workdir)
+        for (figure, fingerprint, reasons), result in zip(stale, rendered):
+            result.reasons = reasons
+            results[figure.script] = result
+            if result.ok:
+                manifest.record(figure, fingerprint)
+        manifest.save()
+
+    return [results[f.script] for f in figures]
+
+
+def print_summary(results, wall_seconds=None):
+    """
+    Print per-figure output and the success/failure summary.
+
+    Returns:
+        Number of failed figures.
+    """
+    for result in results:
+        if result.cached:
+            print(f"Skipping: {result.script}")
+            print("  ✓ Up to date")
+            print("")
+            continue
+        print(f"Running: {result.script}")
+        if result.reasons:
+            print(f"  (changed: {', '.join(result.reasons)})")
+        if result.output:
+            print(result.output.rstrip())
+        if result.ok:
+            print(f"  ✓ Success ({result.seconds:.2f} s)")
+        else:
+            print(result.error.rstrip())
+            print(f"  ✗ Failed ({result.seconds:.2f} s)")
+        print("")
+
+    succeeded = sum(r.ok for r in results)
+    cached = sum(r.cached for r in results)
+    print(f"Python figures generated: {succeeded} / {len(results)}"
+          + (f" ({cached} up to date)" if cached else ""))
+    if wall_seconds is not None:
+        busy = sum(r.seconds for r in results)
+        print(f"Wall time: {wall_seconds:.2f} s (sum of figure times: {busy:.2f} s)")
+    return len(results) - succeeded
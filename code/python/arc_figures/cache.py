@@ -0,0 +1,139 @@
+"""
+Content-addressed build manifest for incremental figure builds.
+
+Each figure is fingerprinted from everything that can change its pixels:
+the script source, its input CSVs, the shared toolkit sources it imports,
+the Matplotlib rcParams/font configuration and the output resolution. A
+figure is re-rendered only when its fingerprint differs from the one stored
+in the manifest at the last successful build, or when an output is missing.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+MANIFEST_NAME = ".arc_build_manifest.json"
+MANIFEST_VERSION = 1
+
+_CHUNK = 1 << 20
+
+
+def file_digest(path):
+    """SHA-256 of a file's contents, or ``"missing"`` if it does not exist."""
+    path = Path(path)
+    if not path.is_file():
+        return "missing"
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(_CHUNK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _text_digest(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def style_digest():
+    """
+    Fingerprint of the Matplotlib configuration a build renders with.
+
+    Covers the Matplotlib version, the effective rcParams (matplotlibrc and
+    style sheets included, backend settings excluded) and the set of fonts
+    visible to the font manager, since a newly installed font changes which
+    face the serif fallback chains resolve to.
+    """
+    import matplotlib
+    from matplotlib import font_manager
+
+    params = sorted(
+        (key, repr(value))
+        for key, value in matplotlib.rcParams.items()
+        if not key.startswith(("backend", "interactive", "webagg."))
+    )
+    fonts = sorted(
+        {(f.name, f.style, str(f.weight), Path(f.fname).name)
+         for f in font_manager.fontManager.ttflist}
+    )
+    payload = json.dumps(
+        {"matplotlib": matplotlib.__version__, "rcParams": params, "fonts": fonts}
+    )
+    return _text_digest(payload)
+
+
+def figure_fingerprint(figure, workdir, style, resolve_input):
+    """
+    Digest every component that determines a figure's output.
+
+    Args:
+        figure: Figure record from :data:`arc_figures.build.FIGURES`.
+        workdir: Directory the script runs from.
+        style: Result of :func:`style_digest`.
+        resolve_input: Callable mapping an input file name to the path the
+            script will read it from.
+
+    Returns:
+        Dict of component name to digest; components are kept separate so
+        the build can say why a figure was rebuilt.
+    """
+    workdir = Path(workdir)
+    components = {
+        "script": file_digest(workdir / figure.script),
+        "style": style,
+        "dpi": str(figure.dpi),
+    }
+    for source in figure.sources:
+        components[f"source {source}"] = file_digest(Path(__file__).parent / source)
+    for name in figure.inputs:
+        components[f"input {name}"] = file_digest(resolve_input(name, workdir))
+    return components
+
+
+class BuildManifest:
+    """Fingerprints of the last successful build of each figure."""
+
+    def __init__(self, path, entries=None):
+        self.path = Path(path)
+        self.entries = entries or {}
+
+    @classmethod
+    def load(cls, path):
+        """Read a manifest; a missing or unreadable file starts empty."""
+        path = Path(path)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cls(path)
+        if data.get("version") != MANIFEST_VERSION:
+            return cls(path)
+        return cls(path, data.get("figures", {}))
+
+    def stale_components(self, figure, fingerprint, workdir):
+        """
+        List why a figure must be rebuilt.
+
+        Returns:
+            Names of changed components (plus ``"output"`` when an output
+            file is missing); an empty list means the figure is up to date.
+        """
+        entry = self.entries.get(figure.script)
+        if entry is None:
+            return ["no previous build"]
+        previous = entry.get("fingerprint", {})
+        changed = [
+            key for key in fingerprint if previous.get(key) != fingerprint[key]
+        ]
+        changed.extend(key for key in previous if key not in fingerprint)
+        missing = [o for o in figure.outputs if not (Path(workdir) / o).is_file()]
+        if missing:
+            changed.append("output")
+        return changed
+
+    def record(self, figure, fingerprint):
+        self.entries[figure.script] = {"fingerprint": fingerprint}
+
+    def save(self):
+        payload = {"version": MANIFEST_VERSION, "figures": self.entries}
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+        tmp.replace(self.path)
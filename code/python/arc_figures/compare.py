@@ -0,0 +1,384 @@
+"""
+Multi-run comparison of HRC episode logs (Figure 4 across robots and seeds).
+
+A comparison takes any number of run files (``HRC_Aggregated_Fanuc.csv``
+layout), groups them by robot and reduces each robot's seeds to a
+per-episode mean and confidence band. Runs are loaded concurrently from their
+column cache (:mod:`arc_figures.datasets`) and folded, one at a time, into
+per-robot sum / sum-of-squares / count arrays indexed by episode, so runs of
+different lengths or start episodes align by episode number and memory
+grows with the number of episodes, not with the number of seeds. Each run is
+smoothed with the Figure 4 rolling mean before it is folded in (``window=1``
+compares raw episodes).
+
+Run files are grouped by robot from their names: ``<robot>_seed<k>.csv``
+(also ``-run<k>``, ``_s<k>``), else by the sub-directory of the given
+directory they sit in, else by file name. :data:`RUN_PATTERN` can be
+replaced with any regular expression with ``robot`` (and optionally
+``seed``) groups.
+
+Usage (from ``code/python``)::
+
+    python -m arc_figures compare runs/ --plot hrc_comparison.png
+    python -m arc_figures compare "runs/*/seed_*.csv" -o bands.csv --confidence 0.99
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+import glob
+import os
+from pathlib import Path
+import re
+
+import numpy as np
+
+from .datasets import load_columns
+from .hrc import METRICS, ROLLING_WINDOW, SCALED_COLUMNS
+from .schema import HRC_SCHEMA
+from .style import FigureSpec, save_figure
+
+RUN_PATTERN = re.compile(r"^(?P<robot>.+?)[_-](?:seed|run|s)[_-]?(?P<seed>\d+)$", re.IGNORECASE)
+CONFIDENCE = 0.95
+# Episodes at the end of each run averaged for the trade-off panel.
+FINAL_EPISODES = 100
+MAX_JOBS = 8
+
+FIGURE_SPEC = FigureSpec("Figure4_HRC_Comparison.png", font_size=11, layout_rect=(0, 0, 1, 0.97))
+# Panels (a)-(c): metric, y label, title, inverted axis (lower is better).
+PANELS = (
+    ("Throughput", "Throughput (tasks/hour)", "(a) System Throughput Evolution", False),
+    ("Workload_100", "Human Workload (0-100)", "(b) Human Workload Optimization", True),
+    ("Safety_100", "Safety Score (0-100)", "(c) Safety Score Progression", False),
+)
+
+
+@dataclass(frozen=True)
+class Run:
+    """One episode log: its file, robot and seed label."""
+
+    path: Path
+    robot: str
+    seed: str
+
+
+def _run_for(path, root=None, pattern=RUN_PATTERN):
+    path = Path(path)
+    match = pattern.match(path.stem)
+    if match:
+        groups = match.groupdict()
+        return Run(path, groups["robot"], groups.get("seed") or path.stem)
+    if root is not None and path.parent != root:
+        return Run(path, path.relative_to(root).parts[0], path.stem)
+    return Run(path, path.stem, path.stem)
+
+
+def discover_runs(sources, pattern=RUN_PATTERN):
+    """
+    Run files named by ``sources``.
+
+    Args:
+        sources: Files, directories (searched recursively for ``*.csv``) or
+            glob patterns.
+        pattern: Regular expression matched against each file stem, with a
+            ``robot`` and optionally a ``seed`` group.
+
+    Returns:
+        Runs sorted by robot and seed (numerically where the seeds are).
+
+    Raises:
+        ValueError: If no run file is found.
+    """
+    pattern = re.compile(pattern) if isinstance(pattern, str) else pattern
+    runs = {}
+    for source in sources:
+        source = str(source)
+        if os.path.isdir(source):
+            root = Path(source)
+            found = [(p, root) for p in sorted(root.rglob("*.csv"))]
+        elif glob.has_magic(source):
+            found = [(Path(p), None) for p in sorted(glob.glob(source, recursive=True))]
+        elif os.path.isfile(source):
+            found = [(Path(source), None)]
+        else:
+            raise ValueError(f"no such run file or directory: {source}")
+        for path, root in found:
+            runs.setdefault(path.resolve(), _run_for(path, root, pattern))
+    if not runs:
+        raise ValueError(f"no run files in {', '.join(map(str, sources))}")
+
+    def order(run):
+        return run.robot, (0, int(run.seed), "") if run.seed.isdigit() else (1, 0, run.seed)
+
+    return sorted(runs.values(), key=order)
+
+
+def load_run(path, window=ROLLING_WINDOW):
+    """
+    Episode numbers and smoothed Figure 4 metrics of one run.
+
+    Args:
+        path: Episode log CSV.
+        window: Trailing rolling-mean window (1: raw values); the first
+            ``window - 1`` episodes are NaN like ``Series.rolling(window)``.
+
+    Returns:
+        Dict with an int64 ``Episode`` array and one float array per metric.
+
+    Raises:
+        arc_figures.schema.SchemaError: If the run violates the HRC schema.
+    """
+    columns = load_columns(path, ("Episode", "Throughput", "Workload", "Safety"),
+                           schema=HRC_SCHEMA)
+    run = {"Episode": np.asarray(columns["Episode"]).astype(np.int64)}
+    values = {"Throughput": np.asarray(columns["Throughput"], dtype=float)}
+    for column, (scaled, factor) in SCALED_COLUMNS.items():
+        values[scaled] = np.asarray(columns[column], dtype=float) * factor
+    for metric in METRICS:
+        run[metric] = _rolling_mean(values[metric], window)
+    return run
+
+
+def _rolling_mean(values, window):
+    if window <= 1:
+        return values
+    rolled = np.full(len(values), np.nan)
+    if len(values) >= window:
+        sums = np.cumsum(np.concatenate([[0.0], values]))
+        rolled[window - 1:] = (sums[window:] - sums[:-window]) / window
+    return rolled
+
+
+@dataclass
+class RobotBands:
+    """
+    Per-episode moments of one robot's runs.
+
+    Attributes:
+        robot: Robot label.
+        seeds: Seed labels of the folded runs, in order.
+        first: Episode number of index 0 of the moment arrays.
+        finals: Per-run means of the last ``final_episodes`` episodes
+            (one row per seed, one column per metric).
+        final_episodes: Episodes averaged into ``finals``.
+    """
+
+    robot: str
+    seeds: list = field(default_factory=list)
+    first: int = 0
+    count: dict = field(default_factory=dict)
+    total: dict = field(default_factory=dict)
+    squares: dict = field(default_factory=dict)
+    finals: list = field(default_factory=list)
+    final_episodes: int = FINAL_EPISODES
+
+    def _grow(self, lo, hi):
+        """Extend the moment arrays to cover episodes ``lo..hi``."""
+        if not self.count:
+            self.first = lo
+            for store in (self.count, self.total, self.squares):
+                for metric in METRICS:
+                    store[metric] = np.zeros(hi - lo + 1)
+            return
+        last = self.first + len(self.count[METRICS[0]]) - 1
+        new_first, new_last = min(lo, self.first), max(hi, last)
+        if (new_first, new_last) == (self.first, last):
+            return
+        offset = self.first - new_first
+        for store in (self.count, self.total, self.squares):
+            for metric, values in store.items():
+                grown = np.zeros(new_last - new_first + 1)
+                grown[offset:offset + len(values)] = values
+                store[metric] = grown
+        self.first = new_first
+
+    def add(self, seed, run):
+        """Fold one run (output of :func:`load_run`) into the moments."""
+        episodes = run["Episode"]
+        self.seeds.append(seed)
+        if not len(episodes):
+            return
+        self._grow(int(episodes.min()), int(episodes.max()))
+        size = len(self.count[METRICS[0]])
+        for metric in METRICS:
+            values = run[metric]
+            ok = np.isfinite(values)
+            index = episodes[ok] - self.first
+            self.count[metric] += np.bincount(index, minlength=size)
+            self.total[metric] += np.bincount(index, weights=values[ok], minlength=size)
+            self.squares[metric] += np.bincount(index, weights=values[ok] ** 2, minlength=size)
+        tail = np.argsort(episodes, kind="stable")[-self.final_episodes:]
+        finals = []
+        for metric in METRICS:
+            values = run[metric][tail]
+            values = values[np.isfinite(values)]
+            finals.append(values.mean() if len(values) else np.nan)
+        self.finals.append(finals)
+
+    def bands(self, confidence=CONFIDENCE):
+        """
+        Per-episode mean and two-sided Student-t confidence band across seeds.
+
+        Returns:
+            Dict with ``Episode``, and per metric ``N_<m>``, ``Mean_<m>``,
+            ``Low_<m>`` and ``High_<m>`` arrays (NaN where no run, or only
+            one, covers the episode).
+        """
+        from scipy import stats
+
+        size = len(self.count[METRICS[0]]) if self.count else 0
+        result = {"Episode": np.arange(self.first, self.first + size)}
+        for metric in METRICS:
+            n = self.count.get(metric, np.zeros(0))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                mean = self.total.get(metric, np.zeros(0)) / n
+                var = (self.squares.get(metric, np.zeros(0)) - n * mean ** 2) / (n - 1)
+                half = (stats.t.ppf(0.5 + confidence / 2, n - 1)
+                        * np.sqrt(np.maximum(var, 0.0) / n))
+            half[n < 2] = np.nan
+            result[f"N_{metric}"] = n.astype(np.int64)
+            result[f"Mean_{metric}"] = mean
+            result[f"Low_{metric}"] = mean - half
+            result[f"High_{metric}"] = mean + half
+        return result
+
+
+def compare_runs(runs, window=ROLLING_WINDOW, jobs=None, final_episodes=FINAL_EPISODES):
+    """
+    Fold runs into per-robot episode moments.
+
+    Files are read by a thread pool (cache conversion and reads release the
+    GIL); results are folded in the order of ``runs``, so output does not
+    depend on which load finishes first.
+
+    Args:
+        runs: Runs from :func:`discover_runs`.
+        window: Rolling-mean window applied to each run.
+        jobs: Loader threads (default: up to 8).
+        final_episodes: Episodes per run averaged into the final trade-off.
+
+    Returns:
+        Dict of robot label to :class:`RobotBands`, in order of appearance.
+    """
+    jobs = jobs or min(MAX_JOBS, os.cpu_count() or 1, len(runs)) or 1
+    robots = {}
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        loaded = pool.map(lambda run: load_run(run.path, window), runs)
+        for run, columns in zip(runs, loaded):
+            if run.robot not in robots:
+                robots[run.robot] = RobotBands(run.robot, final_episodes=final_episodes)
+            robots[run.robot].add(run.seed, columns)
+    return robots
+
+
+def bands_table(robots, confidence=CONFIDENCE):
+    """Long-format DataFrame of every robot's bands (one row per robot and episode)."""
+    import pandas as pd
+
+    frames = []
+    for robot, bands in robots.items():
+        frame = pd.DataFrame(bands.bands(confidence))
+        frame.insert(0, "Robot", robot)
+        frame.insert(1, "Seeds", len(bands.seeds))
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+def summary_table(robots, confidence=CONFIDENCE):
+    """
+    Final performance per robot: mean and confidence interval across seeds
+    of each run's mean over its last episodes.
+    """
+    import pandas as pd
+    from scipy import stats
+
+    rows = []
+    for robot, bands in robots.items():
+        finals = np.array(bands.finals, dtype=float).reshape(-1, len(METRICS))
+        row = {"Robot": robot, "Seeds": len(bands.seeds)}
+        for j, metric in enumerate(METRICS):
+            values = finals[np.isfinite(finals[:, j]), j]
+            n = len(values)
+            mean = values.mean() if n else np.nan
+            half = (stats.t.ppf(0.5 + confidence / 2, n - 1) * values.std(ddof=1) / np.sqrt(n)
+                    if n > 1 else np.nan)
+            row.update({metric: mean, f"CI_{metric}": half})
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def plot_comparison(robots, path, dpi=300, confidence=CONFIDENCE, window=ROLLING_WINDOW):
+    """
+    Render the Figure 4 layout with one mean line and band per robot.
+
+    Panels (a)-(c) show each robot's per-episode mean across seeds with its
+    confidence band; panel (d) shows every run's final throughput and
+    workload (colour: robot) with the robot means and their intervals.
+
+    Args:
+        robots: Output of :func:`compare_runs`.
+        path: Output image path.
+    """
+    import matplotlib.pyplot as plt
+
+    from .lod import minmax_indices, pixel_size
+
+    fig, axes = plt.subplots(2, 2, figsize=(16, 11))
+    axes = axes.ravel()
+    colors = plt.get_cmap("tab10" if len(robots) <= 10 else "tab20")
+    summary = summary_table(robots, confidence)
+    smoothing = f"{window}-episode moving average, " if window > 1 else ""
+
+    bands = {robot: b.bands(confidence) for robot, b in robots.items()}
+    for ax, (metric, ylabel, title, inverted) in zip(axes, PANELS):
+        width = pixel_size(ax, dpi)[0]
+        for k, (robot, band) in enumerate(bands.items()):
+            episodes, mean = band["Episode"], band[f"Mean_{metric}"]
+            if not len(episodes):
+                continue
+            idx = minmax_indices(episodes, mean, width)
+            color = colors(k % colors.N)
+            ax.plot(episodes[idx], mean[idx], linewidth=2.0, color=color,
+                    label=f"{robot} (n={len(robots[robot].seeds)})")
+            # The band edges keep their own extremes; fill_between needs one x.
+            low, high = band[f"Low_{metric}"], band[f"High_{metric}"]
+            idx = np.union1d(minmax_indices(episodes, low, width),
+                             minmax_indices(episodes, high, width))
+            ax.fill_between(episodes[idx], low[idx], high[idx], color=color, alpha=0.2,
+                            linewidth=0)
+        ax.set_xlabel("Training Episode", fontsize=14, fontweight="bold")
+        ax.set_ylabel(ylabel, fontsize=14, fontweight="bold")
+        ax.set_title(title, fontsize=15, fontweight="bold", pad=10)
+        ax.grid(True, alpha=0.3, linestyle="--", linewidth=0.8)
+        ax.tick_params(axis="both", labelsize=12)
+        if inverted:
+            ax.invert_yaxis()
+    axes[0].legend(loc="lower right", fontsize=11, framealpha=0.95, edgecolor="black")
+
+    ax = axes[3]
+    for k, (robot, bands) in enumerate(robots.items()):
+        color = colors(k % colors.N)
+        finals = np.array(bands.finals, dtype=float).reshape(-1, len(METRICS))
+        ax.scatter(finals[:, 0], finals[:, 1], s=60, color=color, alpha=0.5,
+                   edgecolors="black", linewidth=0.6)
+        row = summary.iloc[k]
+        ax.errorbar(row["Throughput"], row["Workload_100"], xerr=row["CI_Throughput"],
+                    yerr=row["CI_Workload_100"], fmt="D", markersize=11, color=color,
+                    markeredgecolor="black", ecolor="black", capsize=4, label=robot, zorder=10)
+    final_episodes = "/".join(str(n) for n in sorted({b.final_episodes
+                                                      for b in robots.values()}))
+    ax.set_xlabel(f"Throughput (tasks/hour, last {final_episodes} episodes)",
+                  fontsize=14, fontweight="bold")
+    ax.set_ylabel("Human Workload (0-100)", fontsize=14, fontweight="bold")
+    ax.set_title("(d) Final Trade-off per Run", fontsize=15, fontweight="bold", pad=10)
+    ax.grid(True, alpha=0.3, linestyle="--", linewidth=0.8)
+    ax.tick_params(axis="both", labelsize=12)
+    ax.invert_yaxis()
+    ax.legend(loc="lower left", fontsize=11, framealpha=0.95, edgecolor="black")
+
+    seeds = sum(len(b.seeds) for b in robots.values())
+    fig.suptitle("Adaptive Multi-Objective Reinforcement Learning for Human-Robot Collaboration\n"
+                 f"Comparison of {len(robots)} robot(s), {seeds} runs "
+                 f"({smoothing}mean and {confidence:.0%} CI across seeds)",
+                 fontsize=17, fontweight="bold", y=0.995)
+    save_figure(fig, path, dpi, layout_rect=FIGURE_SPEC.layout_rect)
+    return summary
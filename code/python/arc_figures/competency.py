@@ -0,0 +1,49 @@
+"""
+Dreyfus competency levels of the ARC progression model (Figure 6).
+
+:data:`COMPETENCY_LEVELS` is the level table Figure 6 draws (name,
+description, technology level, pedagogy and box colour per level);
+:data:`DREYFUS_LEVELS` lists the level names in order, so that level ``k``
+(1-5) is ``DREYFUS_LEVELS[k - 1]``. The rubric scorer maps its results to
+these levels.
+"""
+
+COMPETENCY_LEVELS = {
+    "Level 1": {
+        "name": "Novice",
+        "description": "Follows explicit instructions.\nLearns basic concepts.\nExplores robotics.",
+        "tech_level": "Educational Kits\n(LEGO Mindstorms)",
+        "pedagogy": "Direct instruction,\nDemonstrations,\nHands-on exploration",
+        "color": "#f3effa",
+    },
+    "Level 2": {
+        "name": "Advanced Beginner",
+        "description": "Operates systems with guidance.\nRecognizes patterns.\nBegins programming.",
+        "tech_level": "Advanced Kits\n(LEGO EV3, Arduino)",
+        "pedagogy": "Guided inquiry,\nScaffolded activities,\nPeer collaboration",
+        "color": "#d4ddf5",
+    },
+    "Level 3": {
+        "name": "Competent",
+        "description": "Plans and executes tasks\nwith industrial systems.\nApplies theory to practice.",
+        "tech_level": "Advanced Educational\n(Dobot, Niryo)",
+        "pedagogy": "Project-based learning,\nLab practicals,\nTeam challenges",
+        "color": "#b5cbf0",
+    },
+    "Level 4": {
+        "name": "Proficient",
+        "description": "Integrated system operation,\ntroubleshooting complex issues.\nDevelops solutions.",
+        "tech_level": "Didactic Industrial\n(SCORBOT, UR3)",
+        "pedagogy": "Capstone projects,\nCase-based learning,\nInternships",
+        "color": "#96b9ea",
+    },
+    "Level 5": {
+        "name": "Expert",
+        "description": "Autonomous problem-solving,\nsystem design, and optimization.\nMentors others.",
+        "tech_level": "Industrial-Grade\n(UR5e, KUKA)",
+        "pedagogy": "Self-directed projects,\nResearch & Development,\nIndustry partnerships",
+        "color": "#77a7e5",
+    },
+}
+
+DREYFUS_LEVELS = tuple(level["name"] for level in COMPETENCY_LEVELS.values())
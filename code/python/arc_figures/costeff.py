@@ -0,0 +1,329 @@
+"""
+Cost-effectiveness of the technology levels (Figure 3) under uncertainty.
+
+Figure 3 plots point estimates: one cost per student and one effect size
+per technology. :func:`simulate` propagates the uncertainty behind them
+instead:
+
+* costs are drawn from triangular distributions over the per-student cost
+  ranges of Figure 2, with the Figure 3 cost as mode (the Remote Lab has no
+  published range; :data:`COST_RANGES` assumes +-50 % around its cost);
+* effect sizes are drawn from normal distributions centred on the Figure 3
+  effects, with the standard errors of the meta-analysis
+  (:func:`effect_standard_errors`: the random-effects pooled SE of each
+  level's subgroup of the Figure 7 studies).
+
+Draws are generated and reduced in chunks of NumPy arrays, so 10^6 or more
+draws run in constant memory. Per draw, the technologies are ranked by ROI
+(effect per $1,000) and, for every willingness-to-pay value (USD per unit
+of effect size and student), the one with the highest net benefit
+``wtp * d - cost`` is recorded; the result holds the ROI rank probabilities,
+the cost-effectiveness acceptability curves (CEAC), ROI intervals and the
+moments behind the 95 % uncertainty ellipses of :func:`plot_uncertainty`.
+
+Usage (from ``code/python``)::
+
+    python -m arc_figures cea --draws 1000000 --plot cea.png -o cea_ranking.csv
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from .hrc import QuantileSketch
+from .style import FigureSpec, rounded_box, save_figure
+
+# Technology options of Figure 3 (costs per student in USD, Hedges' d).
+TECHNOLOGIES = ("Level 1:\nKits", "Level 2:\nAdvanced", "Level 3:\nDidactic",
+                "Level 4:\nSemi-Ind", "Level 5:\nIndustrial", "Remote Lab\n(Level 5)")
+COSTS = np.array([500, 800, 3500, 12000, 40000, 1500])
+EFFECT_SIZES = np.array([0.59, 0.64, 0.68, 0.73, 0.94, 0.89])
+# Per-student cost ranges of Figure 2; the Remote Lab row is an assumption.
+COST_RANGES = np.array([[300, 800], [400, 1200], [2000, 5000], [8000, 15000],
+                        [35000, 150000], [750, 2250]])
+# Subgroup of the Figure 7 studies (``Tech_Level``, or an author for a single
+# study) whose pooled standard error each technology's effect size borrows.
+EVIDENCE = ("Educational", "Educational", "Educational", "Semi-Industrial",
+            "Industrial", "UR Remote Lab")
+
+DRAWS = 1_000_000
+CHUNK = 250_000
+WTP_MAX = 100_000
+WTP_POINTS = 101
+INTERVAL = 0.95
+
+FIGURE_SPEC = FigureSpec("Figure3_Cost_Effectiveness_Uncertainty.png", font_size=14)
+
+
+def short_names(labels=TECHNOLOGIES):
+    """One-line technology names (``Level 1: Kits``)."""
+    return [" ".join(label.split("\n")) for label in labels]
+
+
+def effect_standard_errors(evidence=EVIDENCE, method="REML"):
+    """
+    Standard error of each technology's effect size, from the meta-analysis.
+
+    Args:
+        evidence: Per technology, a ``Tech_Level`` of the Figure 7 studies
+            or the author of a single study.
+        method: Random-effects estimator of :func:`arc_figures.meta.rma`.
+    """
+    from .meta import rma, studies_table
+
+    studies = studies_table()
+    ses = []
+    for label in evidence:
+        rows = studies[(studies["Tech_Level"] == label) | (studies["Authors"] == label)]
+        if rows.empty:
+            raise ValueError(f"no studies for evidence group {label!r}")
+        ses.append(float(rma(rows["g"], rows["Variance"], method=method).se))
+    return np.array(ses)
+
+
+@dataclass
+class CEAResult:
+    """
+    Monte Carlo summary of the cost-effectiveness comparison.
+
+    Attributes:
+        names: Technology names.
+        draws: Number of Monte Carlo draws.
+        rank_probability: ``[i, r]`` probability that technology ``i`` has
+            ROI rank ``r`` (0 = highest effect per dollar).
+        wtp: Willingness-to-pay grid (USD per unit effect size per student).
+        ceac: ``[i, j]`` probability that technology ``i`` has the highest
+            net benefit at ``wtp[j]``.
+        roi_mean: Mean ROI (effect size per $1,000).
+        roi_interval: ``(n, 2)`` central ``interval`` ROI quantiles.
+        center: ``(n, 2)`` means of (log10 cost, effect size).
+        covariance: ``(n, 2, 2)`` covariances of (log10 cost, effect size).
+    """
+
+    names: list
+    draws: int
+    rank_probability: np.ndarray
+    wtp: np.ndarray
+    ceac: np.ndarray
+    roi_mean: np.ndarray
+    roi_interval: np.ndarray
+    center: np.ndarray
+    covariance: np.ndarray
+    interval: float = INTERVAL
+
+    def ranking_table(self):
+        """ROI ranking per technology as a DataFrame, best expected rank first."""
+        import pandas as pd
+
+        ranks = np.arange(self.rank_probability.shape[1])
+        table = pd.DataFrame({
+            "Technology": self.names,
+            "ROI_Mean": self.roi_mean,
+            "ROI_Low": self.roi_interval[:, 0],
+            "ROI_High": self.roi_interval[:, 1],
+            "P_Best_ROI": self.rank_probability[:, 0],
+            "Mean_Rank": self.rank_probability @ (ranks + 1),
+        })
+        for r in ranks:
+            table[f"P_Rank_{r + 1}"] = self.rank_probability[:, r]
+        return table.sort_values("Mean_Rank", kind="stable").reset_index(drop=True)
+
+    def ceac_table(self):
+        """CEAC as a DataFrame: one row per WTP value, one column per technology."""
+        import pandas as pd
+
+        table = pd.DataFrame(self.ceac.T, columns=self.names)
+        table.insert(0, "WTP", self.wtp)
+        return table
+
+
+def _winning_counts(effect, cost, i, wtp):
+    """
+    Per WTP value, the number of draws in which option ``i`` has the highest
+    net benefit.
+
+    Net benefit is linear in the WTP, so the values at which ``i`` wins form
+    one interval per draw, bounded by its crossovers with the other options
+    (``i`` beats ``j`` for ``wtp >= (c_i - c_j) / (d_i - d_j)`` when
+    ``d_i > d_j``, for ``wtp <=`` that value when ``d_i < d_j``). Counting the
+    grid points inside each interval costs O(draws * options) instead of a
+    net-benefit comparison per grid point.
+    """
+    others = np.arange(effect.shape[1]) != i
+    gain = effect[:, [i]] - effect[:, others]
+    extra = cost[:, [i]] - cost[:, others]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crossover = extra / gain
+    low = np.where(gain > 0, crossover, -np.inf).max(axis=1)
+    high = np.where(gain < 0, crossover, np.inf).min(axis=1)
+    wins = low <= high
+    start = np.searchsorted(wtp, low[wins], side="left")
+    stop = np.searchsorted(wtp, high[wins], side="right")
+    steps = (np.bincount(start, minlength=len(wtp) + 1)
+             - np.bincount(stop, minlength=len(wtp) + 1))
+    return np.cumsum(steps)[:-1]
+
+
+def simulate(draws=DRAWS, seed=0, chunk=CHUNK, costs=COSTS, cost_ranges=COST_RANGES,
+             effects=EFFECT_SIZES, effect_se=None, names=None,
+             wtp=None, interval=INTERVAL):
+    """
+    Monte Carlo cost-effectiveness analysis of the technology options.
+
+    Args:
+        draws: Number of draws.
+        seed: Seed of the NumPy generator (results are reproducible for a
+            given seed and chunk size).
+        chunk: Draws generated and reduced at once (memory is about
+            ``chunk * len(costs) * 40`` bytes).
+        costs: Most likely cost per student (triangular mode).
+        cost_ranges: ``(n, 2)`` lower and upper cost per student.
+        effects: Mean effect sizes.
+        effect_se: Effect size standard errors (default:
+            :func:`effect_standard_errors`).
+        names: Technology names (default: :data:`TECHNOLOGIES`).
+        wtp: Willingness-to-pay grid (default: 0 to ``WTP_MAX`` USD).
+        interval: Coverage of the ROI intervals.
+
+    Returns:
+        CEAResult.
+    """
+    costs = np.asarray(costs, dtype=float)
+    cost_ranges = np.asarray(cost_ranges, dtype=float)
+    effects = np.asarray(effects, dtype=float)
+    n = len(costs)
+    if cost_ranges.shape != (n, 2) or len(effects) != n:
+        raise ValueError("costs, cost_ranges and effects must describe the same technologies")
+    if np.any((costs < cost_ranges[:, 0]) | (costs > cost_ranges[:, 1])):
+        raise ValueError("each cost must lie within its cost range")
+    if draws < 1 or chunk < 1:
+        raise ValueError("draws and chunk must be positive")
+    effect_se = effect_standard_errors() if effect_se is None else np.asarray(effect_se, float)
+    names = short_names() if names is None else list(names)
+    wtp = np.linspace(0, WTP_MAX, WTP_POINTS) if wtp is None else np.asarray(wtp, float)
+
+    rng = np.random.default_rng(seed)
+    rank_counts = np.zeros(n * n)
+    best_counts = np.zeros((len(wtp), n))
+    roi_sum = np.zeros(n)
+    sums = np.zeros((n, 2))
+    products = np.zeros((n, 2, 2))
+    sketches = [QuantileSketch() for _ in range(n)]
+    slots = np.arange(n)
+
+    for start in range(0, draws, chunk):
+        size = min(chunk, draws - start)
+        cost = rng.triangular(cost_ranges[:, 0], costs, cost_ranges[:, 1], size=(size, n))
+        effect = rng.normal(effects, effect_se, size=(size, n))
+        roi = effect / cost * 1000
+
+        # Rank = number of options with a higher ROI (cheaper than argsort for few options).
+        ranks = (roi[:, None, :] > roi[:, :, None]).sum(axis=2)
+        rank_counts += np.bincount((slots * n + ranks).ravel(), minlength=n * n)
+        for i in range(n):
+            best_counts[:, i] += _winning_counts(effect, cost, i, wtp)
+
+        roi_sum += roi.sum(axis=0)
+        points = np.stack([np.log10(cost), effect], axis=2)  # (size, n, 2)
+        sums += points.sum(axis=0)
+        products += np.einsum("kia,kib->iab", points, points)
+        for i, sketch in enumerate(sketches):
+            sketch.update(roi[:, i])
+
+    center = sums / draws
+    covariance = (products - draws * np.einsum("ia,ib->iab", center, center)) / max(draws - 1, 1)
+    tails = (0.5 - interval / 2, 0.5 + interval / 2)
+    return CEAResult(
+        names=names,
+        draws=draws,
+        rank_probability=rank_counts.reshape(n, n) / draws,
+        wtp=wtp,
+        ceac=best_counts.T / draws,
+        roi_mean=roi_sum / draws,
+        roi_interval=np.array([s.quantile(tails) for s in sketches]),
+        center=center,
+        covariance=covariance,
+        interval=interval,
+    )
+
+
+def ellipse(center, covariance, coverage=INTERVAL, points=100):
+    """
+    Boundary of the normal-theory ``coverage`` ellipse of a 2-D distribution.
+
+    Returns:
+        ``(points, 2)`` array of boundary coordinates.
+    """
+    from scipy import stats
+
+    values, vectors = np.linalg.eigh(covariance)
+    radius = np.sqrt(stats.chi2.ppf(coverage, 2) * np.maximum(values, 0))
+    angle = np.linspace(0, 2 * np.pi, points)
+    circle = np.column_stack([np.cos(angle), np.sin(angle)])
+    return center + (circle * radius) @ vectors.T
+
+
+def plot_uncertainty(result, path, dpi=300, costs=COSTS, effects=EFFECT_SIZES, below=(0,)):
+    """
+    Render the Figure 3 scatter with uncertainty ellipses next to the CEAC.
+
+    Panel (a) repeats the Figure 3 points with the ``interval`` ellipse of
+    each technology's (log cost, effect size) draws and its ROI interval;
+    panel (b) shows the acceptability curves.
+
+    Args:
+        result: Output of :func:`simulate`.
+        path: Output image path.
+        below: Technologies labelled below their point (Level 1 would
+            otherwise overlap Level 2).
+    """
+    import matplotlib.pyplot as plt
+
+    fig, (ax, ax_ceac) = plt.subplots(1, 2, figsize=(20, 9),
+                                      gridspec_kw={"width_ratios": [1.15, 1]})
+    colors = plt.get_cmap("tab10")
+    coverage = f"{result.interval:.0%}"
+
+    for i, name in enumerate(result.names):
+        color = colors(i)
+        boundary = ellipse(result.center[i], result.covariance[i], result.interval)
+        ax.fill(10 ** boundary[:, 0], boundary[:, 1], color=color, alpha=0.18,
+                edgecolor=color, linewidth=2)
+        ax.scatter(costs[i], effects[i], s=160, color=color, edgecolors="black",
+                   linewidth=2, zorder=5, label=name)
+        low, high = result.roi_interval[i]
+        ax.annotate(f"{name}\nROI {result.roi_mean[i]:.2f} [{low:.2f}, {high:.2f}]\n"
+                    f"P(best ROI) = {result.rank_probability[i, 0]:.2f}",
+                    xy=(costs[i], effects[i]), xytext=(0, -14 if i in below else 14),
+                    textcoords="offset points", fontsize=10, ha="center",
+                    va="top" if i in below else "bottom",
+                    bbox=rounded_box(0.3, facecolor="white", edgecolor=color, alpha=0.85))
+    ax.set_xscale("log")
+    ax.set_xlim(150, 250000)
+    ax.set_xlabel("Cost per Student (USD)", fontsize=15, fontweight="bold")
+    ax.set_ylabel("Effect Size (Hedges' d)", fontsize=15, fontweight="bold")
+    ax.set_title(f"(a) Cost-Effectiveness with {coverage} Uncertainty Ellipses",
+                 fontsize=16, fontweight="bold", pad=15)
+    ax.grid(True, alpha=0.3, linestyle="--", linewidth=1)
+    ax.set_axisbelow(True)
+    ax.tick_params(axis="both", which="major", labelsize=11)
+
+    for i, name in enumerate(result.names):
+        ax_ceac.plot(result.wtp, result.ceac[i], linewidth=2.5, color=colors(i), label=name)
+    ax_ceac.set_xlim(result.wtp[0], result.wtp[-1])
+    ax_ceac.set_ylim(-0.02, 1.02)
+    ax_ceac.set_xlabel("Willingness to Pay (USD per unit of d per student)",
+                       fontsize=15, fontweight="bold")
+    ax_ceac.set_ylabel("Probability of Highest Net Benefit", fontsize=15, fontweight="bold")
+    ax_ceac.set_title("(b) Cost-Effectiveness Acceptability Curves",
+                      fontsize=16, fontweight="bold", pad=15)
+    ax_ceac.grid(True, alpha=0.3, linestyle="--", linewidth=1)
+    ax_ceac.xaxis.set_major_formatter(plt.FuncFormatter(lambda v, _: f"${v:,.0f}"))
+    ax_ceac.tick_params(axis="both", which="major", labelsize=11)
+    legend = ax_ceac.legend(loc="center right", fontsize=12, frameon=True, fancybox=True,
+                            shadow=True)
+    legend.get_frame().set_alpha(0.9)
+
+    fig.suptitle(f"Cost-Effectiveness under Uncertainty ({result.draws:,} Monte Carlo draws)",
+                 fontsize=18, fontweight="bold")
+    save_figure(fig, path, dpi)
@@ -0,0 +1,403 @@
+"""
+Live Figure 4: the 2x2 HRC panels of a running training job.
+
+:class:`HRCDashboard` draws the Figure 4 layout once (axes, labels, grids,
+legends, colorbar) and then only updates the data of its artists as
+episodes arrive: the throughput/workload/safety lines, their fills and
+moving averages, the mean lines, and the trade-off scatter with the Pareto
+stars of the episodes shown. Updates are blitted: the static part of the figure is rendered once
+and cached (``copy_from_bbox``), and each refresh restores it and draws the
+changed artists on top, so a refresh costs a fraction of a full redraw. The
+figure is redrawn in full only when the episode axis has to grow (its limit
+doubles, or with ``span`` it advances by a quarter of the span), or when an
+interactive window is resized.
+
+Lines are reduced to the first/last/min/max point per pixel column and the
+scatter to one marker per cell (:mod:`arc_figures.lod`), so refresh cost
+stays bounded however long the run gets.
+
+Two front ends share it (``python -m arc_figures dashboard``):
+
+* interactive: a Matplotlib window (any GUI backend) updated in place;
+* headless: an Agg canvas whose PNG is re-encoded atomically after each
+  refresh, with an auto-reloading HTML page next to it, optionally served
+  on ``localhost``.
+
+Usage (from ``code/python``)::
+
+    python -m arc_figures dashboard runs/hrc_log.csv
+    python -m arc_figures dashboard runs/hrc_log.csv --headless live/hrc.png --serve 8000
+    python -m arc_figures dashboard --listen 127.0.0.1:5555 --span 2000 --interval 0.25
+"""
+
+import functools
+import os
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from .hrc import METRICS
+from .live import OnlineHRC
+from .lod import minmax_indices, pixel_size, scatter_indices
+from .pareto import HRC_MAXIMIZE, HRC_OBJECTIVES, pareto_front
+from .style import FigureSpec, rounded_box, style_context
+
+SPEC = FigureSpec("Figure4_HRC_Live.png", font_size=11, figsize=(16, 11), dpi=100,
+                  layout_rect=(0, 0, 1, 0.99))
+REFRESH_SECONDS = 0.5
+# Initial episode range of the time-series panels.
+INITIAL_EPISODES = 100
+
+# Time-series panels of Figure 4:
+# (metric, colour, ylabel, title, ylim, inverted, legend, mean colour, label offset)
+PANELS = (
+    ("Throughput", "#2E86AB", "Throughput (tasks/hour)", "(a) System Throughput Evolution",
+     (4.5, 7.0), False, "lower right", "green", -0.15),
+    ("Workload_100", "#A23B72", "Human Workload (0-100)", "(b) Human Workload Optimization",
+     (60, 90), True, "upper right", "blue", 1.5),
+    ("Safety_100", "#F18F01", "Safety Score (0-100)", "(c) Safety Score Progression",
+     (85, 101), False, "lower right", "darkgreen", -2.5),
+)
+TRADEOFF_LIMITS = ((5.2, 7.0), (60, 85))
+SUPTITLE = ("Adaptive Multi-Objective Reinforcement Learning for Human-Robot Collaboration\n"
+            "Performance Metrics: Fanuc M-20iA Industrial Manipulator (live)")
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>body {{ margin: 0; background: #fff; }} img {{ max-width: 100%; }}</style>
+</head>
+<body>
+<img id="figure" src="{image}" alt="{title}">
+<script>
+const img = document.getElementById("figure");
+setInterval(() => {{
+  const next = new Image();
+  next.onload = () => {{ img.src = next.src; }};
+  next.src = "{image}?t=" + Date.now();
+}}, {refresh_ms});
+</script>
+</body>
+</html>
+"""
+
+
+class _History:
+    """Append-only column store with amortised O(1) appends."""
+
+    def __init__(self, columns, capacity=1024):
+        self._data = {c: np.empty(capacity) for c in columns}
+        self.size = 0
+
+    def extend(self, batch):
+        n = len(batch["Episode"])
+        need = self.size + n
+        capacity = len(self._data["Episode"])
+        if need > capacity:
+            capacity = max(2 * capacity, need)
+            for column, values in self._data.items():
+                grown = np.empty(capacity)
+                grown[:self.size] = values[:self.size]
+                self._data[column] = grown
+        for column, values in self._data.items():
+            values[self.size:need] = batch[column]
+        self.size = need
+
+    def __getitem__(self, column):
+        return self._data[column][:self.size]
+
+
+@functools.lru_cache(maxsize=None)
+def _figure_class():
+    """
+    Figure class that draws under the :data:`SPEC` style.
+
+    Matplotlib resolves font families from rcParams when it draws, and the
+    dashboard draws long after it was built (refreshes, blits, window
+    resizes), so the style is applied around every draw, not only while
+    the artists are created.
+    """
+    from matplotlib.figure import Figure
+
+    class StyledFigure(Figure):
+        def draw(self, renderer):
+            with style_context(SPEC):
+                super().draw(renderer)
+
+        def draw_artist(self, a):
+            with style_context(SPEC):
+                super().draw_artist(a)
+
+    return StyledFigure
+
+
+class HRCDashboard:
+    """
+    Figure 4 panels updated in place from an :class:`arc_figures.live.OnlineHRC`.
+
+    It has the aggregator's ``extend``/``episodes`` interface, so it can be
+    passed to :func:`arc_figures.live.watch` with :meth:`refresh` as the
+    snapshot callback.
+
+    Args:
+        aggregator: OnlineHRC fed by :meth:`extend` (default: a new one).
+        headless: Draw on an Agg canvas without pyplot (no window).
+        dpi: Canvas resolution (the figure is 16 x 11 inches).
+        span: Show only the latest ``span`` episodes (None: the whole run);
+            the Pareto stars then mark the front of the episodes shown.
+    """
+
+    def __init__(self, aggregator=None, headless=False, dpi=SPEC.dpi, span=None):
+        self.aggregator = aggregator if aggregator is not None else OnlineHRC(keep=0)
+        self.dpi = dpi
+        self.span = span
+        self.redraws = 0
+        self.history = _History(("Episode", *METRICS, *(f"{m}_MA" for m in METRICS)))
+        self._background = None
+        with style_context(SPEC):
+            if headless:
+                from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+                self.fig = _figure_class()(figsize=SPEC.figsize, dpi=dpi)
+                FigureCanvasAgg(self.fig)
+            else:
+                import matplotlib.pyplot as plt
+
+                self.fig = plt.figure(figsize=SPEC.figsize, dpi=dpi,
+                                      FigureClass=_figure_class())
+            self._build()
+            self.fig.tight_layout(rect=list(SPEC.layout_rect))
+        self.canvas = self.fig.canvas
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+        self._redraw()
+
+    # -- layout ----------------------------------------------------------------
+
+    def _build(self):
+        from matplotlib.collections import PolyCollection
+
+        fig = self.fig
+        axes = fig.subplots(2, 2).ravel()
+        self.axes = axes
+        self._series = []
+        self._animated = []
+        legends = []
+        window = self.aggregator.window
+        for ax, (metric, color, ylabel, title, ylim, inverted, legend, mean_color,
+                 offset) in zip(axes, PANELS):
+            raw, = ax.plot([], [], linewidth=2.0, color=color, alpha=0.7)
+            fill = PolyCollection([], facecolors=color, edgecolors=color, alpha=0.25)
+            ax.add_collection(fill, autolim=False)
+            average, = ax.plot([], [], "r--", linewidth=2.5,
+                               label=f"{window}-Episode Moving Avg", alpha=0.9)
+            mean = ax.axhline(y=np.nan, color=mean_color, linestyle=":",
+                              linewidth=2.5, alpha=0.8, zorder=5)
+            label = ax.text(5, 0, "", fontsize=12, color=mean_color, fontweight="bold",
+                            bbox=rounded_box(0.3, facecolor="white", edgecolor=mean_color,
+                                             alpha=0.9))
+            ax.set_xlabel("Training Episode", fontsize=14, fontweight="bold")
+            ax.set_ylabel(ylabel, fontsize=14, fontweight="bold")
+            ax.set_title(title, fontsize=15, fontweight="bold", pad=10)
+            ax.grid(True, alpha=0.3, linestyle="--", linewidth=0.8)
+            legends.append(ax.legend(loc=legend, fontsize=12, framealpha=0.95,
+                                     edgecolor="black"))
+            ax.tick_params(axis="both", labelsize=12)
+            ax.set_ylim(ylim)
+            if inverted:
+                ax.invert_yaxis()
+            ax.set_xlim(0, self.span or INITIAL_EPISODES)
+            self._series.append((metric, ax, raw, fill, average, mean, label, offset))
+            self._animated += [fill, raw, average, mean, label]
+
+        ax = axes[3]
+        (xlim, ylim) = TRADEOFF_LIMITS
+        self._scatter = ax.scatter([], [], c=[], cmap="RdYlGn", s=100, alpha=0.7,
+                                   edgecolors="black", linewidth=1.2, vmin=90, vmax=100)
+        self._stars = ax.scatter([], [], s=200, marker="*", c="gold",
+                                 edgecolors="darkgoldenrod", linewidth=2.5,
+                                 label="Pareto Front (Non-Dominated)", zorder=10)
+        ax.set_xlabel("Throughput (tasks/hour)", fontsize=14, fontweight="bold")
+        ax.set_ylabel("Human Workload (0-100)", fontsize=14, fontweight="bold")
+        ax.set_title("(d) Multi-Objective Trade-off Space", fontsize=15, fontweight="bold",
+                     pad=10)
+        ax.grid(True, alpha=0.3, linestyle="--", linewidth=0.8)
+        ax.tick_params(axis="both", labelsize=12)
+        cbar = fig.colorbar(self._scatter, ax=ax, pad=0.02)
+        cbar.set_label("Safety Score", fontsize=13, fontweight="bold")
+        cbar.ax.tick_params(labelsize=12)
+        legends.append(ax.legend(loc="lower left", fontsize=12, framealpha=0.95,
+                                 edgecolor="black"))
+        ax.set_xlim(xlim)
+        ax.set_ylim(ylim)
+        ax.invert_yaxis()
+
+        fig.suptitle(SUPTITLE, fontsize=17, fontweight="bold", y=0.995)
+        self._status = fig.text(0.005, 0.005, "", ha="left", va="bottom", fontsize=11,
+                                color="dimgray")
+        # Legends are redrawn over the data they would otherwise be hidden by.
+        self._animated += [self._scatter, self._stars, *legends, self._status]
+        for artist in self._animated:
+            artist.set_animated(True)
+
+    # -- drawing ---------------------------------------------------------------
+
+    def _on_draw(self, event):
+        """Cache the static background after every full draw and repaint the data."""
+        self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        for artist in self._animated:
+            self.fig.draw_artist(artist)
+
+    def _redraw(self):
+        self.redraws += 1
+        self.canvas.draw()
+
+    def _episode_limits(self):
+        """x-limits covering the latest episode, or None if the current ones do."""
+        if not self.history.size:
+            return None
+        left, right = self.axes[0].get_xlim()
+        last = self.history["Episode"][-1]
+        if last <= right:
+            return None
+        if self.span is None:
+            while right < last:
+                right *= 2
+            return left, right
+        step = max(self.span // 4, 1)
+        right = (last // step + 1) * step
+        return max(right - self.span, 0), right
+
+    def _visible(self):
+        """Slice of the history inside the current episode range."""
+        if self.span is None:
+            return slice(0, self.history.size)
+        left = self.axes[0].get_xlim()[0]
+        return slice(int(np.searchsorted(self.history["Episode"], left)), self.history.size)
+
+    def _front_points(self, rows):
+        """Pareto front of the visible episodes (the whole run's without a span)."""
+        if self.span is None:
+            return self.aggregator.front_points()
+        points = np.column_stack([self.history[m][rows] for m in HRC_OBJECTIVES])
+        return points[pareto_front(points, HRC_MAXIMIZE)]
+
+    def _update_artists(self):
+        rows = self._visible()
+        episodes = self.history["Episode"][rows]
+        means = self.aggregator.means()
+        for metric, ax, raw, fill, average, mean, label, offset in self._series:
+            width = pixel_size(ax, self.dpi)[0]
+            values = self.history[metric][rows]
+            idx = minmax_indices(episodes, values, width) if len(values) else slice(0)
+            x, y = episodes[idx], values[idx]
+            raw.set_data(x, y)
+            fill.set_verts([np.column_stack([np.r_[x, x[::-1]], np.r_[y, np.zeros(len(y))]])]
+                           if len(x) else [])
+            rolled = self.history[f"{metric}_MA"][rows]
+            idx = minmax_indices(episodes, rolled, width) if len(rolled) else slice(0)
+            average.set_data(episodes[idx], rolled[idx])
+            if np.isfinite(means[metric]):
+                mean.set_ydata([means[metric]] * 2)
+                label.set_y(means[metric] + offset)
+                label.set_text(f"Mean: {means[metric]:.2f}")
+
+        ax = self.axes[3]
+        throughput = self.history["Throughput"][rows]
+        workload = self.history["Workload_100"][rows]
+        cell = np.sqrt(100) / 72 * self.dpi / 2
+        idx = scatter_indices(throughput, workload, ax.get_xlim(), ax.get_ylim(),
+                              pixel_size(ax, self.dpi), cell=cell)
+        self._scatter.set_offsets(np.column_stack([throughput[idx], workload[idx]]))
+        self._scatter.set_array(self.history["Safety_100"][rows][idx])
+        self._stars.set_offsets(self._front_points(rows)[:, :2])
+        self._status.set_text(f"{self.aggregator.episodes:,} episodes  |  "
+                              f"updated {time.strftime('%H:%M:%S')}")
+
+    def refresh(self, *_):
+        """
+        Show the episodes ingested since the last refresh.
+
+        Blits the changed artists over the cached background, or redraws
+        the figure when the episode axis has to grow.
+        """
+        limits = self._episode_limits()
+        if limits is not None:
+            for ax in self.axes[:3]:
+                ax.set_xlim(limits)
+        self._update_artists()
+        if limits is not None or self._background is None:
+            self._redraw()
+        else:
+            self.canvas.restore_region(self._background)
+            self._draw_animated()
+            self.canvas.blit(self.fig.bbox)
+        self.canvas.flush_events()
+
+    # -- aggregator interface ----------------------------------------------------
+
+    @property
+    def episodes(self):
+        return self.aggregator.episodes
+
+    def extend(self, columns):
+        """Ingest a batch of episodes (see :meth:`arc_figures.live.OnlineHRC.extend`)."""
+        batch = self.aggregator.extend(columns)
+        if batch is not None:
+            self.history.extend(batch)
+        return batch
+
+    # -- output ----------------------------------------------------------------
+
+    def write_png(self, path):
+        """Encode the current canvas to ``path`` (atomically, fast zlib level)."""
+        from PIL import Image
+
+        path = Path(path)
+        tmp = path.with_name(f".{path.name}.tmp")
+        Image.fromarray(np.asarray(self.canvas.buffer_rgba())).save(
+            tmp, format="PNG", compress_level=1)
+        os.replace(tmp, path)
+        return path
+
+
+def write_page(image, refresh=REFRESH_SECONDS):
+    """
+    Write ``<image stem>.html``, reloading ``image`` every ``refresh`` seconds.
+
+    The image is swapped only once the new one has loaded, so the page
+    does not flicker between refreshes.
+    """
+    image = Path(image)
+    page = image.with_suffix(".html")
+    page.write_text(PAGE.format(title="HRC training (live)", image=image.name,
+                                refresh_ms=max(int(refresh * 1000), 100)), encoding="utf-8")
+    return page
+
+
+def serve(directory, port, host="127.0.0.1"):
+    """
+    Serve ``directory`` over HTTP from a daemon thread.
+
+    Returns:
+        The ThreadingHTTPServer (call ``shutdown()`` to stop it).
+    """
+    from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+    class QuietHandler(SimpleHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def end_headers(self):
+            self.send_header("Cache-Control", "no-store")
+            super().end_headers()
+
+    handler = functools.partial(QuietHandler, directory=str(directory))
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
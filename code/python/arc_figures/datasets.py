@@ -0,0 +1,280 @@
+"""
+Columnar binary cache for the CSV datasets.
+
+The first read of a CSV converts it, chunk by chunk, into one ``.npy`` file
+per column; later reads memory-map those files instead of re-parsing text.
+A cache is reused while the CSV's size and mtime are unchanged, revalidated
+by SHA-256 when they differ (e.g. after a fresh checkout), and rebuilt when
+the content changed.
+
+Caches live in ``.arc_cache/`` next to the CSV unless ``ARC_CACHE_DIR`` is
+set. Cached arrays are read-only. pandas is only imported to parse a CSV
+(the first read) or to build a DataFrame (:func:`load_table`), so reading
+cached columns needs NumPy alone.
+
+Given a :class:`arc_figures.schema.Schema`, a CSV is parsed with the
+schema's explicit dtypes and its columns are validated before they are
+returned (:class:`arc_figures.schema.SchemaError` on violations); a passed
+validation is recorded in the cache metadata until the CSV changes.
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+
+from .cache import file_digest
+
+DATA_DIR = Path(__file__).resolve().parent.parent.parent.parent / "data"
+CACHE_DIR_NAME = ".arc_cache"
+CACHE_VERSION = 1
+CONVERT_CHUNKSIZE = 1_000_000
+
+
+def resolve_data_path(name, workdir="."):
+    """
+    Locate a dataset.
+
+    ``name`` is taken relative to ``workdir`` if such a file exists there
+    (the historical behaviour of the figure scripts), otherwise it is looked
+    up in the repository's ``data/`` directory.
+    """
+    local = Path(workdir) / name
+    return local if local.is_file() else DATA_DIR / name
+
+
+def cache_dir_for(csv_path):
+    """Directory holding the column cache of ``csv_path``."""
+    csv_path = Path(csv_path)
+    root = os.environ.get("ARC_CACHE_DIR")
+    root = Path(root) if root else csv_path.parent / CACHE_DIR_NAME
+    return root / csv_path.stem
+
+
+def _count_rows(csv_path):
+    """Number of data rows, counted from newlines without parsing."""
+    lines = 0
+    last = b"\n"
+    with open(csv_path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            lines += block.count(b"\n")
+            last = block[-1:]
+    if last != b"\n":
+        lines += 1
+    return max(lines - 1, 0)
+
+
+class _DtypeChange(Exception):
+    """
+    A column's inferred dtype changed between chunks.
+
+    ``dtype`` is what the column has to be re-parsed as: ``float64`` when a
+    numeric column widened, ``str`` when it switched between numeric and
+    text.
+    """
+
+    def __init__(self, column, dtype="float64"):
+        super().__init__(column)
+        self.column = column
+        self.dtype = dtype
+
+
+def _chunks(csv_path, header, dtype, schema, chunksize):
+    """``pd.read_csv`` chunks; parse failures of schema columns become SchemaErrors."""
+    import pandas as pd
+
+    written = 0
+    reader = pd.read_csv(csv_path, chunksize=chunksize, dtype=dtype)
+    while True:
+        try:
+            chunk = next(reader)
+        except StopIteration:
+            return
+        except (ValueError, TypeError):
+            if schema is None:
+                raise
+            from .schema import SchemaError, locate_parse_errors
+
+            found = locate_parse_errors(csv_path, schema, header, skip=written, nrows=chunksize)
+            if not found:
+                raise
+            raise SchemaError(csv_path, found) from None
+        written += len(chunk)
+        yield chunk
+
+
+def _convert(csv_path, target, dtype=None, chunksize=CONVERT_CHUNKSIZE, schema=None):
+    """Stream ``csv_path`` into per-column ``.npy`` files under ``target``."""
+    import pandas as pd
+
+    rows = _count_rows(csv_path)
+    columns = list(pd.read_csv(csv_path, nrows=0).columns)
+    if schema is not None:
+        dtype = {**schema.dtypes(columns), **(dtype or {})}
+    target.mkdir(parents=True)
+    arrays = {}
+    strings = {}
+    text = {}
+    written = 0
+    for chunk in _chunks(csv_path, columns, dtype or None, schema, chunksize):
+        for column in chunk.columns:
+            values = chunk[column].to_numpy()
+            if text.setdefault(column, values.dtype == object) != (values.dtype == object):
+                raise _DtypeChange(column, str)
+            if values.dtype == object:
+                strings.setdefault(column, []).extend(values.astype(str))
+                continue
+            if column not in arrays:
+                arrays[column] = np.lib.format.open_memmap(
+                    target / f"{column}.npy", mode="w+",
+                    dtype=values.dtype, shape=(rows,),
+                )
+            out = arrays[column]
+            if not np.can_cast(values.dtype, out.dtype, casting="same_kind"):
+                raise _DtypeChange(column)
+            out[written:written + len(values)] = values
+        written += len(chunk)
+
+    trimmed = {}
+    for column, out in arrays.items():
+        out.flush()
+        if written != rows:  # blank lines skipped by the parser
+            trimmed[column] = np.array(out[:written])
+    arrays.clear()
+    for column, values in trimmed.items():
+        np.save(target / f"{column}.npy", values)
+    for column, values in strings.items():
+        np.save(target / f"{column}.npy", np.array(values, dtype=str))
+    for column in columns:
+        if not (target / f"{column}.npy").exists():  # header-only file
+            np.save(target / f"{column}.npy", np.empty(0))
+    return columns, written
+
+
+def _build_cache(csv_path, cache_dir, stat, digest, schema=None):
+    tmp = cache_dir.with_name(f"{cache_dir.name}.tmp{os.getpid()}")
+    dtype = {}
+    while True:
+        shutil.rmtree(tmp, ignore_errors=True)
+        try:
+            columns, rows = _convert(csv_path, tmp, dtype=dtype or None,
+                                     chunksize=CONVERT_CHUNKSIZE, schema=schema)
+            break
+        except _DtypeChange as change:
+            dtype[change.column] = change.dtype
+        except Exception:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+    meta = {
+        "version": CACHE_VERSION,
+        "source": str(Path(csv_path).resolve()),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": digest,
+        "rows": rows,
+        "columns": columns,
+        "validated": [],
+    }
+    _write_meta(tmp, meta)
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    try:
+        tmp.rename(cache_dir)
+    except OSError:  # another process published the same cache first
+        shutil.rmtree(tmp, ignore_errors=True)
+    return meta
+
+
+def _write_meta(cache_dir, meta):
+    (cache_dir / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+
+def _read_meta(cache_dir):
+    try:
+        meta = json.loads((cache_dir / "meta.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("version") == CACHE_VERSION else None
+
+
+def ensure_cache(csv_path, schema=None):
+    """
+    Make sure the column cache of ``csv_path`` is current.
+
+    Args:
+        csv_path: Path of the CSV file.
+        schema: Schema whose dtypes are used if the CSV has to be parsed.
+
+    Returns:
+        The cache's metadata dict (columns, rows, source digest).
+    """
+    csv_path = Path(csv_path)
+    stat = csv_path.stat()
+    cache_dir = cache_dir_for(csv_path)
+    meta = _read_meta(cache_dir)
+    if meta and (meta["size"], meta["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+        return meta
+
+    digest = file_digest(csv_path)
+    if meta and meta["sha256"] == digest:
+        meta.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        _write_meta(cache_dir, meta)
+        return meta
+    return _build_cache(csv_path, cache_dir, stat, digest, schema)
+
+
+def _validate(csv_path, cache_dir, meta, schema):
+    """Check the cached columns against ``schema`` unless already done."""
+    key = schema.key()
+    if key in meta.get("validated", []):
+        return
+    from .schema import check
+
+    present = [c.name for c in schema.columns if c.name in meta["columns"]]
+    check({c: np.load(cache_dir / f"{c}.npy", mmap_mode="r") for c in present},
+          schema, csv_path)
+    meta["validated"] = [*meta.get("validated", []), key]
+    _write_meta(cache_dir, meta)
+
+
+def load_columns(csv_path, columns=None, schema=None):
+    """
+    Memory-map the cached columns of a CSV, converting it on first use.
+
+    Args:
+        csv_path: Path of the CSV file.
+        columns: Subset of columns to map (default: all, in file order).
+        schema: :class:`arc_figures.schema.Schema` the file must conform to.
+
+    Returns:
+        Dict of column name to read-only array.
+
+    Raises:
+        arc_figures.schema.SchemaError: If the file violates ``schema``.
+    """
+    meta = ensure_cache(csv_path, schema)
+    cache_dir = cache_dir_for(csv_path)
+    if schema is not None:
+        _validate(csv_path, cache_dir, meta, schema)
+    names = meta["columns"] if columns is None else list(columns)
+    missing = [c for c in names if c not in meta["columns"]]
+    if missing:
+        raise KeyError(f"{csv_path}: no column(s) {', '.join(missing)}")
+    return {c: np.load(cache_dir / f"{c}.npy", mmap_mode="r") for c in names}
+
+
+def load_table(name, columns=None, workdir=".", schema=None):
+    """
+    Load a dataset as a DataFrame backed by its memory-mapped column cache.
+
+    Args:
+        name: CSV file name or path (see :func:`resolve_data_path`).
+        columns: Subset of columns to load.
+        workdir: Directory ``name`` is first looked up in.
+        schema: Schema the file must conform to (see :func:`load_columns`).
+    """
+    import pandas as pd
+
+    return pd.DataFrame(load_columns(resolve_data_path(name, workdir), columns, schema),
+                        copy=False)
@@ -0,0 +1,423 @@
+"""
+Batch engine for the Technology Selection Decision Tool workbook.
+
+``supplementary/Technology_Selection_Decision_Tool.xlsx`` asks one
+institution at a time for its budget, cohort, educational context and
+infrastructure. :func:`compile_model` reads the workbook once with openpyxl
+and compiles it into a :class:`DecisionModel` of NumPy arrays:
+
+* the questions of the *Decision Tool* sheet, which become the columns of a
+  profile CSV (:data:`arc_figures.schema.PROFILE_SCHEMA`);
+* the technology options, cost ranges, effect sizes and audiences of the
+  *Technology Levels* sheet;
+* unit costs, maintenance rates and the horizon of the *Cost Calculator*
+  formulas, giving each option's total cost of ownership per student.
+
+The workbook holds no weights or recommendation formula (its result cell
+reads "See logic below"); the criteria and weights are those of section 2.1
+of the implementation guide (:data:`CRITERIA_WEIGHTS`). The answer scales
+and infrastructure needs below are the model's assumptions. Each option is
+scored per criterion in [0, 1] for all profiles at once; options a profile
+cannot afford are excluded while any option is affordable, and the best
+weighted score is recommended. Options the workbook recommends for all
+levels (the remote laboratory) are scored, and reported, at the profile's
+target level (:func:`target_level`).
+
+Compiled models are cached as JSON next to the workbook (``.arc_cache/``,
+or under ``ARC_CACHE_DIR``), keyed like the column cache by size, mtime and
+SHA-256, so later runs skip openpyxl and the workbook entirely.
+
+Usage (from ``code/python``)::
+
+    python -m arc_figures decide profiles.csv -o recommendations.csv
+"""
+
+from dataclasses import asdict, dataclass
+import json
+import os
+from pathlib import Path
+import re
+
+import numpy as np
+
+from .cache import file_digest
+from .datasets import DATA_DIR, cache_dir_for, load_columns
+from .schema import PROFILE_SCHEMA, SchemaError, Violation, check
+
+WORKBOOK = DATA_DIR.parent / "supplementary" / "Technology_Selection_Decision_Tool.xlsx"
+MODEL_VERSION = 1
+MODEL_NAME = "decision_model.json"
+
+# Implementation guide, section 2.1 "Decision Criteria".
+CRITERIA_WEIGHTS = {
+    "learning_objectives": 0.30,
+    "budget": 0.25,
+    "readiness": 0.20,
+    "infrastructure": 0.15,
+    "transferability": 0.10,
+}
+
+# Profile column -> label of the question on the Decision Tool sheet.
+QUESTIONS = {
+    "budget": "Total budget for robotics equipment",
+    "students": "Number of students",
+    "student_level": "Student level",
+    "prior_experience": "Prior robotics experience",
+    "learning_objectives": "Primary learning objectives",
+    "lab_space": "Dedicated robotics lab space",
+    "safety_systems": "Safety systems available",
+    "support_staff": "Technical support staff",
+}
+
+# Answer scales. Student level and objectives map to the technology level
+# they call for; prior experience shifts the student level.
+STUDENT_LEVELS = {
+    "k-12": 1.0, "early undergraduate": 2.0, "undergraduate": 3.0,
+    "technical program": 3.0, "advanced undergraduate": 4.0, "graduate": 4.0,
+    "professional": 5.0,
+}
+PRIOR_EXPERIENCE = {"none": -0.5, "basic": 0.0, "intermediate": 0.5, "advanced": 1.0}
+LEARNING_OBJECTIVES = {
+    "introductory": 1.5, "programming": 3.0, "system integration": 4.0,
+    "industrial practice": 5.0, "research": 5.0,
+}
+LAB_SPACE = {"no": 0.0, "none": 0.0, "shared": 0.5, "yes": 1.0, "dedicated": 1.0}
+SAFETY_SYSTEMS = {"no": 0.0, "none": 0.0, "basic": 0.5, "yes": 1.0, "industrial": 1.0}
+SUPPORT_STAFF = {"no": 0.0, "none": 0.0, "part-time": 0.5, "yes": 1.0, "dedicated": 1.0}
+FACILITIES = {"lab_space": LAB_SPACE, "safety_systems": SAFETY_SYSTEMS,
+              "support_staff": SUPPORT_STAFF}
+
+# Facilities (lab space, safety systems, support staff) each option needs.
+INFRASTRUCTURE_NEEDS = {
+    "Level 1-2": (0.25, 0.0, 0.0),
+    "Level 3": (0.5, 0.5, 0.25),
+    "Level 4": (1.0, 0.5, 0.5),
+    "Level 5": (1.0, 1.0, 1.0),
+    "Level 5 Remote": (0.0, 0.0, 0.0),
+}
+
+
+@dataclass
+class DecisionModel:
+    """
+    Technology options and scoring tables compiled from the workbook.
+
+    Per-option lists are aligned with ``options`` (the *Technology Levels*
+    labels, e.g. ``"Level 1-2"``).
+
+    Attributes:
+        questions: Profile column -> input cell on the Decision Tool sheet.
+        level_low, level_high: ARC levels an option spans.
+        remote: Whether the option is a remote laboratory.
+        all_levels: Whether the workbook recommends it for every audience.
+        tco: Cost of ownership per student over ``years`` (unit cost plus
+            annual maintenance, as in the Cost Calculator).
+        effect: Mean effect size.
+        needs: ``(option, facility)`` infrastructure needs in [0, 1].
+    """
+
+    source: str
+    questions: dict
+    options: list
+    names: list
+    level_low: list
+    level_high: list
+    remote: list
+    all_levels: list
+    cost_low: list
+    cost_high: list
+    unit_cost: list
+    maintenance: list
+    years: int
+    tco: list
+    effect: list
+    needs: list
+    weights: dict
+
+    def _arrays(self):
+        return {k: np.asarray(v) for k, v in asdict(self).items()
+                if isinstance(v, list) and k not in ("options", "names")}
+
+    def criterion_scores(self, profiles):
+        """
+        Per-criterion suitability of every option for every profile.
+
+        Args:
+            profiles: Mapping of profile column to array (one entry per
+                profile), e.g. from :func:`load_profiles`.
+
+        Returns:
+            Dict of criterion -> ``(profiles, options)`` array in [0, 1],
+            plus ``"affordable"`` (bool), ``"budget_per_student"`` and
+            ``"target_level"`` (see :func:`target_level`).
+        """
+        a = self._arrays()
+        budget_per_student = (np.asarray(profiles["budget"], dtype=float)
+                              / np.asarray(profiles["students"], dtype=float))
+        content = (a["level_low"] + a["level_high"]) / 2
+
+        def level_fit(target):
+            return 1 - np.abs(content[None, :] - target[:, None]) / 4
+
+        objectives = _encode(profiles, "learning_objectives", LEARNING_OBJECTIVES)
+        readiness = np.clip(_encode(profiles, "student_level", STUDENT_LEVELS)
+                            + _encode(profiles, "prior_experience", PRIOR_EXPERIENCE), 1, 5)
+        target = target_level(objectives, readiness)
+        # Options for all levels serve the level the profile calls for, so both
+        # fits compare their content with that level.
+        all_levels = a["all_levels"][None, :]
+        available = np.column_stack([_encode(profiles, column, scale)
+                                     for column, scale in FACILITIES.items()])
+        shortfall = np.maximum(a["needs"][None, :, :] - available[:, None, :], 0)
+        return {
+            "learning_objectives": np.where(all_levels, level_fit(target),
+                                            level_fit(objectives)),
+            "budget": np.minimum(budget_per_student[:, None] / a["tco"][None, :], 1),
+            "readiness": np.where(all_levels, level_fit(target), level_fit(readiness)),
+            "infrastructure": 1 - shortfall.mean(axis=2),
+            "transferability": np.broadcast_to(a["effect"] / a["effect"].max(),
+                                               (len(readiness), len(content))),
+            "affordable": budget_per_student[:, None] >= a["tco"][None, :],
+            "budget_per_student": budget_per_student,
+            "target_level": target,
+        }
+
+    def recommend(self, profiles):
+        """
+        Recommended technology for every profile.
+
+        Returns:
+            DataFrame with the recommended ``Level`` (1-5; options spanning
+            two levels give the higher one when the budget per student covers
+            the top of their cost range, options for all levels give the
+            profile's target level), ``Option``, ``Technology``,
+            ``Remote``, ``Score``, ``Affordable`` and one ``Score_<option>``
+            column per option.
+        """
+        import pandas as pd
+
+        scores = self.criterion_scores(profiles)
+        total = sum(weight * scores[c] for c, weight in self.weights.items())
+        affordable = scores["affordable"]
+        ranked = np.where(affordable | ~affordable.any(axis=1, keepdims=True), total, -np.inf)
+        best = ranked.argmax(axis=1)
+        rows = np.arange(len(best))
+
+        a = self._arrays()
+        top_cost = a["cost_high"] * (1 + self.years * a["maintenance"])
+        level = np.where(scores["budget_per_student"] >= top_cost[best],
+                         a["level_high"][best], a["level_low"][best])
+        target = np.clip(np.floor(scores["target_level"] + 0.5), 1, 5).astype(int)
+        level = np.where(a["all_levels"][best], target, level)
+        table = pd.DataFrame({
+            "Level": level,
+            "Option": np.asarray(self.options)[best],
+            "Technology": np.asarray(self.names)[best],
+            "Remote": a["remote"][best],
+            "Score": total[rows, best],
+            "Affordable": affordable[rows, best],
+            "Budget_Per_Student": scores["budget_per_student"],
+        })
+        for i, option in enumerate(self.options):
+            table[f"Score_{option.replace(' ', '_')}"] = total[:, i]
+        return table
+
+
+def target_level(objectives, readiness):
+    """
+    Technology level a profile calls for: midway between the level of its
+    learning objectives and its students' readiness (both on the 1-5 scale).
+    """
+    return (np.asarray(objectives, dtype=float) + np.asarray(readiness, dtype=float)) / 2
+
+
+def _normalise(values):
+    text = np.char.lower(np.char.strip(np.asarray(values).astype(str)))
+    return np.char.replace(text, "_", " ")
+
+
+def _encode(profiles, column, scale):
+    """Map answers to their scale values, reporting unknown answers by row."""
+    answers, inverse = np.unique(_normalise(profiles[column]), return_inverse=True)
+    known = np.array([a in scale for a in answers])
+    if not known.all():
+        violations = []
+        for code in np.flatnonzero(~known):
+            rows = np.flatnonzero(inverse == code)
+            violations.append(Violation(
+                column, f"unknown answer {answers[code]!r} (expected one of "
+                        f"{', '.join(sorted(scale))})",
+                tuple(int(r) for r in rows[:10]), len(rows)))
+        raise SchemaError("profiles", violations)
+    return np.array([scale[a] for a in answers])[inverse]
+
+
+def _rows(sheet):
+    return [[cell for cell in row] for row in sheet.iter_rows(values_only=True)]
+
+
+def _label(value):
+    return str(value).strip().rstrip(":").strip() if value is not None else ""
+
+
+def _numbers(text):
+    return [float(n.replace(",", "")) for n in re.findall(r"\d[\d,]*\.?\d*|\.\d+", str(text))]
+
+
+def _table(rows, first_header, path, sheet):
+    """Rows under the header row starting with ``first_header``, up to a blank."""
+    for i, row in enumerate(rows):
+        if _label(row[0]) == first_header:
+            body = []
+            for values in rows[i + 1:]:
+                if not _label(values[0]):
+                    break
+                body.append(values)
+            return [_label(h) for h in row], body
+    raise ValueError(f"{path}: no {first_header!r} table on sheet {sheet!r}")
+
+
+def _formula_factor(formula, path, cell):
+    """Trailing constant of a ``=X*k`` formula (maintenance rate, horizon)."""
+    match = re.search(r"\*\s*([0-9.]+)\s*$", str(formula))
+    if not match:
+        raise ValueError(f"{path}: cannot read the factor of {cell} ({formula!r})")
+    return float(match.group(1))
+
+
+def compile_model(workbook=WORKBOOK, weights=None):
+    """
+    Parse the decision tool workbook into a :class:`DecisionModel`.
+
+    Args:
+        workbook: Path of the ``.xlsx`` file.
+        weights: Criterion weights (default: :data:`CRITERIA_WEIGHTS`).
+
+    Raises:
+        ValueError: If a question, table or option the model relies on is
+            missing from the workbook.
+    """
+    try:
+        import openpyxl
+    except ImportError as exc:
+        raise ValueError("compiling the decision model needs openpyxl") from exc
+
+    path = Path(workbook)
+    book = openpyxl.load_workbook(path, read_only=True)
+    try:
+        tool = _rows(book["Decision Tool"])
+        levels = _rows(book["Technology Levels"])
+        calculator = _rows(book["Cost Calculator"])
+    except KeyError as exc:
+        raise ValueError(f"{path}: missing sheet {exc}") from exc
+    finally:
+        book.close()
+
+    questions = {}
+    for column, label in QUESTIONS.items():
+        row = next((i for i, r in enumerate(tool) if _label(r[0]).startswith(label)), None)
+        if row is None:
+            raise ValueError(f"{path}: question {label!r} not found on sheet 'Decision Tool'")
+        questions[column] = f"C{row + 1}"
+
+    header, body = _table(levels, "Level", path, "Technology Levels")
+    col = {name: header.index(name) for name in
+           ("Level", "Name", "Cost Range", "Effect Size", "Best For")}
+    _, costs = _table(calculator, "Technology Level", path, "Cost Calculator")
+    unit_costs, maintenance, years = {}, {}, None
+    first_row = next(i for i, r in enumerate(calculator) if _label(r[0]) == "Technology Level")
+    for offset, row in enumerate(costs):
+        label = _label(row[0])
+        key = label.split(":")[0] + (" Remote" if "remote" in label.lower() else "")
+        excel_row = first_row + offset + 2
+        unit_costs[key] = float(row[1])
+        maintenance[key] = _formula_factor(row[4], path, f"E{excel_row}")
+        years = int(_formula_factor(row[5], path, f"F{excel_row}"))
+
+    fields = {k: [] for k in ("options", "names", "level_low", "level_high", "remote",
+                              "all_levels", "cost_low", "cost_high", "unit_cost",
+                              "maintenance", "tco", "effect", "needs")}
+    for row in body:
+        option = _label(row[col["Level"]])
+        if option not in unit_costs or option not in INFRASTRUCTURE_NEEDS:
+            raise ValueError(f"{path}: option {option!r} has no cost calculator row "
+                             "or infrastructure profile")
+        numbers = [int(n) for n in _numbers(option)]
+        cost_range = _numbers(row[col["Cost Range"]])
+        effect = _numbers(row[col["Effect Size"]])
+        fields["options"].append(option)
+        fields["names"].append(_label(row[col["Name"]]))
+        fields["level_low"].append(min(numbers))
+        fields["level_high"].append(max(numbers))
+        fields["remote"].append("remote" in option.lower())
+        fields["all_levels"].append(_label(row[col["Best For"]]).lower().startswith("all levels"))
+        fields["cost_low"].append(min(cost_range))
+        fields["cost_high"].append(max(cost_range))
+        fields["unit_cost"].append(unit_costs[option])
+        fields["maintenance"].append(maintenance[option])
+        fields["tco"].append(unit_costs[option] * (1 + years * maintenance[option]))
+        fields["effect"].append(float(np.mean(effect)))
+        fields["needs"].append(list(INFRASTRUCTURE_NEEDS[option]))
+
+    weights = dict(CRITERIA_WEIGHTS if weights is None else weights)
+    unknown = set(weights) - set(CRITERIA_WEIGHTS)
+    if unknown:
+        raise ValueError(f"unknown criteria: {', '.join(sorted(unknown))}")
+    return DecisionModel(source=str(path), questions=questions, years=years,
+                         weights=weights, **fields)
+
+
+def load_model(workbook=WORKBOOK, weights=None, cache=True):
+    """
+    Compiled model of ``workbook``, from the cache when it is current.
+
+    Args:
+        workbook: Path of the ``.xlsx`` file.
+        weights: Criterion weights (part of the cache key).
+        cache: Read and write the cached model.
+    """
+    path = Path(workbook)
+    weights = dict(CRITERIA_WEIGHTS if weights is None else weights)
+    if not cache:
+        return compile_model(path, weights)
+
+    target = cache_dir_for(path) / MODEL_NAME
+    stat = path.stat()
+    try:
+        stored = json.loads(target.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        stored = None
+    if stored and stored.get("version") == MODEL_VERSION and stored["weights"] == weights:
+        if (stored["size"], stored["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns) \
+                or stored["sha256"] == file_digest(path):
+            return DecisionModel(**stored["model"])
+
+    model = compile_model(path, weights)
+    payload = {"version": MODEL_VERSION, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+               "sha256": file_digest(path), "weights": weights, "model": asdict(model)}
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f"{target.name}.tmp{os.getpid()}")
+    tmp.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    os.replace(tmp, target)
+    return model
+
+
+def load_profiles(csv_path):
+    """Institution profiles of a CSV as validated columns (see ``PROFILE_SCHEMA``)."""
+    return load_columns(csv_path, schema=PROFILE_SCHEMA)
+
+
+def recommend(profiles, model=None):
+    """
+    Recommend a technology for each profile.
+
+    Args:
+        profiles: Profile CSV path or mapping of column to values.
+        model: Compiled model (default: :func:`load_model`).
+    """
+    if isinstance(profiles, (str, Path)):
+        profiles = load_profiles(profiles)
+    else:
+        profiles = {c: np.asarray(v) for c, v in dict(profiles).items()}
+        check(profiles, PROFILE_SCHEMA, "profiles")
+    return (model or load_model()).recommend(profiles)
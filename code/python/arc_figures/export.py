@@ -0,0 +1,231 @@
+"""
+Multi-format, multi-resolution figure export from one layout pass.
+
+A figure is laid out once and its tight bounding box computed once; every
+requested output then reuses that box instead of ``bbox_inches='tight'``
+re-running the layout per file:
+
+* Raster formats (PNG, TIFF, JPEG) are drawn by Agg once per distinct
+  resolution at or above the figure's DPI; lower resolutions (thumbnails)
+  are resampled (Lanczos) from the nearest drawn raster instead of drawn.
+* Vector formats (PDF, SVG, EPS) are written by their Matplotlib backends.
+* Encoding, resampling and optional lossless PNG optimization run on a
+  thread pool (Pillow releases the GIL) while the next format is drawn.
+
+Extra outputs are requested with specs such as ``"pdf"``, ``"svg"``,
+``"tiff@600"`` or ``"png@96"`` (see :func:`parse_exports`), either passed to
+:func:`export_figure` or, for the figure scripts, through the
+``ARC_EXPORT`` environment variable (``python -m arc_figures build
+--formats`` sets it). ``ARC_PNG_OPTIMIZE=1`` enables lossless PNG
+optimization. Without extra outputs a figure is saved exactly as before.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import io
+import os
+from pathlib import Path
+
+RASTER_FORMATS = {"png": "PNG", "tiff": "TIFF", "tif": "TIFF", "jpeg": "JPEG", "jpg": "JPEG"}
+VECTOR_FORMATS = ("pdf", "svg", "eps", "ps")
+ENCODER_THREADS = 4
+
+
+@dataclass(frozen=True)
+class Export:
+    """
+    One requested output.
+
+    Attributes:
+        format: File extension (``png``, ``tiff``, ``pdf``, ...).
+        dpi: Resolution of raster formats; None for the figure's own DPI.
+    """
+
+    format: str
+    dpi: int = None
+
+    @property
+    def raster(self):
+        return self.format in RASTER_FORMATS
+
+    def path(self, output, figure_dpi):
+        """
+        File this export writes next to the figure's main ``output``.
+
+        Vector files and rasters at the figure's DPI take the output's stem
+        (``Figure2.pdf``); other resolutions add it (``Figure2_96dpi.png``).
+        """
+        output = Path(output)
+        if self.raster and self.dpi not in (None, figure_dpi):
+            return output.with_name(f"{output.stem}_{self.dpi}dpi.{self.format}")
+        return output.with_suffix(f".{self.format}")
+
+    def __str__(self):
+        return self.format if self.dpi is None else f"{self.format}@{self.dpi}"
+
+
+def parse_exports(text):
+    """
+    Parse a comma-separated export list such as ``"pdf,svg,tiff@600,png@96"``.
+
+    Returns:
+        Tuple of Export, in order, without duplicates.
+
+    Raises:
+        ValueError: Unknown format, invalid DPI or a DPI on a vector format.
+    """
+    exports = []
+    for item in (text or "").split(","):
+        item = item.strip().lower()
+        if not item:
+            continue
+        fmt, _, dpi = item.partition("@")
+        if fmt not in RASTER_FORMATS and fmt not in VECTOR_FORMATS:
+            known = ", ".join([*RASTER_FORMATS, *VECTOR_FORMATS])
+            raise ValueError(f"unknown export format {fmt!r} (known: {known})")
+        if dpi and fmt in VECTOR_FORMATS:
+            raise ValueError(f"{item!r}: vector formats take no DPI")
+        if dpi and (not dpi.isdigit() or int(dpi) == 0):
+            raise ValueError(f"{item!r}: DPI must be a positive integer")
+        export = Export(fmt, int(dpi) if dpi else None)
+        if export not in exports:
+            exports.append(export)
+    return tuple(exports)
+
+
+def requested_exports():
+    """Exports requested through ``ARC_EXPORT`` (empty if unset)."""
+    return parse_exports(os.environ.get("ARC_EXPORT", ""))
+
+
+def optimize_requested():
+    """Whether ``ARC_PNG_OPTIMIZE`` asks for lossless PNG optimization."""
+    return os.environ.get("ARC_PNG_OPTIMIZE", "0") not in ("", "0")
+
+
+def tight_bbox(fig, dpi):
+    """
+    The padded tight bounding box (inches) ``savefig(bbox_inches='tight')``
+    would use at ``dpi``.
+    """
+    import matplotlib
+
+    original = fig.dpi
+    try:
+        fig.dpi = dpi
+        fig.draw_without_rendering()
+        bbox = fig.get_tightbbox(fig.canvas.get_renderer())
+    finally:
+        fig.dpi = original
+    pad = matplotlib.rcParams["savefig.pad_inches"]
+    return bbox.padded(0.1 if pad == "layout" else pad)
+
+
+class _Discard(io.RawIOBase):
+    """Sink for the raw bytes ``savefig`` writes; pixels are read from Agg."""
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        return len(data)
+
+
+def _draw_raster(fig, bbox, dpi, facecolor):
+    """Agg-render the ``bbox`` region at ``dpi`` into an RGBA array."""
+    import numpy as np
+
+    fig.savefig(_Discard(), format="rgba", dpi=dpi, bbox_inches=bbox, facecolor=facecolor)
+    # The canvas keeps the renderer of the last draw; copy its pixels before
+    # a later draw reuses it.
+    return np.array(fig.canvas.renderer.buffer_rgba(), dtype=np.uint8)
+
+
+def _encode(pixels, path, fmt, dpi, optimize, source_dpi=None):
+    """Resample (if ``source_dpi`` is given) and write one raster file."""
+    import matplotlib
+    from PIL import Image
+    from PIL.PngImagePlugin import PngInfo
+
+    image = Image.fromarray(pixels, "RGBA")
+    if source_dpi is not None and source_dpi != dpi:
+        size = (max(1, round(image.width * dpi / source_dpi)),
+                max(1, round(image.height * dpi / source_dpi)))
+        image = image.resize(size, Image.LANCZOS)
+    kind = RASTER_FORMATS[fmt]
+    options = {"dpi": (dpi, dpi)}
+    if kind == "PNG":
+        info = PngInfo()
+        info.add_text("Software", f"Matplotlib version{matplotlib.__version__}, "
+                                  "https://matplotlib.org/")
+        options.update(pnginfo=info, optimize=optimize)
+    else:
+        # TIFF and JPEG are written as RGB, composited over white.
+        if pixels[..., 3].min() == 255:
+            image = image.convert("RGB")
+        else:
+            background = Image.new("RGB", image.size, "white")
+            background.paste(image, mask=image.getchannel("A"))
+            image = background
+        if kind == "TIFF":
+            options["compression"] = "tiff_lzw"
+        else:
+            options["quality"] = 95
+    image.save(path, format=kind, **options)
+    return Path(path)
+
+
+def export_figure(fig, path, dpi=300, exports=(), optimize=False, facecolor="white"):
+    """
+    Write ``fig`` to ``path`` and to every export, from one layout pass.
+
+    The figure must already be laid out (``tight_layout``); it is not closed.
+
+    Args:
+        fig: Figure to write.
+        path: Main output; its suffix selects the format.
+        dpi: Resolution of the main output and of exports without a DPI.
+        exports: Export records (see :func:`parse_exports`).
+        optimize: Losslessly optimize PNG outputs (slower, smaller files).
+        facecolor: Background colour.
+
+    Returns:
+        List of the paths written, main output first.
+    """
+    main = Export(Path(path).suffix.lstrip(".").lower() or "png", None)
+    outputs = [(main, Path(path))]
+    outputs += [(e, e.path(path, dpi)) for e in exports
+                if e.path(path, dpi) != Path(path)]
+    if not main.raster and not exports:
+        fig.savefig(path, dpi=dpi, bbox_inches="tight", facecolor=facecolor)
+        return [Path(path)]
+
+    bbox = tight_bbox(fig, dpi)
+    rasters = [(e, p, e.dpi or dpi) for e, p in outputs if e.raster]
+    drawn = sorted({d for _, _, d in rasters if d >= dpi})
+    written = {}
+    with ThreadPoolExecutor(max_workers=ENCODER_THREADS) as pool:
+        futures = []
+        masters = {}
+        for draw_dpi in drawn:
+            masters[draw_dpi] = _draw_raster(fig, bbox, draw_dpi, facecolor)
+            for export, out, out_dpi in rasters:
+                if out_dpi == draw_dpi:
+                    futures.append((out, pool.submit(
+                        _encode, masters[draw_dpi], out, export.format, out_dpi, optimize)))
+        for export, out, out_dpi in rasters:
+            if out_dpi < dpi:
+                source = min(masters) if masters else dpi
+                if source not in masters:
+                    masters[source] = _draw_raster(fig, bbox, source, facecolor)
+                futures.append((out, pool.submit(
+                    _encode, masters[source], out, export.format, out_dpi, optimize,
+                    source)))
+        for export, out in outputs:
+            if not export.raster:
+                fig.savefig(out, format=export.format, dpi=dpi, bbox_inches=bbox,
+                            facecolor=facecolor)
+                written[out] = out
+        for out, future in futures:
+            written[out] = future.result()
+    return [written[out] for _, out in outputs]
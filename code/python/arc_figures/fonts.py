@@ -0,0 +1,240 @@
+"""
+Persistent font-resolution and text-extent caches.
+
+Two things the text-heavy figures (2 and 6) otherwise recompute on every run:
+
+* **Font index.** Which installed family a serif fallback list (e.g.
+  :data:`arc_figures.style.PAGELLA`) resolves to. :func:`resolve_family`
+  answers from ``font_index.json`` while the set of installed fonts and the
+  Matplotlib version are unchanged, and only searches the font manager (and
+  records the answer) otherwise. ``python -m arc_figures build`` fills the
+  index before starting its workers.
+* **Text extents.** Width, height and descent of a string as laid out by the
+  Agg renderer, keyed by (string, font properties and fallback lists, DPI,
+  hinting). Matplotlib memoizes these per renderer only, so ``tight_layout``
+  and ``bbox_inches='tight'`` measure every label again on each save and each
+  run. Inside :func:`text_extents`, ``RendererAgg.get_text_width_height_descent``
+  serves plain-text measurements from a cache kept in memory for the process
+  and in ``text_extents.json`` across runs. Math text and other renderers are
+  measured as usual. Only public Matplotlib API is involved, so this works on
+  every supported Matplotlib version.
+
+Both files live in ``code/python/.arc_cache/`` unless ``ARC_CACHE_DIR`` is
+set; ``ARC_TEXT_CACHE=0`` disables the text-extent cache. Cached values are
+the renderer's own measurements, so output is unchanged.
+"""
+
+import contextlib
+import functools
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+from .datasets import CACHE_DIR_NAME
+
+PYTHON_DIR = Path(__file__).resolve().parent.parent
+FONT_INDEX_NAME = "font_index.json"
+TEXT_EXTENTS_NAME = "text_extents.json"
+# Entries kept in text_extents.json; older ones are dropped beyond this.
+MAX_TEXT_EXTENTS = 20_000
+
+
+def cache_dir():
+    """Directory of the font index and the text-extent cache."""
+    root = os.environ.get("ARC_CACHE_DIR")
+    return Path(root) if root else PYTHON_DIR / CACHE_DIR_NAME
+
+
+def _read_json(path):
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path, payload):
+    """Write ``payload`` atomically (concurrent build workers may race)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.tmp{os.getpid()}")
+    tmp.write_text(json.dumps(payload), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+@functools.lru_cache(maxsize=None)
+def font_digest():
+    """Fingerprint of the Matplotlib/FreeType versions and the installed fonts."""
+    import matplotlib
+    from matplotlib import font_manager, ft2font
+
+    fonts = sorted(
+        {(f.name, f.style, str(f.weight), f.stretch, f.fname)
+         for f in font_manager.fontManager.ttflist}
+    )
+    payload = json.dumps({
+        "matplotlib": matplotlib.__version__,
+        "freetype": ft2font.__freetype_version__,
+        "fonts": fonts,
+    })
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ==============================================================================
+# Font index
+# ==============================================================================
+
+def _search_family(serif):
+    import matplotlib
+    from matplotlib import font_manager
+
+    # Missing families are expected here; do not warn about each of them.
+    logger = logging.getLogger("matplotlib.font_manager")
+    level = logger.level
+    logger.setLevel(logging.ERROR)
+    try:
+        with matplotlib.rc_context({"font.family": "serif", "font.serif": list(serif)}):
+            path = font_manager.findfont(font_manager.FontProperties(family="serif"))
+    finally:
+        logger.setLevel(level)
+    return font_manager.FontProperties(fname=path).get_name()
+
+
+def resolve_family(serif, index_path=None):
+    """
+    Family Matplotlib selects for a serif fallback list, via the font index.
+
+    Args:
+        serif: Fallback list, tried in order like ``font.serif``.
+        index_path: Index file (default: ``font_index.json`` in
+            :func:`cache_dir`).
+
+    Returns:
+        Name of the first installed family, or of Matplotlib's default
+        family when none of them is installed.
+    """
+    return build_font_index([serif], index_path)[0]
+
+
+def build_font_index(fallbacks, index_path=None):
+    """
+    Resolve several fallback lists, updating the on-disk index if needed.
+
+    Returns:
+        List of resolved family names, one per fallback list.
+    """
+    path = Path(index_path) if index_path else cache_dir() / FONT_INDEX_NAME
+    digest = font_digest()
+    index = _read_json(path)
+    if not isinstance(index, dict) or index.get("fonts") != digest:
+        index = {"fonts": digest, "families": {}}
+    families = index["families"]
+    resolved, changed = [], False
+    for serif in fallbacks:
+        key = "|".join(serif)
+        if key not in families:
+            families[key] = _search_family(serif)
+            changed = True
+        resolved.append(families[key])
+    if changed:
+        try:
+            _write_json(path, index)
+        except OSError:
+            pass  # read-only checkout: resolve again next time
+    return resolved
+
+
+# ==============================================================================
+# Text extents
+# ==============================================================================
+
+_extents = None        # key -> [width, height, descent], shared by the process
+_extents_added = 0     # entries not yet written to disk
+
+
+def _extents_path():
+    return cache_dir() / TEXT_EXTENTS_NAME
+
+
+def _load_extents():
+    global _extents
+    if _extents is None:
+        stored = _read_json(_extents_path())
+        valid = isinstance(stored, dict) and stored.get("fonts") == font_digest()
+        _extents = dict(stored["extents"]) if valid else {}
+    return _extents
+
+
+def _save_extents():
+    global _extents_added
+    if not _extents_added:
+        return
+    digest = font_digest()
+    stored = _read_json(_extents_path())
+    merged = {}
+    if isinstance(stored, dict) and stored.get("fonts") == digest:
+        merged.update(stored["extents"])
+    merged.update(_extents)
+    if len(merged) > MAX_TEXT_EXTENTS:
+        merged = dict(list(merged.items())[-MAX_TEXT_EXTENTS:])
+    try:
+        _write_json(_extents_path(), {"fonts": digest, "extents": merged})
+    except OSError:
+        return
+    _extents_added = 0
+
+
+def _extent_key(text, fontprop, dpi):
+    import matplotlib
+
+    # The installed fonts are part of font_digest(), so the properties and the
+    # generic-family fallback lists determine the font files Agg lays out with.
+    rc = matplotlib.rcParams
+    families = fontprop.get_family()
+    return json.dumps([
+        text, families, [rc.get(f"font.{family}") for family in families],
+        fontprop.get_style(), fontprop.get_variant(), str(fontprop.get_weight()),
+        str(fontprop.get_stretch()), fontprop.get_size_in_points(), dpi,
+        rc["text.hinting"], rc["text.hinting_factor"], rc["text.kerning_factor"],
+    ], ensure_ascii=False)
+
+
+def _cached_metrics(measure):
+    @functools.wraps(measure)
+    def get_text_width_height_descent(renderer, s, prop, ismath):
+        global _extents_added
+        if ismath:
+            return measure(renderer, s, prop, ismath)
+        key = _extent_key(s, prop, renderer.dpi)
+        value = _extents.get(key)
+        if value is None:
+            value = measure(renderer, s, prop, ismath)
+            _extents[key] = list(value)
+            _extents_added += 1
+        return tuple(value)
+
+    get_text_width_height_descent.measure = measure
+    return get_text_width_height_descent
+
+
+@contextlib.contextmanager
+def text_extents():
+    """
+    Serve plain-text measurements from the persistent extent cache.
+
+    Re-entrant; the cache is written back when the outermost block exits.
+    """
+    from matplotlib.backends.backend_agg import RendererAgg
+
+    current = RendererAgg.get_text_width_height_descent
+    if hasattr(current, "measure") or os.environ.get("ARC_TEXT_CACHE") == "0":
+        yield
+        return
+    _load_extents()
+    RendererAgg.get_text_width_height_descent = _cached_metrics(current)
+    try:
+        yield
+    finally:
+        RendererAgg.get_text_width_height_descent = current
+        _save_extents()
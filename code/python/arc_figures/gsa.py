@@ -0,0 +1,397 @@
+"""
+Global sensitivity analysis of the Fanuc HRC parameters.
+
+Complements the one-at-a-time sweep of Figure 5 with variance-based (Sobol)
+and elementary-effects (Morris) analyses over the joint parameter space:
+
+* :func:`saltelli_sample` builds the ``A``, ``B`` and ``AB_i`` matrices from
+  a scrambled Sobol sequence; :func:`sobol_indices` computes first-order
+  (Saltelli 2010) and total (Jansen) indices, with bootstrap confidence
+  intervals computed for all resamples and parameters at once.
+* :func:`morris_sample` builds ``r`` one-at-a-time trajectories;
+  :func:`morris_indices` computes mu, mu* and sigma of the elementary effects.
+
+Model outputs come from any evaluator: a callable mapping an ``(m, d)``
+array of parameter values to ``m`` outputs (or an ``(m, k)`` array for
+``k`` outputs). :func:`evaluate` feeds it in batches, optionally across a
+process pool, so expensive simulators can be plugged in directly. The
+default evaluator, :class:`OATSurrogate`, interpolates the shipped
+one-at-a-time sweep additively; being additive it has no interactions
+(first-order and total indices agree), so interaction effects need a real
+simulator as evaluator.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import math
+
+import numpy as np
+import pandas as pd
+from scipy.stats import qmc
+
+from .style import save_figure
+
+# Parameters of the shipped sweep, as multipliers of their baseline values.
+PARAMETERS = ("fatigueRate", "w1", "w3", "auctionFrequency")
+DEFAULT_BOUNDS = (0.9, 1.1)
+BOOT_CHUNK = 128
+EVAL_BATCH = 4096
+
+
+def _bounds(bounds, d):
+    bounds = np.asarray(DEFAULT_BOUNDS if bounds is None else bounds, dtype=float)
+    if bounds.ndim == 1:
+        bounds = np.tile(bounds, (d, 1))
+    if bounds.shape != (d, 2) or np.any(bounds[:, 0] >= bounds[:, 1]):
+        raise ValueError("bounds must be (low, high) or one (low, high) per parameter")
+    return bounds
+
+
+@dataclass
+class SaltelliDesign:
+    """
+    Saltelli sample matrices.
+
+    Attributes:
+        A, B: Base matrices, shape (n, d).
+        AB: ``AB[i]`` is ``A`` with column ``i`` taken from ``B``, shape (d, n, d).
+    """
+
+    A: np.ndarray
+    B: np.ndarray
+    AB: np.ndarray
+
+    @property
+    def points(self):
+        """All ``n * (d + 2)`` points to evaluate, as one (m, d) array."""
+        return np.vstack([self.A, self.B, self.AB.reshape(-1, self.A.shape[1])])
+
+    def split(self, y):
+        """Split outputs of :attr:`points` into ``(yA, yB, yAB)``."""
+        y = np.asarray(y, dtype=float)
+        n, d = self.A.shape
+        return y[:n], y[n:2 * n], y[2 * n:].reshape(d, n, *y.shape[1:])
+
+
+def saltelli_sample(n, bounds=None, d=len(PARAMETERS), seed=0):
+    """
+    Saltelli design over ``d`` parameters from a scrambled Sobol sequence.
+
+    Args:
+        n: Base sample size, rounded up to a power of two (Sobol balance).
+        bounds: ``(low, high)`` for every parameter, or one pair per parameter.
+
+    Returns:
+        SaltelliDesign with ``n * (d + 2)`` points in total.
+    """
+    bounds = _bounds(bounds, d)
+    m = max(math.ceil(math.log2(n)), 1)
+    unit = qmc.Sobol(d=2 * d, scramble=True, seed=seed).random_base2(m)
+    base = np.tile(bounds[:, 0], 2) + unit * np.tile(bounds[:, 1] - bounds[:, 0], 2)
+    A, B = base[:, :d], base[:, d:]
+    AB = np.repeat(A[None], d, axis=0)
+    AB[np.arange(d), :, np.arange(d)] = B.T
+    return SaltelliDesign(A, B, AB)
+
+
+def _row_moments(yA, yB, yAB):
+    """
+    Per-row terms whose means determine S1 and ST, shape (n, 4 + 3d).
+
+    Outputs are shifted by their overall mean first (the indices are shift
+    invariant), which keeps a large output level such as workload ~1250 from
+    inflating the first-order estimator's variance or losing precision.
+    """
+    shift = (yA.mean() + yB.mean()) / 2
+    a, b = yA - shift, yB - shift
+    D = (yAB - yA).T                                    # (n, d)
+    return np.column_stack([a, b, a ** 2, b ** 2, D, b[:, None] * D, D ** 2])
+
+
+def _sobol_from_means(M, d):
+    """S1 (Saltelli 2010) and ST (Jansen) from row-moment means (..., 4 + 3d)."""
+    a, b, a2, b2 = M[..., 0], M[..., 1], M[..., 2], M[..., 3]
+    D, bD, D2 = M[..., 4:4 + d], M[..., 4 + d:4 + 2 * d], M[..., 4 + 2 * d:]
+    mean = (a + b) / 2
+    var = ((a2 + b2) / 2 - mean ** 2)[..., None]
+    return (bD - b[..., None] * D) / var, 0.5 * D2 / var
+
+
+def sobol_indices(yA, yB, yAB, n_boot=1000, conf=0.95, seed=0):
+    """
+    First-order and total Sobol indices with bootstrap confidence intervals.
+
+    Every estimator term is a mean over the ``n`` base rows, so a batch of
+    bootstrap resamples is one product of a resample-count matrix with the
+    per-row terms.
+
+    Args:
+        yA, yB: Outputs at ``A`` and ``B``, shape (n,).
+        yAB: Outputs at ``AB``, shape (d, n).
+        n_boot: Bootstrap resamples of the ``n`` base rows (0 to skip CIs).
+        conf: Confidence level of the percentile intervals.
+
+    Returns:
+        Dict of arrays of shape (d,): S1, S1_Lower, S1_Upper, ST, ST_Lower,
+        ST_Upper.
+    """
+    yA, yB, yAB = (np.asarray(v, dtype=float) for v in (yA, yB, yAB))
+    n, d = len(yA), len(yAB)
+    terms = _row_moments(yA, yB, yAB)
+    s1, st = _sobol_from_means(terms.mean(axis=0), d)
+    result = {"S1": s1, "ST": st}
+    if not n_boot:
+        nan = np.full(d, np.nan)
+        return {**result, "S1_Lower": nan, "S1_Upper": nan, "ST_Lower": nan, "ST_Upper": nan}
+
+    rng = np.random.default_rng(seed)
+    means = []
+    for start in range(0, n_boot, BOOT_CHUNK):
+        size = min(BOOT_CHUNK, n_boot - start)
+        idx = rng.integers(0, n, size=(size, n)) + n * np.arange(size)[:, None]
+        counts = np.bincount(idx.ravel(), minlength=size * n).reshape(size, n)
+        means.append(counts @ terms / n)
+    boot_s1, boot_st = _sobol_from_means(np.vstack(means), d)   # (n_boot, d)
+    tail = (1 - conf) / 2 * 100
+    for name, boots in (("S1", boot_s1), ("ST", boot_st)):
+        result[f"{name}_Lower"], result[f"{name}_Upper"] = \
+            np.percentile(boots, [tail, 100 - tail], axis=0)
+    return result
+
+
+def morris_sample(r, bounds=None, d=len(PARAMETERS), levels=4, seed=0):
+    """
+    ``r`` Morris trajectories of ``d + 1`` points each.
+
+    Each trajectory starts at a random grid point and moves one parameter at
+    a time, in random order, by ``delta = levels / (2 (levels - 1))`` of its
+    range.
+
+    Returns:
+        Array of shape (r, d + 1, d) in parameter units.
+    """
+    bounds = _bounds(bounds, d)
+    rng = np.random.default_rng(seed)
+    delta = levels / (2 * (levels - 1))
+    # Grid levels from which a +delta move stays inside [0, 1]; trajectories
+    # moving down a parameter start delta higher instead.
+    low = rng.integers(0, levels // 2, size=(r, d)) / (levels - 1)
+    signs = rng.choice([-1.0, 1.0], size=(r, d))
+    order = np.argsort(rng.random((r, d)), axis=1)
+    unit = np.repeat(np.where(signs > 0, low, low + delta)[:, None, :], d + 1, axis=1)
+    rows = np.arange(r)
+    for k in range(d):
+        moved = order[:, k]
+        unit[rows, k + 1:, moved] += (signs[rows, moved] * delta)[:, None]
+    return bounds[:, 0] + unit * (bounds[:, 1] - bounds[:, 0])
+
+
+def morris_indices(X, y, bounds=None, n_boot=1000, conf=0.95, seed=0):
+    """
+    Elementary-effect statistics of Morris trajectories.
+
+    Args:
+        X: Trajectories from :func:`morris_sample`, shape (r, d + 1, d).
+        y: Outputs, shape (r, d + 1).
+
+    Returns:
+        Dict of arrays of shape (d,): Mu, Mu_Star, Sigma, Mu_Star_Lower,
+        Mu_Star_Upper.
+    """
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float)
+    r, _, d = X.shape
+    bounds = _bounds(bounds, d)
+    dx = np.diff(X, axis=1) / (bounds[:, 1] - bounds[:, 0])           # (r, d, d)
+    moved = np.argmax(np.abs(dx), axis=2)                             # (r, d)
+    step = np.take_along_axis(dx, moved[..., None], axis=2)[..., 0]
+    effects = np.empty((r, d))
+    np.put_along_axis(effects, moved, np.diff(y, axis=1) / step, axis=1)
+
+    result = {
+        "Mu": effects.mean(axis=0),
+        "Mu_Star": np.abs(effects).mean(axis=0),
+        "Sigma": effects.std(axis=0, ddof=1) if r > 1 else np.full(d, np.nan),
+    }
+    if n_boot:
+        rng = np.random.default_rng(seed)
+        idx = rng.integers(0, r, size=(n_boot, r))
+        boots = np.abs(effects)[idx].mean(axis=1)                    # (n_boot, d)
+        tail = (1 - conf) / 2 * 100
+        result["Mu_Star_Lower"], result["Mu_Star_Upper"] = \
+            np.percentile(boots, [tail, 100 - tail], axis=0)
+    else:
+        result["Mu_Star_Lower"] = result["Mu_Star_Upper"] = np.full(d, np.nan)
+    return result
+
+
+def evaluate(evaluator, X, jobs=1, batch_size=EVAL_BATCH):
+    """
+    Evaluate ``X`` (shape (m, d)) in batches, optionally on a process pool.
+
+    The evaluator must be picklable (a module-level function or instance)
+    when ``jobs > 1``.
+    """
+    X = np.asarray(X, dtype=float)
+    batches = [X[i:i + batch_size] for i in range(0, len(X), batch_size)]
+    if jobs == 1 or len(batches) <= 1:
+        outputs = [np.asarray(evaluator(b), dtype=float) for b in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            outputs = [np.asarray(o, dtype=float) for o in pool.map(evaluator, batches)]
+    return np.concatenate(outputs)
+
+
+class OATSurrogate:
+    """
+    Additive interpolation of a one-at-a-time sweep.
+
+    Predicts ``baseline + sum_j (m_j(x_j) - baseline)`` for every metric,
+    where ``m_j`` linearly interpolates the sweep means of parameter ``j``
+    (clamped outside the swept range) and ``baseline`` is the mean of the
+    parameters' baseline cells.
+
+    Args:
+        table: Aggregated sweep (see :func:`arc_figures.sensitivity.load_sensitivity`).
+        metrics: Output columns.
+        parameters: Parameter order of the input columns.
+    """
+
+    def __init__(self, table, metrics=("Throughput", "Workload", "Safety"),
+                 parameters=PARAMETERS):
+        self.metrics = tuple(metrics)
+        self.parameters = tuple(parameters)
+        base = table[np.isclose(table["Value"], 1.0)]
+        self.baseline = base[list(self.metrics)].mean().to_numpy()
+        self.curves = []
+        for parameter in self.parameters:
+            rows = table[table["Parameter"] == parameter].sort_values("Value")
+            if rows.empty:
+                raise ValueError(f"sweep has no rows for parameter {parameter!r}")
+            self.curves.append(
+                (rows["Value"].to_numpy(), rows[list(self.metrics)].to_numpy()))
+
+    def __call__(self, X):
+        X = np.asarray(X, dtype=float)
+        out = np.tile(self.baseline, (len(X), 1))
+        for j, (values, means) in enumerate(self.curves):
+            for k in range(len(self.metrics)):
+                out[:, k] += np.interp(X[:, j], values, means[:, k]) - self.baseline[k]
+        return out
+
+
+def load_evaluator(spec):
+    """
+    Import an evaluator given as ``module:callable``.
+
+    ``callable`` may be a dotted attribute path (``module:Model.run``). The
+    module is imported normally, so it must be on ``sys.path`` (the working
+    directory is, under ``python -m``).
+
+    Raises:
+        ValueError: If ``spec`` is malformed or does not name a callable.
+    """
+    import importlib
+
+    module_name, sep, attribute = spec.partition(":")
+    if not sep or not module_name or not attribute:
+        raise ValueError(f"evaluator must be given as module:callable, got {spec!r}")
+    try:
+        target = importlib.import_module(module_name)
+    except ImportError as exc:
+        raise ValueError(f"cannot import evaluator module {module_name!r}: {exc}") from None
+    for name in attribute.split("."):
+        if not hasattr(target, name):
+            raise ValueError(f"{module_name!r} has no attribute {attribute!r}")
+        target = getattr(target, name)
+    if not callable(target):
+        raise ValueError(f"evaluator {spec!r} is not callable")
+    return target
+
+
+def sobol_analysis(evaluator, n=1024, bounds=None, parameters=PARAMETERS,
+                   outputs=("Throughput", "Workload", "Safety"), n_boot=1000,
+                   seed=0, jobs=1):
+    """
+    Sample, evaluate and compute Sobol indices for every output.
+
+    Returns:
+        DataFrame with one row per (Output, Parameter): S1, ST and their
+        confidence bounds.
+    """
+    design = saltelli_sample(n, bounds, len(parameters), seed)
+    y = evaluate(evaluator, design.points, jobs).reshape(len(design.points), -1)
+    yA, yB, yAB = design.split(y)
+    frames = []
+    for k, output in enumerate(outputs):
+        indices = sobol_indices(yA[:, k], yB[:, k], yAB[:, :, k], n_boot, seed=seed + k)
+        frames.append(pd.DataFrame({"Output": output, "Parameter": list(parameters),
+                                    **indices}))
+    table = pd.concat(frames, ignore_index=True)
+    table.attrs["evaluations"] = len(design.points)
+    return table
+
+
+def morris_analysis(evaluator, r=100, bounds=None, parameters=PARAMETERS,
+                    outputs=("Throughput", "Workload", "Safety"), levels=4,
+                    n_boot=1000, seed=0, jobs=1):
+    """
+    Sample, evaluate and compute Morris statistics for every output.
+
+    Returns:
+        DataFrame with one row per (Output, Parameter): Mu, Mu_Star, Sigma
+        and the mu* confidence bounds.
+    """
+    X = morris_sample(r, bounds, len(parameters), levels, seed)
+    d = len(parameters)
+    y = evaluate(evaluator, X.reshape(-1, d), jobs).reshape(r, d + 1, -1)
+    frames = []
+    for k, output in enumerate(outputs):
+        stats = morris_indices(X, y[:, :, k], bounds, n_boot, seed=seed + k)
+        frames.append(pd.DataFrame({"Output": output, "Parameter": list(parameters),
+                                    **stats}))
+    table = pd.concat(frames, ignore_index=True)
+    table.attrs["evaluations"] = X.shape[0] * X.shape[1]
+    return table
+
+
+def plot_indices(table, path, dpi=300):
+    """
+    Tornado chart of the indices, one panel per output.
+
+    Sobol tables show S1 and ST with their CIs; Morris tables show mu* with
+    its CI and sigma. Parameters are sorted by total effect within a panel.
+    """
+    import matplotlib.pyplot as plt
+
+    sobol = "ST" in table.columns
+    outputs = list(pd.unique(table["Output"]))
+    fig, axes = plt.subplots(1, len(outputs), figsize=(5.5 * len(outputs), 4.5),
+                             squeeze=False)
+    if sobol:
+        key = "ST"
+        series = (("S1", "First-order $S_1$", "#2E86AB"), ("ST", "Total $S_T$", "#F18F01"))
+    else:
+        key = "Mu_Star"
+        series = (("Mu_Star", r"$\mu^*$", "#2E86AB"), ("Sigma", r"$\sigma$", "#A23B72"))
+    for ax, output in zip(axes[0], outputs):
+        rows = table[table["Output"] == output].sort_values(key)
+        y = np.arange(len(rows))
+        for offset, (column, label, color) in zip((-0.2, 0.2), series):
+            values = rows[column].to_numpy()
+            err = None
+            if f"{column}_Lower" in rows.columns:
+                err = np.abs(np.vstack([values - rows[f"{column}_Lower"],
+                                        rows[f"{column}_Upper"] - values]))
+            ax.barh(y + offset, values, 0.4, xerr=err, color=color, alpha=0.85,
+                    edgecolor="black", linewidth=1.0, capsize=3, label=label)
+        ax.set_yticks(y)
+        ax.set_yticklabels(rows["Parameter"])
+        ax.axvline(0, color="black", linewidth=0.8)
+        ax.set_title(output, fontsize=13, fontweight="bold")
+        ax.grid(True, axis="x", alpha=0.3, linestyle="--")
+        ax.set_xlabel("Sobol index" if sobol else "Elementary effect", fontsize=11)
+    axes[0, 0].legend(loc="lower right", fontsize=10)
+    title = "Sobol Indices" if sobol else "Morris Screening"
+    fig.suptitle(f"Global Sensitivity Analysis: {title}", fontsize=15, fontweight="bold")
+    save_figure(fig, path, dpi)
@@ -0,0 +1,316 @@
+"""
+Bounded-memory ingestion of HRC episode logs (``HRC_Aggregated_Fanuc.csv``).
+
+Episode logs are read in chunks from their memory-mapped column cache
+(:mod:`arc_figures.datasets`), so the statistics behind Figure 4 (rolling
+means, global means and the quartile thresholds of panel (d)) can be computed
+over tens of millions of episodes without holding the log in memory. Results
+are identical to the in-memory pandas computation while the input fits in
+the quantile sketch's exact capacity. The Pareto front of the log is merged
+chunk by chunk, so only the current front is ever held.
+
+The statistics themselves need NumPy only (:func:`hrc_statistics`, used by
+``python -m arc_figures stats``); pandas is imported by the functions that
+build DataFrames for plotting.
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .datasets import load_columns, resolve_data_path
+from .pareto import HRC_MAXIMIZE, HRC_OBJECTIVES, ParetoArchive, crowding_distance
+from .schema import HRC_SCHEMA
+
+ROLLING_WINDOW = 20
+DEFAULT_CHUNKSIZE = 1_000_000
+
+# Column -> (derived column, scale) used by the Figure 4 panels.
+SCALED_COLUMNS = {"Workload": ("Workload_100", 100.0), "Safety": ("Safety_100", 100.0)}
+METRICS = ("Throughput", "Workload_100", "Safety_100")
+
+# Quantile cutoffs of the former panel (d) "Pareto-optimal region"; kept as
+# summary statistics, the figure now marks the true front (HRCSummary.front).
+PARETO_QUANTILES = {"Throughput": 0.75, "Workload_100": 0.25, "Safety_100": 0.75}
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with bounded memory.
+
+    Values are kept verbatim until more than ``capacity`` have been seen, so
+    small inputs give exactly the linearly interpolated quantiles of
+    ``pandas.Series.quantile``. Beyond that the sorted values are merged into
+    ``capacity // 2`` weighted centroids of equal rank width, which bounds
+    the rank error of any query by roughly ``count / (capacity // 2)`` per
+    compression. The exact minimum and maximum are always retained.
+    """
+
+    def __init__(self, capacity=1 << 16):
+        if capacity < 4:
+            raise ValueError("capacity must be at least 4")
+        self.capacity = capacity
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._values = np.empty(0)
+        self._weights = np.empty(0)
+
+    @property
+    def exact(self):
+        """True while every value seen is still stored verbatim."""
+        return len(self._values) == self.count
+
+    def update(self, values):
+        """Add a batch of values; NaNs are ignored."""
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.count += len(values)
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self._values = np.concatenate([self._values, values])
+        self._weights = np.concatenate([self._weights, np.ones(len(values))])
+        if len(self._values) > self.capacity:
+            self._compress()
+
+    def merge(self, other):
+        """Fold another sketch into this one."""
+        if not other.count:
+            return
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._values = np.concatenate([self._values, other._values])
+        self._weights = np.concatenate([self._weights, other._weights])
+        if len(self._values) > self.capacity:
+            self._compress()
+
+    def _compress(self):
+        order = np.argsort(self._values, kind="stable")
+        values = self._values[order]
+        weights = self._weights[order]
+        n_buckets = self.capacity // 2
+        before = np.cumsum(weights) - weights
+        bucket = np.minimum((before / self.count * n_buckets).astype(int), n_buckets - 1)
+        totals = np.bincount(bucket, weights=weights, minlength=n_buckets)
+        sums = np.bincount(bucket, weights=values * weights, minlength=n_buckets)
+        keep = totals > 0
+        self._weights = totals[keep]
+        self._values = sums[keep] / self._weights
+
+    def quantile(self, q):
+        """
+        Estimate the ``q`` quantile(s) with linear interpolation.
+
+        Args:
+            q: Scalar or array of probabilities in [0, 1].
+        """
+        if not self.count:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        order = np.argsort(self._values, kind="stable")
+        values = self._values[order]
+        weights = self._weights[order]
+        # Rank of each centroid's centre; equals 0..n-1 when exact.
+        ranks = np.cumsum(weights) - weights + (weights - 1) / 2
+        if not self.exact:
+            ranks = np.concatenate([[0.0], ranks, [self.count - 1.0]])
+            values = np.concatenate([[self.min], values, [self.max]])
+        return np.interp(np.asarray(q, dtype=float) * (self.count - 1), ranks, values)
+
+
+def iter_hrc_columns(path, chunksize=DEFAULT_CHUNKSIZE, limit=None):
+    """
+    Read an HRC episode log chunk by chunk as NumPy arrays.
+
+    Yields:
+        ``(start, columns)``: the row offset of the chunk and a dict of its
+        columns (slices of the memory-mapped cache) plus the 0-100 scaled
+        ``Workload_100`` and ``Safety_100``.
+
+    Raises:
+        arc_figures.schema.SchemaError: If the log violates the HRC schema
+            (checked before the first chunk).
+    """
+    columns = load_columns(resolve_data_path(path), schema=HRC_SCHEMA)
+    rows = len(next(iter(columns.values()))) if columns else 0
+    if limit is not None:
+        rows = min(rows, limit)
+    for start in range(0, rows, chunksize):
+        stop = min(start + chunksize, rows)
+        chunk = {name: values[start:stop] for name, values in columns.items()}
+        for column, (scaled, factor) in SCALED_COLUMNS.items():
+            chunk[scaled] = chunk[column] * factor
+        yield start, chunk
+
+
+def iter_hrc_chunks(path, chunksize=DEFAULT_CHUNKSIZE, window=ROLLING_WINDOW, limit=None):
+    """
+    Read an HRC episode log chunk by chunk.
+
+    Each yielded DataFrame carries the 0-100 scaled ``Workload_100`` and
+    ``Safety_100`` columns plus ``<metric>_MA`` trailing rolling means over
+    ``window`` episodes. The last ``window - 1`` rows of each chunk are
+    carried into the next, so rolling means are continuous across chunk
+    boundaries and match ``Series.rolling(window).mean()`` on the full log.
+
+    Args:
+        path: CSV file with Episode, Throughput, Workload and Safety columns
+            (see :func:`arc_figures.datasets.resolve_data_path`).
+        chunksize: Rows per chunk.
+        window: Rolling-mean window in episodes.
+        limit: Read at most this many episodes.
+    """
+    import pandas as pd
+
+    tail = None
+    for start, columns in iter_hrc_columns(path, chunksize=chunksize, limit=limit):
+        chunk = pd.DataFrame(
+            columns, index=pd.RangeIndex(start, start + len(columns["Episode"])), copy=False)
+        carried = 0 if tail is None else len(tail)
+        frame = chunk if tail is None else pd.concat([tail, chunk])
+        if window > 1:
+            tail = frame.iloc[-(window - 1):]
+        for metric in METRICS:
+            rolled = frame[metric].rolling(window=window).mean().to_numpy()
+            chunk[f"{metric}_MA"] = rolled[carried:]
+        yield chunk
+
+
+@dataclass
+class HRCSummary:
+    """
+    Aggregate statistics of an HRC episode log.
+
+    Attributes:
+        episodes: Number of episodes summarised.
+        means: Mean of each metric in :data:`METRICS`.
+        thresholds: Panel (d) quantile threshold of each metric
+            (:data:`PARETO_QUANTILES`).
+        exact: False if any threshold comes from a compressed sketch.
+        front_episodes: Episode numbers of the non-dominated episodes (high
+            throughput, low workload, high safety), in log order.
+        stds: Sample standard deviation of each metric (online snapshots
+            of :class:`arc_figures.live.OnlineHRC` only).
+        front: The non-dominated episodes with their objectives and crowding
+            distance, as a DataFrame (:func:`summarize_hrc` only).
+        head: First ``keep`` rows of the enriched log (see
+            :func:`iter_hrc_chunks`), for plotting; the latest rows in
+            online snapshots.
+    """
+
+    episodes: int
+    means: dict
+    thresholds: dict
+    exact: bool
+    front_episodes: np.ndarray = field(repr=False, default=None)
+    stds: dict = field(default=None)
+    head: "pandas.DataFrame" = field(repr=False, default=None)
+    front: "pandas.DataFrame" = field(repr=False, default=None)
+
+
+class _Accumulator:
+    """Running sums, quantile sketches and Pareto front of the chunks seen so far."""
+
+    def __init__(self, sketch_capacity):
+        self.episodes = 0
+        self.sums = dict.fromkeys(METRICS, 0.0)
+        self.sketches = {m: QuantileSketch(sketch_capacity) for m in PARETO_QUANTILES}
+        # Front objectives, labelled with row positions and episode numbers.
+        self.front = ParetoArchive(len(HRC_OBJECTIVES), HRC_MAXIMIZE)
+
+    def update(self, start, columns):
+        n = len(columns["Episode"])
+        self.episodes += n
+        for metric in METRICS:
+            self.sums[metric] += columns[metric].sum()
+        for metric, sketch in self.sketches.items():
+            sketch.update(columns[metric])
+        self.front.add(np.column_stack([columns[m] for m in HRC_OBJECTIVES]),
+                       row=np.arange(start, start + n), episode=np.asarray(columns["Episode"]))
+
+    def summary(self):
+        self.front.sorted_by("row")
+        means = {m: (self.sums[m] / self.episodes if self.episodes else np.nan)
+                 for m in METRICS}
+        thresholds = {m: float(self.sketches[m].quantile(q))
+                      for m, q in PARETO_QUANTILES.items()}
+        return HRCSummary(
+            episodes=self.episodes,
+            means=means,
+            thresholds=thresholds,
+            exact=all(s.exact for s in self.sketches.values()),
+            front_episodes=self.front.labels.get("episode"),
+        )
+
+
+def hrc_statistics(path, limit=None, chunksize=DEFAULT_CHUNKSIZE, sketch_capacity=1 << 16):
+    """
+    The Figure 4 statistics of an episode log, with NumPy only.
+
+    Same means, thresholds and front as :func:`summarize_hrc`, without the
+    rolling means, plotting rows or front DataFrame.
+
+    Returns:
+        HRCSummary with ``front_episodes`` set and ``head``/``front`` None.
+    """
+    totals = _Accumulator(sketch_capacity)
+    for start, columns in iter_hrc_columns(path, chunksize=chunksize, limit=limit):
+        totals.update(start, columns)
+    return totals.summary()
+
+
+def front_frame(archive):
+    """
+    DataFrame of an HRC front (a ParetoArchive labelled with ``row`` and
+    ``episode``): Episode, the objectives and the crowding distance, indexed
+    by row position.
+    """
+    import pandas as pd
+
+    frame = pd.DataFrame(
+        {"Episode": archive.labels["episode"],
+         **{m: archive.points[:, i] for i, m in enumerate(HRC_OBJECTIVES)}},
+        index=archive.labels["row"],
+    )
+    frame["Crowding"] = crowding_distance(archive.points, np.zeros(len(archive), dtype=int))
+    return frame
+
+
+def summarize_hrc(path, limit=None, keep=0, chunksize=DEFAULT_CHUNKSIZE,
+                  window=ROLLING_WINDOW, sketch_capacity=1 << 16):
+    """
+    Compute the Figure 4 statistics of an episode log in one bounded pass.
+
+    Args:
+        path: HRC episode CSV.
+        limit: Summarise only the first ``limit`` episodes.
+        keep: Number of leading enriched rows to retain in ``head``
+            (``None`` retains every row).
+        chunksize: Rows read per chunk.
+        window: Rolling-mean window in episodes.
+        sketch_capacity: Values kept verbatim per quantile sketch before it
+            starts compressing.
+
+    Returns:
+        HRCSummary.
+    """
+    import pandas as pd
+
+    totals = _Accumulator(sketch_capacity)
+    head = []
+    kept = 0
+    for chunk in iter_hrc_chunks(path, chunksize=chunksize, window=window, limit=limit):
+        totals.update(chunk.index[0], {c: chunk[c].to_numpy() for c in chunk.columns})
+        if keep is None:
+            head.append(chunk)
+        elif kept < keep:
+            head.append(chunk.iloc[: keep - kept])
+            kept += len(head[-1])
+
+    summary = totals.summary()
+    if summary.front_episodes is not None:
+        summary.front = front_frame(totals.front)
+    summary.head = pd.concat(head) if head else None
+    return summary
@@ -0,0 +1,396 @@
+"""
+Online aggregation of HRC episode metrics for live training runs.
+
+:class:`OnlineHRC` ingests episodes one at a time or in small batches and
+keeps, with constant work per episode:
+
+* trailing rolling means over the last ``window`` episodes (the ``_MA``
+  columns of Figure 4), computed from the carried ``window - 1`` values so
+  they equal ``Series.rolling(window).mean()`` up to rounding and never
+  drift;
+* running mean and variance of every metric (Welford, merged batch-wise with
+  Chan's update);
+* streaming quantiles (the mergeable :class:`arc_figures.hrc.QuantileSketch`,
+  fed in blocks);
+* the Pareto front (:class:`arc_figures.pareto.ParetoArchive`);
+* the latest ``keep`` enriched episodes.
+
+:meth:`OnlineHRC.snapshot` returns an :class:`arc_figures.hrc.HRCSummary`
+shaped like :func:`arc_figures.hrc.summarize_hrc` output, so the Figure 4
+panels can render from it; its ``head`` holds the latest episodes.
+
+Episodes come from a growing CSV (:func:`tail_csv`) or from producers
+writing CSV lines to a local socket (:func:`listen`). ``python -m
+arc_figures watch`` wires either source to a JSON snapshot file.
+"""
+
+import math
+import os
+import selectors
+import socket
+import time
+from pathlib import Path
+
+import numpy as np
+
+from .hrc import (METRICS, PARETO_QUANTILES, ROLLING_WINDOW, SCALED_COLUMNS, HRCSummary,
+                  QuantileSketch, front_frame)
+from .pareto import HRC_MAXIMIZE, HRC_OBJECTIVES, ParetoArchive
+
+COLUMNS = ("Episode", "Throughput", "Workload", "Safety")
+# Values buffered before they are merged into the quantile sketches.
+SKETCH_BLOCK = 4096
+POLL_SECONDS = 0.5
+
+
+class OnlineHRC:
+    """
+    Incremental Figure 4 statistics of an HRC run.
+
+    Args:
+        window: Rolling-mean window in episodes.
+        keep: Latest enriched episodes retained for plotting.
+        sketch_capacity: Values kept verbatim per quantile sketch.
+    """
+
+    def __init__(self, window=ROLLING_WINDOW, keep=200, sketch_capacity=1 << 16):
+        self.window = window
+        self.keep = keep
+        self.episodes = 0
+        self.skipped = 0
+        self._count = 0
+        self._mean = dict.fromkeys(METRICS, 0.0)
+        self._m2 = dict.fromkeys(METRICS, 0.0)
+        self._tail = {m: np.empty(0) for m in METRICS}
+        self._rolling = dict.fromkeys(METRICS, math.nan)
+        self._sketches = {m: QuantileSketch(sketch_capacity) for m in PARETO_QUANTILES}
+        self._pending = {m: [] for m in PARETO_QUANTILES}
+        self._pending_size = 0
+        self._front = ParetoArchive(len(HRC_OBJECTIVES), HRC_MAXIMIZE)
+        self._recent = None
+
+    def add(self, episode, throughput, workload, safety):
+        """Ingest one episode (metrics on the CSV's scale)."""
+        self.extend({"Episode": [episode], "Throughput": [throughput],
+                     "Workload": [workload], "Safety": [safety]})
+
+    def extend(self, columns):
+        """
+        Ingest a batch of episodes.
+
+        Args:
+            columns: Mapping of the CSV columns (Episode, Throughput,
+                Workload, Safety) to equal-length sequences. Episodes with a
+                missing or non-finite metric are counted in :attr:`skipped`.
+
+        Returns:
+            The ingested episodes with the ``_100`` and ``_MA`` columns
+            added, or None if none were valid.
+        """
+        batch = {c: np.asarray(columns[c], dtype=float).ravel() for c in COLUMNS}
+        valid = np.all([np.isfinite(v) for v in batch.values()], axis=0)
+        if not valid.all():
+            self.skipped += int((~valid).sum())
+            batch = {c: v[valid] for c, v in batch.items()}
+        n = len(batch["Episode"])
+        if not n:
+            return None
+        for column, (scaled, factor) in SCALED_COLUMNS.items():
+            batch[scaled] = batch[column] * factor
+        start = self.episodes
+        self.episodes += n
+
+        self._update_moments(batch, n)
+        self._update_rolling(batch)
+        for metric in PARETO_QUANTILES:
+            self._pending[metric].append(batch[metric])
+        self._pending_size += n
+        if self._pending_size >= SKETCH_BLOCK:
+            self._flush_sketches()
+        self._front.add(np.column_stack([batch[m] for m in HRC_OBJECTIVES]),
+                        row=np.arange(start, start + n),
+                        episode=batch["Episode"].astype(np.int64))
+        self._update_recent(batch)
+        return batch
+
+    def _update_moments(self, batch, n):
+        total = self._count + n
+        for metric in METRICS:
+            values = batch[metric]
+            mean = values.mean()
+            m2 = ((values - mean) ** 2).sum()
+            delta = mean - self._mean[metric]
+            self._mean[metric] += delta * n / total
+            self._m2[metric] += m2 + delta ** 2 * self._count * n / total
+        self._count = total
+
+    def _update_rolling(self, batch):
+        w = self.window
+        for metric in METRICS:
+            tail = self._tail[metric]
+            values = np.concatenate([tail, batch[metric]])
+            rolled = np.full(len(batch[metric]), np.nan)
+            if len(values) >= w:
+                sums = np.cumsum(np.concatenate([[0.0], values]))
+                window_means = (sums[w:] - sums[:-w]) / w
+                k = min(len(window_means), len(rolled))
+                rolled[len(rolled) - k:] = window_means[len(window_means) - k:]
+            batch[f"{metric}_MA"] = rolled
+            self._rolling[metric] = float(rolled[-1])
+            self._tail[metric] = values[-(w - 1):] if w > 1 else values[:0]
+
+    def _flush_sketches(self):
+        if not self._pending_size:
+            return
+        for metric, blocks in self._pending.items():
+            self._sketches[metric].update(np.concatenate(blocks))
+            blocks.clear()
+        self._pending_size = 0
+
+    def _update_recent(self, batch):
+        if not self.keep:
+            return
+        if self._recent is None:
+            self._recent = {c: v[-self.keep:] for c, v in batch.items()}
+        else:
+            self._recent = {c: np.concatenate([self._recent[c], v])[-self.keep:]
+                            for c, v in batch.items()}
+
+    # -- results ---------------------------------------------------------------
+
+    def means(self):
+        """Running mean of every metric."""
+        return {m: (self._mean[m] if self._count else math.nan) for m in METRICS}
+
+    def stds(self):
+        """Sample standard deviations (NaN below two episodes)."""
+        return {m: (math.sqrt(self._m2[m] / (self._count - 1)) if self._count > 1 else math.nan)
+                for m in METRICS}
+
+    def rolling(self):
+        """Latest rolling mean of every metric (NaN before ``window`` episodes)."""
+        return dict(self._rolling)
+
+    def front_points(self):
+        """Objective values (Throughput, Workload_100, Safety_100) of the Pareto front."""
+        return self._front.points
+
+    def snapshot(self, frames=True):
+        """
+        Current statistics as an HRCSummary.
+
+        Args:
+            frames: Also build the ``head`` (latest episodes, with the
+                ``_MA`` columns) and ``front`` DataFrames (imports pandas).
+        """
+        self._flush_sketches()
+        if len(self._front):
+            self._front.sorted_by("row")
+        summary = HRCSummary(
+            episodes=self.episodes,
+            means=self.means(),
+            thresholds={m: float(self._sketches[m].quantile(q))
+                        for m, q in PARETO_QUANTILES.items()},
+            exact=all(s.exact for s in self._sketches.values()),
+            front_episodes=self._front.labels.get("episode", np.empty(0, dtype=np.int64)),
+            stds=self.stds(),
+        )
+        if frames and self.episodes and self.keep:
+            import pandas as pd
+
+            recent = dict(self._recent)
+            recent["Episode"] = recent["Episode"].astype(np.int64)
+            index = pd.RangeIndex(self.episodes - len(recent["Episode"]), self.episodes)
+            summary.head = pd.DataFrame(recent, index=index)
+            summary.front = front_frame(self._front)
+        return summary
+
+
+# ==============================================================================
+# Sources
+# ==============================================================================
+
+class LineParser:
+    """
+    Incremental parser of CSV episode lines into column batches.
+
+    Bytes may arrive split anywhere; incomplete lines are held until their
+    newline arrives. A header line sets the column order (default:
+    :data:`COLUMNS`); lines that do not parse are counted in :attr:`bad`.
+    """
+
+    def __init__(self, columns=COLUMNS):
+        self.columns = list(columns)
+        self.bad = 0
+        self._partial = b""
+
+    def feed(self, data):
+        """Parse the complete lines in ``data``; returns a batch dict or None."""
+        lines = (self._partial + data).split(b"\n")
+        self._partial = lines.pop()
+        rows = []
+        for line in lines:
+            fields = [f.strip() for f in line.decode("utf-8", "replace").split(",")]
+            if fields == [""]:
+                continue
+            if set(COLUMNS) <= set(fields):
+                self.columns = fields
+                continue
+            try:
+                rows.append([float(f) for f in fields])
+            except ValueError:
+                self.bad += 1
+                continue
+            if len(rows[-1]) != len(self.columns):
+                rows.pop()
+                self.bad += 1
+        if not rows:
+            return None
+        table = np.array(rows)
+        return {c: table[:, self.columns.index(c)] for c in COLUMNS}
+
+
+def tail_csv(path, poll=POLL_SECONDS, from_start=True):
+    """
+    Follow a growing CSV like ``tail -f``.
+
+    Yields:
+        A batch dict for every group of new complete lines, or None after
+        each idle poll (so callers can do periodic work). Restarts from the
+        beginning if the file is truncated or replaced.
+    """
+    path = Path(path)
+    parser = LineParser()
+    handle = None
+    inode = None
+    try:
+        while True:
+            if handle is None:
+                try:
+                    handle = open(path, "rb")
+                except FileNotFoundError:
+                    yield None
+                    time.sleep(poll)
+                    continue
+                inode = os.fstat(handle.fileno()).st_ino
+                if not from_start:
+                    handle.seek(0, os.SEEK_END)
+                    from_start = True  # replacements are read whole
+            data = handle.read(1 << 20)
+            if data:
+                batch = parser.feed(data)
+                if batch is not None:
+                    yield batch
+                continue
+            try:
+                stat = path.stat()
+                replaced = stat.st_ino != inode or stat.st_size < handle.tell()
+            except FileNotFoundError:
+                replaced = True
+            if replaced:
+                handle.close()
+                handle, parser = None, LineParser()
+                continue
+            yield None
+            time.sleep(poll)
+    finally:
+        if handle is not None:
+            handle.close()
+
+
+def _listening_socket(address):
+    """TCP socket for ``host:port``, Unix socket for a path."""
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit() and "/" not in address:
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.bind((host or "127.0.0.1", int(port)))
+    else:
+        if os.path.exists(address):
+            os.unlink(address)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(address)
+    server.listen()
+    server.setblocking(False)
+    return server
+
+
+def listen(address, poll=POLL_SECONDS):
+    """
+    Receive CSV episode lines from producers connecting to a local socket.
+
+    Args:
+        address: ``host:port`` (TCP; bind to ``127.0.0.1`` for local use) or
+            the path of a Unix socket.
+
+    Yields:
+        A batch dict for every group of complete lines received, or None
+        after each idle poll. Each connection may send its own header.
+    """
+    server = _listening_socket(address)
+    unix = server.family != socket.AF_INET
+    selector = selectors.DefaultSelector()
+    selector.register(server, selectors.EVENT_READ)
+    try:
+        while True:
+            events = selector.select(poll)
+            if not events:
+                yield None
+                continue
+            for key, _ in events:
+                if key.fileobj is server:
+                    conn, _ = server.accept()
+                    conn.setblocking(False)
+                    selector.register(conn, selectors.EVENT_READ, LineParser())
+                    continue
+                data = key.fileobj.recv(1 << 16)
+                if not data:
+                    batch = key.data.feed(b"\n")  # flush an unterminated last line
+                    selector.unregister(key.fileobj)
+                    key.fileobj.close()
+                else:
+                    batch = key.data.feed(data)
+                if batch is not None:
+                    yield batch
+    finally:
+        for key in list(selector.get_map().values()):
+            key.fileobj.close()
+        selector.close()
+        server.close()
+        if unix and os.path.exists(address):
+            os.unlink(address)
+
+
+def watch(source, aggregator, on_snapshot, interval=5.0, duration=None, on_poll=None):
+    """
+    Feed ``source`` batches into ``aggregator`` and report periodically.
+
+    Args:
+        source: Iterator from :func:`tail_csv` or :func:`listen`.
+        aggregator: OnlineHRC (or any object with its ``extend`` and
+            ``episodes``).
+        on_snapshot: Called with the aggregator every ``interval`` seconds
+            when new episodes arrived, and once at the end.
+        duration: Stop after this many seconds (None: until interrupted).
+        on_poll: Called after every item of ``source`` (e.g. to process GUI
+            events while the source is idle).
+    """
+    started = last = time.monotonic()
+    reported = None
+    try:
+        for batch in source:
+            if batch is not None:
+                aggregator.extend(batch)
+            now = time.monotonic()
+            if now - last >= interval and aggregator.episodes != reported:
+                on_snapshot(aggregator)
+                last, reported = now, aggregator.episodes
+            if on_poll is not None:
+                on_poll()
+            if duration is not None and now - started >= duration:
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        source.close()
+    on_snapshot(aggregator)
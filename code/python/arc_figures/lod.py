@@ -0,0 +1,149 @@
+"""
+Level-of-detail decimation between episode data and the Axes.
+
+Long training runs put far more points on a panel than it has pixels. These
+helpers pick the subset of points that determines what is actually drawn at
+the output resolution, so render time and file size depend on the figure
+size rather than on the length of the run:
+
+* :func:`minmax_indices` keeps the first, last, minimum and maximum sample of
+  every pixel column (M4 aggregation), which reproduces a line plot's
+  rasterised envelope, extremes included.
+* :func:`lttb_indices` implements Largest-Triangle-Three-Buckets for when a
+  fixed point budget matters more than the exact envelope.
+* :func:`scatter_indices` keeps the topmost marker in every marker-sized cell.
+
+All functions return sorted integer indices into the input arrays and return
+every index when the input is already within budget, so small inputs are
+drawn exactly as before.
+"""
+
+import numpy as np
+
+
+def pixel_size(ax, dpi):
+    """Width and height of ``ax`` in output pixels at ``dpi``."""
+    fig = ax.get_figure()
+    bbox = ax.get_position()
+    width_in, height_in = fig.get_size_inches()
+    return bbox.width * width_in * dpi, bbox.height * height_in * dpi
+
+
+def _bucket_ids(x, n_buckets):
+    x = np.asarray(x, dtype=float)
+    lo, hi = x.min(), x.max()
+    if hi <= lo:
+        return np.zeros(len(x), dtype=np.int64)
+    ids = ((x - lo) / (hi - lo) * n_buckets).astype(np.int64)
+    return np.minimum(ids, n_buckets - 1)
+
+
+def minmax_indices(x, y, n_buckets):
+    """
+    M4 decimation: first, last, min and max point of every x bucket.
+
+    Non-finite ``y`` values are kept in place so gaps (e.g. the warm-up of a
+    rolling mean) still break the line where they did before.
+
+    Args:
+        x: Monotonic x values.
+        y: Values plotted against ``x``.
+        n_buckets: Number of buckets, normally the axes width in pixels.
+
+    Returns:
+        Sorted indices of the points to draw.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    n_buckets = max(int(n_buckets), 1)
+    if n <= 4 * n_buckets:
+        return np.arange(n)
+
+    finite = np.flatnonzero(np.isfinite(y))
+    gaps = np.flatnonzero(~np.isfinite(y))
+    if not len(finite):
+        return np.arange(n)
+    values = y[finite]
+    bucket = _bucket_ids(np.asarray(x)[finite], n_buckets)
+    # x is monotonic, so every bucket is one contiguous segment.
+    starts = np.flatnonzero(np.r_[True, np.diff(bucket) != 0])
+    ends = np.r_[starts[1:], len(values)] - 1
+    segment = np.repeat(np.arange(len(starts)), ends - starts + 1)
+    keep = [finite[starts], finite[ends], gaps]
+    for reduce in (np.minimum, np.maximum):
+        hits = np.flatnonzero(values == reduce.reduceat(values, starts)[segment])
+        _, first = np.unique(segment[hits], return_index=True)
+        keep.append(finite[hits[first]])
+    return np.unique(np.concatenate(keep))
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling to ``n_out`` points.
+
+    Keeps the first and last point and, for each interior bucket, the point
+    forming the largest triangle with the previously kept point and the mean
+    of the next bucket. ``x`` and ``y`` must be finite.
+
+    Returns:
+        Sorted indices of the points to draw.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    prev = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt_lo, nxt_hi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        mean_x = x[nxt_lo:nxt_hi].mean()
+        mean_y = y[nxt_lo:nxt_hi].mean()
+        area = np.abs(
+            (x[prev] - mean_x) * (y[lo:hi] - y[prev])
+            - (x[prev] - x[lo:hi]) * (mean_y - y[prev])
+        )
+        prev = lo + int(np.argmax(area))
+        keep[i + 1] = prev
+    return keep
+
+
+def scatter_indices(x, y, xlim, ylim, shape, cell=1.0):
+    """
+    Thin a scatter plot to one marker per ``cell`` x ``cell`` pixel cell.
+
+    Markers drawn later cover earlier ones, so the last point falling into
+    each cell is kept. Points outside the axis limits are dropped, except
+    that the extreme point along each axis is always kept.
+
+    Args:
+        x, y: Marker positions in data coordinates.
+        xlim, ylim: Axis limits (either order, so inverted axes work).
+        shape: ``(width, height)`` of the axes in pixels.
+        cell: Cell edge in pixels, e.g. half the marker diameter.
+
+    Returns:
+        Sorted indices of the markers to draw.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    nx = max(int(shape[0] / cell), 1)
+    ny = max(int(shape[1] / cell), 1)
+    if len(x) <= nx * ny:
+        return np.arange(len(x))
+
+    x0, x1 = sorted(xlim)
+    y0, y1 = sorted(ylim)
+    inside = np.flatnonzero((x >= x0) & (x <= x1) & (y >= y0) & (y <= y1))
+    cx = np.minimum(((x[inside] - x0) / (x1 - x0) * nx).astype(np.int64), nx - 1)
+    cy = np.minimum(((y[inside] - y0) / (y1 - y0) * ny).astype(np.int64), ny - 1)
+    cells = cx * ny + cy
+    # np.unique returns first occurrences; search the reversed array for last.
+    _, last = np.unique(cells[::-1], return_index=True)
+    keep = inside[len(inside) - 1 - last]
+    extremes = [np.argmin(x), np.argmax(x), np.argmin(y), np.argmax(y)]
+    return np.unique(np.concatenate([keep, extremes]))
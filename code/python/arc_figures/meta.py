@@ -0,0 +1,226 @@
+"""
+Random-effects meta-analysis for Figure 7, without R.
+
+Re-implements the parts of ``metafor::rma`` used by ``code/r/Paper_Figure_7.R``:
+DerSimonian-Laird and REML (Fisher scoring) estimates of tau^2, the pooled
+effect with its Wald CI, z and p, and the heterogeneity statistics Q, I^2 and
+H^2 (I^2 and H^2 use metafor's "typical" within-study variance).
+
+Every estimator takes an optional ``(B, k)`` matrix of study counts, so ``B``
+study subsets or resamples are pooled in one vectorised call: row ``b`` pools
+study ``i`` ``counts[b, i]`` times (0 drops it, as in leave-one-out and
+cumulative analyses; bootstrap resamples use multiplicities).
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+# Studies of code/r/Paper_Figure_7.R (12 representative studies of the review).
+STUDIES = {
+    "Authors": ["Zamora", "Makulavicius", "Ouyang", "Antunes",
+                "Zhang", "Alginahi", "Urrea", "Nomandela",
+                "Tang", "Silva", "Dobot Platform", "UR Remote Lab"],
+    "Year": [2025, 2025, 2024, 2023, 2025, 2025, 2025, 2025,
+             2025, 2025, 2024, 2024],
+    "g": [0.94, 0.88, 0.71, 0.85, 0.92, 0.76, 0.94, 0.68,
+          0.73, 0.65, 0.68, 0.89],
+    "SE": [0.12, 0.15, 0.08, 0.11, 0.13, 0.09, 0.11, 0.10,
+           0.08, 0.12, 0.14, 0.11],
+    "N": [120, 85, 450, 95, 110, 200, 150, 78,
+          890, 145, 65, 180],
+    "Tech_Level": ["Industrial", "Industrial", "Educational", "Educational",
+                   "Industrial", "Educational", "Industrial", "Industrial",
+                   "Educational", "Educational", "Semi-Industrial", "Industrial"],
+}
+
+METHODS = ("REML", "DL")
+REML_TOL = 1e-5
+REML_MAX_ITER = 100
+
+
+def studies_table():
+    """The Figure 7 studies with ``Variance`` and ``Label`` columns added."""
+    studies = pd.DataFrame(STUDIES)
+    studies["Variance"] = studies["SE"] ** 2
+    studies["Label"] = studies["Authors"] + ", " + studies["Year"].astype(str)
+    return studies
+
+
+@dataclass
+class MetaResult:
+    """
+    Random-effects model fit(s).
+
+    Every statistic is a scalar for a single fit and an array of shape (B,)
+    when ``counts`` was a matrix.
+
+    Attributes:
+        k: Number of studies pooled.
+        estimate: Pooled effect.
+        se: Standard error of the pooled effect.
+        ci_lb, ci_ub: Bounds of the ``level`` Wald confidence interval.
+        z, p: Wald test of a zero pooled effect.
+        tau2: Between-study variance.
+        Q, Q_df, Q_p: Cochran's heterogeneity test.
+        I2: Percentage of total variability due to heterogeneity.
+        H2: Total over sampling variability.
+        method: Estimator of ``tau2``.
+        level: Confidence level of the interval.
+    """
+
+    k: np.ndarray
+    estimate: np.ndarray
+    se: np.ndarray
+    ci_lb: np.ndarray
+    ci_ub: np.ndarray
+    z: np.ndarray
+    p: np.ndarray
+    tau2: np.ndarray
+    Q: np.ndarray
+    Q_df: np.ndarray
+    Q_p: np.ndarray
+    I2: np.ndarray
+    H2: np.ndarray
+    method: str
+    level: float = 0.95
+
+
+def _prepare(yi, vi, counts):
+    yi = np.asarray(yi, dtype=float)
+    vi = np.asarray(vi, dtype=float)
+    if yi.ndim != 1 or yi.shape != vi.shape:
+        raise ValueError("yi and vi must be 1-D arrays of equal length")
+    if np.any(vi <= 0):
+        raise ValueError("sampling variances must be positive")
+    single = counts is None or np.ndim(counts) == 1
+    c = np.ones((1, len(yi))) if counts is None else np.array(counts, dtype=float, ndmin=2)
+    if c.shape[1] != len(yi):
+        raise ValueError(f"counts need {len(yi)} columns, got {c.shape[1]}")
+    if np.any(c < 0):
+        raise ValueError("counts must be non-negative")
+    return yi, vi, c, single
+
+
+def _weighted_mean(y, a, c):
+    """Per-row inverse-variance weighted mean and total weight."""
+    total = (c * a).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (c * a * y).sum(axis=1) / total, total
+
+
+def _cochran_q(y, v, c):
+    w = 1 / v
+    mu, sw = _weighted_mean(y, w, c)
+    Q = (c * w * (y - mu[:, None]) ** 2).sum(axis=1)
+    sw2 = (c * w ** 2).sum(axis=1)
+    return Q, sw, sw2
+
+
+def tau2_dl(yi, vi, counts=None):
+    """DerSimonian-Laird estimate of tau^2 (one per row of ``counts``)."""
+    y, v, c, single = _prepare(yi, vi, counts)
+    tau2 = _tau2_dl(y, v, c)
+    return tau2[0] if single else tau2
+
+
+def _tau2_dl(y, v, c):
+    Q, sw, sw2 = _cochran_q(y, v, c)
+    k = c.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        tau2 = (Q - (k - 1)) / (sw - sw2 / sw)
+    return np.where(k > 1, np.maximum(tau2, 0), 0.0)
+
+
+def tau2_reml(yi, vi, counts=None, tol=REML_TOL, max_iter=REML_MAX_ITER):
+    """REML estimate of tau^2 by Fisher scoring (one per row of ``counts``)."""
+    y, v, c, single = _prepare(yi, vi, counts)
+    tau2 = _tau2_reml(y, v, c, tol, max_iter)
+    return tau2[0] if single else tau2
+
+
+def _tau2_reml(y, v, c, tol=REML_TOL, max_iter=REML_MAX_ITER):
+    # Fisher scoring as in metafor, written for rows that repeat study i
+    # c_i times: with a_i = 1 / (v_i + tau2) and P = W - W 1 1' W / sum(W),
+    #   y'PPy   = sum c a^2 r^2              (r = y - weighted mean)
+    #   tr(P)   = sum c a - sum c a^2 / S
+    #   tr(PP)  = sum c a^2 - 2 sum c a^3 / S + (sum c a^2)^2 / S^2
+    tau2 = _tau2_dl(y, v, c)
+    active = c.sum(axis=1) > 1
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        ca, t = c[active], tau2[active, None]
+        a = 1 / (v + t)
+        mu, S = _weighted_mean(y, a, ca)
+        s1 = (ca * a ** 2).sum(axis=1)
+        s2 = (ca * a ** 3).sum(axis=1)
+        yPPy = (ca * a ** 2 * (y - mu[:, None]) ** 2).sum(axis=1)
+        trP = S - s1 / S
+        trPP = s1 - 2 * s2 / S + (s1 / S) ** 2
+        step = (yPPy - trP) / trPP
+        new = np.maximum(tau2[active] + step, 0)
+        done = np.abs(new - tau2[active]) < tol
+        tau2[active] = new
+        active[np.flatnonzero(active)[done]] = False
+    return tau2
+
+
+def rma(yi, vi, counts=None, method="REML", level=0.95):
+    """
+    Fit random-effects models, like ``metafor::rma(yi, vi, method=...)``.
+
+    Args:
+        yi: Observed effect sizes, shape (k,).
+        vi: Sampling variances, shape (k,).
+        counts: Optional study multiplicities, shape (k,) or (B, k).
+        method: "REML" or "DL".
+        level: Confidence level of the interval.
+
+    Returns:
+        MetaResult.
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {', '.join(METHODS)}")
+    y, v, c, single = _prepare(yi, vi, counts)
+    tau2 = _tau2_reml(y, v, c) if method == "REML" else _tau2_dl(y, v, c)
+
+    a = 1 / (v + tau2[:, None])
+    estimate, S = _weighted_mean(y, a, c)
+    k = c.sum(axis=1)
+    Q, sw, sw2 = _cochran_q(y, v, c)
+    Q_df = np.maximum(k - 1, 0)
+    crit = stats.norm.ppf(0.5 + level / 2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        se = 1 / np.sqrt(S)
+        z = estimate / se
+        s2 = (k - 1) * sw / (sw ** 2 - sw2)
+        I2 = 100 * tau2 / (tau2 + s2)
+        H2 = (tau2 + s2) / s2
+    Q_p = np.where(Q_df > 0, stats.chi2.sf(Q, np.maximum(Q_df, 1)), np.nan)
+
+    values = dict(
+        k=k, estimate=estimate, se=se,
+        ci_lb=estimate - crit * se, ci_ub=estimate + crit * se,
+        z=z, p=2 * stats.norm.sf(np.abs(z)), tau2=tau2,
+        Q=Q, Q_df=Q_df, Q_p=Q_p, I2=I2, H2=H2,
+    )
+    if single:
+        values = {name: value[0].item() for name, value in values.items()}
+        values["k"] = int(values["k"])
+        values["Q_df"] = int(values["Q_df"])
+    return MetaResult(method=method, level=level, **values)
+
+
+def group_counts(labels, groups=None):
+    """
+    0/1 count rows selecting the studies of each group.
+
+    Returns:
+        ``(groups, counts)`` with one row of ``counts`` per group.
+    """
+    labels = np.asarray(labels)
+    groups = list(pd.unique(labels)) if groups is None else list(groups)
+    return groups, (labels[None, :] == np.asarray(groups)[:, None]).astype(float)
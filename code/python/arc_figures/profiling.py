@@ -0,0 +1,323 @@
+"""
+Opt-in phase instrumentation of the figure scripts.
+
+A :class:`ProfileSession` wraps one script run and attributes its wall time
+(and, optionally, its memory allocations) to the phases every figure goes
+through:
+
+* ``import``: ``import`` statements executed by the script and the toolkit.
+* ``csv_parse``: conversion of input CSVs to the column cache.
+* ``load``: reading datasets (column cache, sweep tables, study tables).
+* ``transform``: data reduction (rolling means and quantiles of
+  :func:`arc_figures.hrc.summarize_hrc`, sweep aggregation, meta-analysis
+  fits, level-of-detail decimation).
+* ``draw``: everything else the script does, mostly artist creation.
+* ``layout``: ``tight_layout``.
+* ``render``: Agg rasterisation, bounding boxes and vector output.
+* ``encode``: raster encoding of the outputs.
+
+Phases are exclusive (a ``load`` inside a ``transform`` is not counted
+twice), so their sum is the run's wall time. With ``memory=True``,
+:mod:`tracemalloc` adds the net allocation and the traced peak per phase
+(peaks need Python 3.9+) and the allocation sites still holding the most
+memory at the end; with ``dump_dir``, a :mod:`cProfile` dump
+(``<figure>.pstats``) and the report (``<figure>.profile.json``) are written
+per figure.
+
+The figure build enables it per script (see :mod:`arc_figures.build`)::
+
+    python -m arc_figures build --profile                  # timings + tracemalloc
+    python -m arc_figures build 4 --profile time --profile-dir prof/
+    ARC_PROFILE=1 ARC_PROFILE_DIR=prof ./generate_all_figures.sh
+
+``ARC_PROFILE`` is ``time`` (timings only), or ``1``/``full`` (timings and
+allocations; tracemalloc slows the run down several times, so compare
+timings across runs of the same mode).
+"""
+
+import builtins
+import cProfile
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+PHASES = ("import", "csv_parse", "load", "transform", "draw", "layout", "render", "encode")
+# Per-phase peaks need tracemalloc.reset_peak (Python 3.9+).
+PHASE_PEAKS = hasattr(tracemalloc, "reset_peak")
+TOP_ALLOCATIONS = 10
+
+# (phase, module, attributes) wrapped while a session is active. Modules are
+# hooked when they are first imported, before the importing script binds
+# their names. Functions re-exported with ``from .x import f`` are listed
+# under each module that calls them.
+HOOKS = (
+    ("csv_parse", "arc_figures.datasets", ("ensure_cache",)),
+    ("load", "arc_figures.datasets", ("load_columns", "load_table")),
+    ("load", "arc_figures.hrc", ("load_columns",)),
+    ("load", "arc_figures.sensitivity", ("load_table", "load_sensitivity")),
+    ("load", "arc_figures.meta", ("studies_table",)),
+    ("transform", "arc_figures.hrc", ("summarize_hrc",)),
+    ("transform", "arc_figures.sensitivity", ("aggregate",)),
+    ("transform", "arc_figures.meta", ("rma", "group_counts")),
+    ("transform", "arc_figures.lod", ("minmax_indices", "lttb_indices", "scatter_indices")),
+    ("layout", "matplotlib.figure", ("Figure.tight_layout",)),
+    ("render", "matplotlib.figure", ("Figure.savefig",)),
+    ("render", "arc_figures.export", ("tight_bbox", "_draw_raster")),
+    ("encode", "arc_figures.export", ("export_figure", "_encode")),
+    ("encode", "arc_figures.style", ("export_figure",)),
+)
+
+
+def requested_mode():
+    """Profiling mode requested through ``ARC_PROFILE`` (None if disabled)."""
+    value = os.environ.get("ARC_PROFILE", "").strip().lower()
+    if value in ("", "0"):
+        return None
+    return "time" if value == "time" else "full"
+
+
+def requested_dump_dir():
+    """Directory requested through ``ARC_PROFILE_DIR`` for per-figure dumps."""
+    return os.environ.get("ARC_PROFILE_DIR") or None
+
+
+class PhaseClock:
+    """
+    Exclusive wall time (and traced memory) per phase.
+
+    Only the thread that created the clock moves it between phases; calls
+    from other threads (the encoder pool of :mod:`arc_figures.export`) are
+    added to :attr:`background` instead, since they overlap the main
+    thread's phases.
+    """
+
+    def __init__(self, phase="draw", memory=False):
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+        self.background = dict.fromkeys(PHASES, 0.0)
+        self.memory = memory
+        self.allocated = dict.fromkeys(PHASES, 0)
+        self.peak = dict.fromkeys(PHASES, 0)
+        self._owner = threading.get_ident()
+        self._traced = self._traced_memory()[0]
+        self._stack = [[phase, time.perf_counter()]]
+
+    def _traced_memory(self):
+        return tracemalloc.get_traced_memory() if self.memory else (0, 0)
+
+    def _charge(self, now):
+        """Charge the time (and memory) since the last switch to the current phase."""
+        entry = self._stack[-1]
+        self.seconds[entry[0]] += now - entry[1]
+        entry[1] = now
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            self.allocated[entry[0]] += current - self._traced
+            self._traced = current
+            if PHASE_PEAKS:
+                self.peak[entry[0]] = max(self.peak[entry[0]], peak)
+                tracemalloc.reset_peak()
+
+    def enter(self, phase):
+        now = time.perf_counter()
+        self._charge(now)
+        self._stack.append([phase, now])
+
+    def exit(self):
+        self._charge(time.perf_counter())
+        self._stack.pop()
+        self._stack[-1][1] = time.perf_counter()
+
+    def stop(self):
+        """Charge the remaining time to the base phase."""
+        self._charge(time.perf_counter())
+
+    def wrap(self, phase, func):
+        """``func`` timed as ``phase``."""
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            if threading.get_ident() != self._owner:
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.background[phase] += time.perf_counter() - start
+            self.enter(phase)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.exit()
+
+        timed.__profiled__ = self
+        return timed
+
+
+def _resolve(module, attribute):
+    owner = module
+    *path, name = attribute.split(".")
+    for part in path:
+        owner = getattr(owner, part)
+    return owner, name
+
+
+class ProfileSession:
+    """
+    Context manager instrumenting the code run inside it.
+
+    Args:
+        name: Label of the run (the figure script), used for dump files.
+        memory: Trace allocations with :mod:`tracemalloc`.
+        dump_dir: Directory for ``<name>.pstats`` and ``<name>.profile.json``
+            (None: no cProfile, no files).
+
+    After the block, :meth:`report` returns the phase timings.
+    """
+
+    def __init__(self, name="run", memory=False, dump_dir=None):
+        self.name = name
+        self.memory = memory
+        self.dump_dir = Path(dump_dir) if dump_dir else None
+        self.clock = None
+        self.top_allocations = []
+        self.seconds = 0.0
+        self._patched = []
+        self._pending = {}
+        self._import = None
+        self._profiler = None
+        self._started_tracing = False
+
+    # -- hooks -----------------------------------------------------------------
+
+    def _hook_loaded(self):
+        for module_name in [m for m in self._pending if m in sys.modules]:
+            module = sys.modules[module_name]
+            if getattr(module.__spec__, "_initializing", False):
+                continue  # still executing; hooked after its own imports return
+            for phase, attribute in self._pending.pop(module_name):
+                owner, name = _resolve(module, attribute)
+                original = owner.__dict__.get(name)
+                if original is None or getattr(original, "__profiled__", None) is self.clock:
+                    continue
+                setattr(owner, name, self.clock.wrap(phase, original))
+                self._patched.append((owner, name, original))
+
+    def _install(self):
+        for phase, module_name, attributes in HOOKS:
+            self._pending.setdefault(module_name, []).extend(
+                (phase, a) for a in attributes)
+        self._hook_loaded()
+        original_import = builtins.__import__
+        timed_import = self.clock.wrap("import", original_import)
+
+        def hooked_import(*args, **kwargs):
+            module = timed_import(*args, **kwargs)
+            if self._pending:
+                self._hook_loaded()
+            return module
+
+        self._import = original_import
+        builtins.__import__ = hooked_import
+
+    def _uninstall(self):
+        builtins.__import__ = self._import
+        for owner, name, original in reversed(self._patched):
+            setattr(owner, name, original)
+        # Names bound to wrappers by ``from x import f`` during the session.
+        for module_name, module in list(sys.modules.items()):
+            if module_name.partition(".")[0] != "arc_figures":
+                continue
+            for key, value in list(vars(module).items()):
+                if getattr(value, "__profiled__", None) is self.clock:
+                    setattr(module, key, value.__wrapped__)
+        self._patched.clear()
+        self._pending.clear()
+
+    # -- context ---------------------------------------------------------------
+
+    def __enter__(self):
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self.clock = PhaseClock("draw", self.memory)
+        self._install()
+        if self.dump_dir is not None:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self._profiler is not None:
+            self._profiler.disable()
+        self.seconds = time.perf_counter() - self._start
+        self.clock.stop()
+        self._uninstall()
+        if self.memory:
+            stats = tracemalloc.take_snapshot().statistics("lineno")[:TOP_ALLOCATIONS]
+            self.top_allocations = [
+                {"site": f"{s.traceback[0].filename}:{s.traceback[0].lineno}",
+                 "bytes": s.size, "blocks": s.count}
+                for s in stats
+            ]
+            if self._started_tracing:
+                tracemalloc.stop()
+        if self.dump_dir is not None:
+            self.dump()
+        return False
+
+    # -- results ---------------------------------------------------------------
+
+    def report(self):
+        """Phase timings (and allocations) as a JSON-serialisable dict."""
+        clock = self.clock
+        report = {
+            "name": self.name,
+            "seconds": self.seconds,
+            "phases": {p: {"seconds": clock.seconds[p]} for p in PHASES},
+            "background_seconds": {p: s for p, s in clock.background.items() if s},
+        }
+        if self.memory:
+            for p in PHASES:
+                report["phases"][p].update(allocated_bytes=clock.allocated[p],
+                                           peak_bytes=clock.peak[p] if PHASE_PEAKS else None)
+            report["top_allocations"] = self.top_allocations
+        return report
+
+    def dump(self):
+        """Write ``<name>.profile.json`` (and ``<name>.pstats``) to the dump directory."""
+        self.dump_dir.mkdir(parents=True, exist_ok=True)
+        stem = Path(self.name).stem
+        written = [self.dump_dir / f"{stem}.profile.json"]
+        written[0].write_text(json.dumps(self.report(), indent=2), encoding="utf-8")
+        if self._profiler is not None:
+            written.append(self.dump_dir / f"{stem}.pstats")
+            self._profiler.dump_stats(written[-1])
+        return written
+
+    def format(self):
+        """Per-phase table of the report, for the build log."""
+        report = self.report()
+        mib = 1 << 20
+        header = f"    {'phase':<10} {'ms':>9} {'%':>6}"
+        if self.memory:
+            header += f" {'net MiB':>8} {'peak MiB':>9}"
+        lines = [f"  Profile ({'time + tracemalloc' if self.memory else 'time'}):", header]
+        for phase, row in report["phases"].items():
+            if not row["seconds"]:
+                continue
+            share = 100 * row["seconds"] / report["seconds"] if report["seconds"] else 0.0
+            line = f"    {phase:<10} {1000 * row['seconds']:9.1f} {share:6.1f}"
+            if self.memory:
+                peak = row["peak_bytes"]
+                peak = f"{peak / mib:9.2f}" if peak is not None else f"{'-':>9}"
+                line += f" {row['allocated_bytes'] / mib:8.2f} {peak}"
+            lines.append(line)
+        lines.append(f"    {'total':<10} {1000 * report['seconds']:9.1f}")
+        for phase, seconds in report["background_seconds"].items():
+            if seconds >= 0.0005:
+                lines.append(f"    ({phase} on encoder threads: {1000 * seconds:.1f} ms)")
+        return "\n".join(lines)
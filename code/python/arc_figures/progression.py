@@ -0,0 +1,282 @@
+"""
+Cohort simulation of the competency progression model (Figure 6).
+
+Figure 6 states that advancing through a Dreyfus level takes 200-300 hours
+of practice and quotes a typical duration per level. :func:`simulate`
+derives those durations from a cohort of simulated learners instead:
+
+* attaining level ``k`` takes ``H`` hours of practice, drawn uniformly from
+  :data:`PRACTICE_HOURS` and multiplied by the level's
+  :data:`LEVEL_DIFFICULTY` (Expert takes twice the practice);
+* practice is a Markov chain of :data:`PHASE_HOURS`-hour phases, each
+  completed at a constant hazard of ``hours_per_week * aptitude *
+  efficiency / PHASE_HOURS`` per week, so the time spent on a level is
+  gamma distributed. The aptitude is a per-learner log-normal factor
+  (:data:`APTITUDE_SD`) shared by all levels;
+* the efficiency is the effect size of the technology the learner practises
+  on at that level, relative to the Figure 6 pathway technology (Level ``k``
+  on technology Level ``k``; effect sizes of
+  :data:`arc_figures.costeff.EFFECT_SIZES`). A technology mix gives, per
+  level, the share of learners on each of the six Figure 3 technologies.
+
+The defaults are calibrated so that the pathway reproduces the durations
+published in Figure 6, which the figure now draws from
+:meth:`CohortResult.labels`. Each level time is one gamma draw per learner,
+so 10^6 learners take a fraction of a second; :func:`sweep` runs scenarios
+(technology mixes) in worker processes with common random numbers, so that
+scenario differences are not masked by sampling noise.
+
+Usage (from ``code/python``)::
+
+    python -m arc_figures progression --learners 1000000 --jobs 4 -o progression.csv
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from .competency import DREYFUS_LEVELS
+from .costeff import EFFECT_SIZES, TECHNOLOGIES, short_names
+from .style import FigureSpec, save_figure
+
+PRACTICE_HOURS = (200.0, 300.0)
+LEVEL_DIFFICULTY = np.array([1.0, 1.0, 1.0, 1.0, 2.0])
+HOURS_PER_WEEK = 10.0
+PHASE_HOURS = 25.0
+APTITUDE_SD = 0.3
+WEEKS_PER_YEAR = 52.0
+
+LEARNERS = 100_000
+CHUNK = 250_000
+QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+# Figure 6 pathway: competency level k practised on technology Level k.
+PATHWAY = np.eye(len(DREYFUS_LEVELS), len(TECHNOLOGIES))
+_REMOTE = np.eye(len(TECHNOLOGIES))[-1]
+SCENARIOS = {
+    "pathway": PATHWAY,
+    "kits": np.eye(len(TECHNOLOGIES))[0],
+    "remote": _REMOTE,
+    "blended": 0.5 * PATHWAY + 0.5 * _REMOTE,
+}
+
+FIGURE_SPEC = FigureSpec("Figure6_Competency_Progression_Simulation.png", font_size=14)
+
+
+def mix_matrix(mix):
+    """
+    ``(levels, technologies)`` share matrix of a technology mix.
+
+    Args:
+        mix: Scenario name of :data:`SCENARIOS`, technology index or name
+            (same technology at every level), share vector over the
+            technologies (same at every level) or per-level share matrix.
+    """
+    if isinstance(mix, str) and mix in SCENARIOS:
+        mix = SCENARIOS[mix]
+    elif isinstance(mix, str):
+        names = [n.lower() for n in short_names()]
+        if mix.lower() not in names:
+            raise ValueError(f"unknown scenario or technology {mix!r}")
+        mix = names.index(mix.lower())
+    if np.ndim(mix) == 0:
+        mix = np.eye(len(TECHNOLOGIES))[int(mix)]
+    shares = np.broadcast_to(np.asarray(mix, dtype=float),
+                             (len(DREYFUS_LEVELS), len(TECHNOLOGIES)))
+    if (shares < 0).any() or not np.allclose(shares.sum(axis=1), 1.0):
+        raise ValueError("technology shares must be non-negative and sum to 1 per level")
+    return shares
+
+
+def duration_label(years, open_ended=False):
+    """
+    Figure 6 wording of a duration: months (to 3) below a year, else years
+    to the half year; ``+`` for an open-ended level.
+    """
+    if years < 0.875:
+        return f"~{max(3, 3 * round(years * 4))} months"
+    half = round(years * 2) / 2
+    return f"~{half:g}{'+' if open_ended else ''} year{'' if half == 1 else 's'}"
+
+
+@dataclass
+class CohortResult:
+    """
+    Simulated times to attain each level.
+
+    Attributes:
+        scenario: Scenario name.
+        mix: ``(levels, technologies)`` technology shares.
+        times: ``(learners, levels)`` years from the start to attaining
+            each level (float32).
+    """
+
+    scenario: str
+    mix: np.ndarray
+    times: np.ndarray
+
+    @property
+    def learners(self):
+        return len(self.times)
+
+    def quantiles(self, q=QUANTILES):
+        """``(levels, len(q))`` quantiles of the time to each level, in years."""
+        return np.quantile(self.times, q, axis=0).T
+
+    def attained(self, years):
+        """``(levels, len(years))`` share of learners at or past each level."""
+        years = np.atleast_1d(np.asarray(years, dtype=float))
+        ordered = np.sort(self.times, axis=0)
+        return np.stack([np.searchsorted(column, years, side="right")
+                         for column in ordered.T]) / self.learners
+
+    def labels(self, medians=None):
+        """Typical Duration labels of Figure 6 (median time to each level)."""
+        medians = np.median(self.times, axis=0) if medians is None else medians
+        last = len(medians) - 1
+        return [duration_label(m, open_ended=k == last) for k, m in enumerate(medians)]
+
+    def table(self, horizon=None):
+        """
+        Time-to-level distribution per level as a DataFrame.
+
+        Args:
+            horizon: Years for an ``Attained_By_Horizon`` share column.
+        """
+        import pandas as pd
+
+        values = self.quantiles()
+        table = pd.DataFrame({
+            "Scenario": self.scenario,
+            "Level": np.arange(1, len(DREYFUS_LEVELS) + 1),
+            "Competency": DREYFUS_LEVELS,
+            "Mean_Years": self.times.mean(axis=0, dtype=float),
+        })
+        for q, column in zip(QUANTILES, values.T):
+            table[f"P{round(q * 100)}_Years"] = column
+        table["Typical_Duration"] = self.labels(table["P50_Years"].to_numpy())
+        if horizon is not None:
+            table["Attained_By_Horizon"] = self.attained(horizon)[:, 0]
+        return table
+
+
+def _level_years(rng, n, shares, efficiency, hours_per_week, practice_hours, difficulty):
+    """``(n, levels)`` years spent on each level by ``n`` learners."""
+    # Draw order is fixed whatever the mix (common random numbers).
+    pick = rng.random((n, len(difficulty)))
+    aptitude = rng.lognormal(0.0, APTITUDE_SD, n)
+    hours = rng.uniform(*practice_hours, (n, len(difficulty))) * difficulty
+    phases = rng.standard_gamma(hours / PHASE_HOURS)
+    tech = np.stack([np.searchsorted(np.cumsum(s)[:-1], pick[:, k], side="right")
+                     for k, s in enumerate(shares)], axis=1)
+    rate = hours_per_week * aptitude[:, None] * efficiency[tech, np.arange(len(difficulty))]
+    return phases * PHASE_HOURS / rate / WEEKS_PER_YEAR
+
+
+def simulate(mix="pathway", learners=LEARNERS, seed=0, hours_per_week=HOURS_PER_WEEK,
+             practice_hours=PRACTICE_HOURS, difficulty=LEVEL_DIFFICULTY, chunk=CHUNK,
+             effects=EFFECT_SIZES):
+    """
+    Simulate a cohort through the five levels.
+
+    Args:
+        mix: Technology mix (see :func:`mix_matrix`).
+        learners: Cohort size.
+        seed: Seed of the random generator.
+        hours_per_week: Practice hours per week of the median learner.
+        practice_hours: ``(low, high)`` hours to attain a level.
+        difficulty: Per-level multiplier of ``practice_hours``.
+        chunk: Learners drawn per block.
+        effects: Effect size of each technology.
+
+    Returns:
+        :class:`CohortResult`.
+    """
+    if learners < 1 or hours_per_week <= 0:
+        raise ValueError("learners and hours_per_week must be positive")
+    shares = mix_matrix(mix)
+    difficulty = np.asarray(difficulty, dtype=float)
+    effects = np.asarray(effects, dtype=float)
+    # efficiency[j, k]: technology j on level k relative to the pathway technology.
+    efficiency = effects[:, None] / effects[: len(difficulty)][None, :]
+    rng = np.random.default_rng(seed)
+    times = np.empty((learners, len(difficulty)), dtype=np.float32)
+    for start in range(0, learners, chunk):
+        n = min(chunk, learners - start)
+        years = _level_years(rng, n, shares, efficiency, hours_per_week, practice_hours,
+                             difficulty)
+        times[start:start + n] = np.cumsum(years, axis=1)
+    return CohortResult(mix if isinstance(mix, str) else "custom", shares, times)
+
+
+def _sweep_task(task):
+    name, mix, horizon, kwargs = task
+    result = simulate(mix, **kwargs)
+    result.scenario = name
+    return result.table(horizon)
+
+
+def sweep(scenarios=None, learners=LEARNERS, seed=0, jobs=1, horizon=None, **kwargs):
+    """
+    Simulate several technology mixes with the same learners.
+
+    Every scenario uses ``seed``, so scenario differences come from the
+    mixes, not from the draws.
+
+    Args:
+        scenarios: Dict of name to mix (default :data:`SCENARIOS`).
+        jobs: Worker processes (1 = in process).
+        horizon: Years for the ``Attained_By_Horizon`` column.
+        **kwargs: Further :func:`simulate` parameters.
+
+    Returns:
+        DataFrame of :meth:`CohortResult.table` rows, scenario by scenario.
+    """
+    import pandas as pd
+
+    scenarios = SCENARIOS if scenarios is None else scenarios
+    kwargs.update(learners=learners, seed=seed)
+    tasks = [(name, mix, horizon, kwargs) for name, mix in scenarios.items()]
+    if jobs == 1 or len(tasks) == 1:
+        tables = list(map(_sweep_task, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+            tables = list(pool.map(_sweep_task, tasks))
+    return pd.concat(tables, ignore_index=True)
+
+
+def plot_progression(result, path, dpi=300, max_years=6.0):
+    """
+    Render the share of the cohort at or past each level over time.
+
+    Each curve is annotated with the median time (the Figure 6 label).
+
+    Args:
+        result: Output of :func:`simulate`.
+        path: Output image path.
+        max_years: End of the time axis.
+    """
+    import matplotlib.pyplot as plt
+
+    years = np.linspace(0, max_years, 241)
+    attained = result.attained(years)
+    medians = np.median(result.times, axis=0)
+    colors = plt.get_cmap("viridis")(np.linspace(0.1, 0.85, len(DREYFUS_LEVELS)))
+
+    fig, ax = plt.subplots(figsize=(12, 7))
+    for k, (name, label) in enumerate(zip(DREYFUS_LEVELS, result.labels())):
+        ax.plot(years, attained[k], linewidth=2.5, color=colors[k],
+                label=f"Level {k + 1}: {name} ({label})")
+        ax.plot(medians[k], 0.5, "o", color=colors[k], markeredgecolor="black", zorder=5)
+    ax.axhline(0.5, color="gray", linestyle="--", linewidth=1)
+    ax.set_xlim(0, max_years)
+    ax.set_ylim(0, 1.02)
+    ax.set_xlabel("Years of Practice", fontsize=15, fontweight="bold")
+    ax.set_ylabel("Share of Cohort at or past Level", fontsize=15, fontweight="bold")
+    ax.set_title(f"Competency Progression: {result.scenario} "
+                 f"({result.learners:,} simulated learners)",
+                 fontsize=16, fontweight="bold", pad=15)
+    ax.grid(True, alpha=0.3, linestyle="--", linewidth=1)
+    ax.legend(loc="lower right", fontsize=12, frameon=True)
+    save_figure(fig, path, dpi)
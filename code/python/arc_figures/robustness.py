@@ -0,0 +1,220 @@
+"""
+Batched robustness analyses of the Figure 7 meta-analysis.
+
+Leave-one-out, cumulative (by publication year) and bootstrap re-fits are
+expressed as rows of a study-count matrix (see :mod:`arc_figures.meta`), so
+every re-fit of every subgroup is pooled by one vectorised :func:`rma` call
+instead of one model at a time. Bootstrap resamples are drawn and pooled in
+chunks, optionally across a process pool; each chunk has its own seed derived
+from ``seed``, so results do not depend on the number of workers.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .meta import rma, studies_table
+from .style import FigureSpec, save_figure
+
+BOOT_CHUNKSIZE = 20_000
+
+# Companion of Figure 7, drawn in its style.
+FIGURE_SPEC = FigureSpec("meta_influence.png", font_size=11)
+
+
+def load_studies(path=None):
+    """
+    Studies table for the analyses.
+
+    Args:
+        path: CSV with at least Authors, Year, g and SE columns (Tech_Level
+            and N are optional). Defaults to the embedded Figure 7 studies.
+    """
+    if path is None:
+        return studies_table()
+    from .datasets import load_table
+    from .schema import STUDIES_SCHEMA
+
+    studies = load_table(path, schema=STUDIES_SCHEMA).copy()
+    studies["Variance"] = studies["SE"] ** 2
+    studies["Label"] = studies["Authors"].astype(str) + ", " + studies["Year"].astype(str)
+    return studies
+
+
+def _group_masks(studies, by):
+    if by is None:
+        return {"All": np.ones(len(studies), dtype=bool)}
+    if by not in studies.columns:
+        raise ValueError(f"no column {by!r} to group studies by")
+    labels = studies[by].to_numpy()
+    return {g: labels == g for g in pd.unique(labels)}
+
+
+def leave_one_out_counts(mask):
+    """One row per member of ``mask``, each omitting that member."""
+    members = np.flatnonzero(mask)
+    counts = np.tile(mask.astype(float), (len(members), 1))
+    counts[np.arange(len(members)), members] = 0
+    return members, counts
+
+
+def cumulative_counts(mask, years):
+    """Rows adding the members of ``mask`` one at a time, oldest first."""
+    members = np.flatnonzero(mask)
+    members = members[np.argsort(np.asarray(years)[members], kind="stable")]
+    counts = np.zeros((len(members), len(mask)))
+    for row, study in enumerate(members):
+        counts[row:, study] = 1
+    return members, counts
+
+
+def _refit_rows(studies, masks):
+    """Leave-one-out and cumulative re-fits of every group, stacked."""
+    meta, blocks = [], []
+    for group, mask in masks.items():
+        if mask.sum() > 1:
+            members, counts = leave_one_out_counts(mask)
+            meta += [(group, "leave-one-out", i) for i in members]
+            blocks.append(counts)
+        members, counts = cumulative_counts(mask, studies["Year"])
+        meta += [(group, "cumulative", i) for i in members]
+        blocks.append(counts)
+    return meta, np.vstack(blocks)
+
+
+def refits(studies, by=None, method="REML"):
+    """
+    Leave-one-out and cumulative re-fits, pooled in one batch.
+
+    Returns:
+        DataFrame with one row per re-fit: Group, Analysis, Study (omitted
+        or added study), Year, k, Estimate, CI_Lower, CI_Upper, Tau2, I2, Q_p.
+    """
+    masks = _group_masks(studies, by)
+    meta, counts = _refit_rows(studies, masks)
+    fit = rma(studies["g"], studies["Variance"], counts, method=method)
+    studies_idx = [i for _, _, i in meta]
+    return pd.DataFrame({
+        "Group": [g for g, _, _ in meta],
+        "Analysis": [a for _, a, _ in meta],
+        "Study": studies["Label"].to_numpy()[studies_idx],
+        "Year": studies["Year"].to_numpy()[studies_idx],
+        "k": fit.k.astype(int),
+        "Estimate": fit.estimate,
+        "CI_Lower": fit.ci_lb,
+        "CI_Upper": fit.ci_ub,
+        "Tau2": fit.tau2,
+        "I2": fit.I2,
+        "Q_p": fit.Q_p,
+    })
+
+
+def _bootstrap_chunk(task):
+    yi, vi, masks, n, seed, method = task
+    rng = np.random.default_rng(seed)
+    estimates = {}
+    for group, mask in masks.items():
+        members = np.flatnonzero(mask)
+        counts = np.zeros((n, len(mask)))
+        uniform = np.full(len(members), 1 / len(members))
+        counts[:, members] = rng.multinomial(len(members), uniform, size=n)
+        estimates[group] = rma(yi, vi, counts, method=method).estimate
+    return estimates
+
+
+def bootstrap(studies, n_boot=10_000, by=None, method="REML", seed=0, jobs=1,
+              chunksize=BOOT_CHUNKSIZE):
+    """
+    Pooled estimates of ``n_boot`` study-level bootstrap resamples per group.
+
+    Studies are resampled with replacement within their group.
+
+    Args:
+        jobs: Worker processes for the resample chunks (1 = in process).
+
+    Returns:
+        Dict of group to array of ``n_boot`` pooled estimates.
+    """
+    masks = {g: m for g, m in _group_masks(studies, by).items() if m.sum() > 1}
+    sizes = [min(chunksize, n_boot - start) for start in range(0, n_boot, chunksize)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    yi, vi = studies["g"].to_numpy(), studies["Variance"].to_numpy()
+    tasks = [(yi, vi, masks, n, s, method) for n, s in zip(sizes, seeds)]
+    if jobs == 1 or len(tasks) == 1:
+        chunks = list(map(_bootstrap_chunk, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            chunks = list(pool.map(_bootstrap_chunk, tasks))
+    return {g: np.concatenate([c[g] for c in chunks]) for g in masks}
+
+
+def summary_table(studies, by=None, method="REML", n_boot=10_000, seed=0, jobs=1,
+                  refit_table=None):
+    """
+    One row per group: the fit, its leave-one-out range and bootstrap CI.
+
+    Args:
+        refit_table: Output of :func:`refits` to reuse, if already computed.
+    """
+    masks = _group_masks(studies, by)
+    groups = list(masks)
+    fit = rma(studies["g"], studies["Variance"],
+              np.array([masks[g] for g in groups], dtype=float), method=method)
+    refit_table = refits(studies, by, method) if refit_table is None else refit_table
+    loo = refit_table[refit_table["Analysis"] == "leave-one-out"]
+    boot = bootstrap(studies, n_boot, by, method, seed, jobs) if n_boot else {}
+
+    rows = []
+    for i, group in enumerate(groups):
+        row = {
+            "Group": group, "k": int(fit.k[i]), "Estimate": fit.estimate[i],
+            "CI_Lower": fit.ci_lb[i], "CI_Upper": fit.ci_ub[i],
+            "Tau2": fit.tau2[i], "I2": fit.I2[i], "Q": fit.Q[i], "Q_p": fit.Q_p[i],
+            "LOO_Min": np.nan, "LOO_Max": np.nan, "Most_Influential": "",
+            "Boot_SE": np.nan, "Boot_Lower": np.nan, "Boot_Upper": np.nan,
+        }
+        group_loo = loo[loo["Group"] == group]
+        if len(group_loo):
+            shift = (group_loo["Estimate"] - fit.estimate[i]).abs().to_numpy()
+            row.update(LOO_Min=group_loo["Estimate"].min(),
+                       LOO_Max=group_loo["Estimate"].max(),
+                       Most_Influential=group_loo["Study"].iloc[int(np.argmax(shift))])
+        if group in boot:
+            row.update(Boot_SE=boot[group].std(ddof=1),
+                       Boot_Lower=np.percentile(boot[group], 2.5),
+                       Boot_Upper=np.percentile(boot[group], 97.5))
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def plot_influence(refit_table, summary, path, dpi=300):
+    """
+    Leave-one-out influence plot, one panel per group.
+
+    Each row shows the pooled estimate and CI with one study omitted, against
+    the full-group estimate (dashed) and CI (shaded).
+    """
+    import matplotlib.pyplot as plt
+
+    loo = refit_table[refit_table["Analysis"] == "leave-one-out"]
+    groups = [g for g in summary["Group"] if (loo["Group"] == g).any()]
+    heights = [max((loo["Group"] == g).sum(), 2) for g in groups]
+    fig, axes = plt.subplots(len(groups), 1, squeeze=False, sharex=True,
+                             figsize=(8, 1.2 + 0.35 * sum(heights)),
+                             gridspec_kw={"height_ratios": heights})
+    for ax, group in zip(axes[:, 0], groups):
+        rows = loo[loo["Group"] == group]
+        full = summary.set_index("Group").loc[group]
+        y = np.arange(len(rows))[::-1]
+        ax.axvspan(full["CI_Lower"], full["CI_Upper"], color="lightsteelblue", alpha=0.5)
+        ax.axvline(full["Estimate"], color="navy", linestyle="--", linewidth=1.2)
+        xerr = [rows["Estimate"] - rows["CI_Lower"], rows["CI_Upper"] - rows["Estimate"]]
+        ax.errorbar(rows["Estimate"], y, xerr=xerr, fmt="s", color="navy",
+                    markersize=5, capsize=3, linewidth=1.0)
+        ax.set_yticks(y)
+        ax.set_yticklabels(["Omitting " + s for s in rows["Study"]], fontsize=9)
+        ax.set_title(f"{group} (k = {int(full['k'])})", fontsize=11, fontweight="bold")
+        ax.grid(True, axis="x", alpha=0.3, linestyle="--")
+    axes[-1, 0].set_xlabel("Pooled Hedges' g (leave-one-out)", fontsize=11)
+    save_figure(fig, path, dpi)
@@ -0,0 +1,259 @@
+"""
+Bulk scoring of assessment records against the ARC assessment rubrics.
+
+``supplementary/Assessment_Rubrics.xlsx`` holds three rubrics, one per
+sheet. :func:`load_rubrics` turns each into a :class:`Rubric`, i.e. the
+criteria, their weights (``Weight (%)`` or ``Points`` column, normalised),
+the performance bands, the lower bound of each band on the record scale and
+the Dreyfus level (:data:`arc_figures.competency.DREYFUS_LEVELS`) each band
+certifies:
+
+* bands whose header carries a percentage range (``Developing (60-69%)``)
+  are scored from percentages, 0-100;
+* otherwise records rate each criterion from 1 to the number of bands, and a
+  weighted rating is assigned to the nearest band (``Level k: <name>``
+  headers must name the Dreyfus levels in order).
+
+Band ``k`` certifies Dreyfus level ``k``, so the four-band rubrics reach
+*Proficient*; *Expert* is certified by the five-level Overall Competency
+rubric only.
+
+Records are wide CSVs: one row per student, one column per criterion
+(header as in the workbook, or in snake case), other columns passed
+through. :func:`iter_scores` reads them in chunks and scores each chunk with
+one matrix product and one ``searchsorted``; :func:`score_csv` streams the
+chunks to an output CSV.
+
+Usage (from ``code/python``)::
+
+    python -m arc_figures rubric records.csv --rubric technical -o graded.csv
+"""
+
+from dataclasses import dataclass
+import re
+
+import numpy as np
+
+from .competency import DREYFUS_LEVELS
+from .datasets import DATA_DIR
+from .schema import Column, Schema, SchemaError, Violation, validate
+
+RUBRICS = DATA_DIR.parent / "supplementary" / "Assessment_Rubrics.xlsx"
+CHUNKSIZE = 100_000
+
+
+@dataclass(frozen=True)
+class Rubric:
+    """
+    One rubric sheet as arrays.
+
+    Attributes:
+        key: Short name (first word of the sheet name, lower case).
+        sheet: Sheet name.
+        criteria: Criterion names.
+        weights: Criterion weights, summing to 1.
+        bands: Band names, lowest first.
+        thresholds: Lower bound of each band on the record scale.
+        levels: Dreyfus level (1-5) certified by each band.
+        scale: ``(low, high)`` valid record values.
+        percent: Whether records are percentages (else band ratings).
+        descriptors: ``[criterion][band]`` descriptor texts.
+    """
+
+    key: str
+    sheet: str
+    criteria: tuple
+    weights: np.ndarray
+    bands: tuple
+    thresholds: np.ndarray
+    levels: np.ndarray
+    scale: tuple
+    percent: bool
+    descriptors: tuple
+
+    def schema(self):
+        """Schema of a record file (every criterion required and in range)."""
+        low, high = self.scale
+        return Schema(f"rubric:{self.key}",
+                      tuple(Column(c, min=low, max=high) for c in self.criteria))
+
+    def score(self, values):
+        """
+        Score a block of records.
+
+        Args:
+            values: ``(records, criteria)`` array on the record scale.
+
+        Returns:
+            Dict of ``score`` (weighted, record scale), ``percent`` (0-100),
+            ``band`` (index) and ``level`` (Dreyfus level, 1-5) arrays.
+        """
+        score = np.asarray(values, dtype=float) @ self.weights
+        low, high = self.scale
+        # Rounded so that records exactly on a band boundary are not put
+        # below it by floating-point error in the weighted sum.
+        band = np.searchsorted(self.thresholds, np.round(score, 9), side="right") - 1
+        return {
+            "score": score,
+            "percent": (score - low) / (high - low) * 100,
+            "band": band,
+            "level": self.levels[band],
+        }
+
+
+def column_key(name):
+    """Snake-case form under which a criterion column is also accepted."""
+    return re.sub(r"[^0-9a-z]+", "_", str(name).lower()).strip("_")
+
+
+def _band(header):
+    """Name, Dreyfus level (``Level k:`` headers) and percentage range of a band."""
+    text = str(header).strip()
+    level = re.match(r"Level\s+(\d+)\s*:\s*(.+)", text)
+    if level:
+        return level.group(2).strip(), int(level.group(1)), None
+    percent = re.match(r"(.+?)\s*\((\d+)\s*-\s*(\d+)\s*%\)", text)
+    if percent:
+        return percent.group(1).strip(), None, (float(percent.group(2)), float(percent.group(3)))
+    return text, None, None
+
+
+def _parse_sheet(name, rows, path):
+    header_row = next((i for i, row in enumerate(rows)
+                       if row and str(row[0] or "").strip()
+                       and any(str(c or "").startswith(("Points", "Weight")) for c in row)),
+                      None)
+    if header_row is None:
+        raise ValueError(f"{path}: sheet {name!r} has no criteria table")
+    header = [str(c).strip() if c is not None else "" for c in rows[header_row]]
+    weight_col = next(i for i, h in enumerate(header) if h.startswith(("Points", "Weight")))
+    band_cols = [i for i in range(1, weight_col)
+                 if header[i] and not header[i].startswith("Assessment")]
+
+    criteria, weights, descriptors = [], [], []
+    for row in rows[header_row + 1:]:
+        label = str(row[0] or "").strip()
+        if not label or label.upper() == "TOTAL":
+            break
+        criteria.append(label)
+        weights.append(float(str(row[weight_col]).rstrip("%")))
+        descriptors.append(tuple(str(row[i] or "") for i in band_cols))
+
+    bands = [_band(header[i]) for i in band_cols]
+    names = tuple(b[0] for b in bands)
+    if all(b[2] for b in bands):
+        thresholds = np.array([b[2][0] for b in bands])
+        scale, percent = (0.0, 100.0), True
+    else:
+        thresholds = np.r_[1.0, np.arange(1.5, len(bands))]
+        scale, percent = (1.0, float(len(bands))), False
+    if all(b[1] for b in bands):
+        levels = np.array([b[1] for b in bands])
+        named = tuple(DREYFUS_LEVELS[k - 1] for k in levels)
+        if names != named:
+            raise ValueError(f"{path}: sheet {name!r} bands {names} are not the Dreyfus "
+                             f"levels {named}")
+    else:
+        levels = np.arange(1, len(bands) + 1)
+    if len(bands) > len(DREYFUS_LEVELS) or not criteria:
+        raise ValueError(f"{path}: sheet {name!r} is not a rubric of up to "
+                         f"{len(DREYFUS_LEVELS)} bands")
+    weights = np.array(weights)
+    return Rubric(
+        key=name.split()[0].lower(), sheet=name, criteria=tuple(criteria),
+        weights=weights / weights.sum(), bands=names, thresholds=thresholds,
+        levels=levels, scale=scale, percent=percent, descriptors=tuple(descriptors),
+    )
+
+
+def load_rubrics(workbook=RUBRICS):
+    """
+    Parse every rubric sheet of ``workbook``.
+
+    Returns:
+        Dict of rubric key (``overall``, ``technical``, ``project``) to
+        :class:`Rubric`.
+    """
+    try:
+        import openpyxl
+    except ImportError as exc:
+        raise ValueError("reading the rubric workbook needs openpyxl") from exc
+
+    book = openpyxl.load_workbook(workbook, read_only=True)
+    try:
+        sheets = {ws.title: list(ws.iter_rows(values_only=True)) for ws in book.worksheets}
+    finally:
+        book.close()
+    rubrics = [_parse_sheet(name, rows, workbook) for name, rows in sheets.items()]
+    return {r.key: r for r in rubrics}
+
+
+def _criterion_columns(rubric, header, source):
+    by_key = {column_key(h): h for h in header}
+    columns = [c if c in header else by_key.get(column_key(c)) for c in rubric.criteria]
+    missing = [c for c, found in zip(rubric.criteria, columns) if found is None]
+    if missing:
+        raise SchemaError(source, [Violation(c, "missing column") for c in missing])
+    return columns
+
+
+def iter_scores(csv_path, rubric, chunksize=CHUNKSIZE):
+    """
+    Score a record CSV chunk by chunk.
+
+    Args:
+        csv_path: Record file (one row per student, one column per criterion).
+        rubric: :class:`Rubric` to apply.
+        chunksize: Records per chunk.
+
+    Yields:
+        DataFrames with the pass-through columns followed by ``Score``,
+        ``Percent``, ``Band``, ``Level`` and ``Competency``.
+
+    Raises:
+        arc_figures.schema.SchemaError: On a missing criterion column or a
+            missing/out-of-range value (rows counted from the first record).
+    """
+    import pandas as pd
+
+    header = list(pd.read_csv(csv_path, nrows=0).columns)
+    columns = _criterion_columns(rubric, header, csv_path)
+    passthrough = [h for h in header if h not in columns]
+    schema = rubric.schema()
+    bands = np.asarray(rubric.bands, dtype=object)
+    names = np.asarray(DREYFUS_LEVELS, dtype=object)
+    start = 0
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize,
+                             dtype={c: "float64" for c in columns}):
+        values = chunk[columns].to_numpy()
+        found = validate(dict(zip(rubric.criteria, values.T)), schema)
+        if found:
+            raise SchemaError(csv_path, [
+                Violation(v.column, v.rule, tuple(r + start for r in v.rows), v.count)
+                for v in found])
+        result = rubric.score(values)
+        out = chunk[passthrough].reset_index(drop=True)
+        out["Score"] = result["score"]
+        out["Percent"] = result["percent"]
+        out["Band"] = bands[result["band"]]
+        out["Level"] = result["level"]
+        out["Competency"] = names[result["level"] - 1]
+        yield out
+        start += len(chunk)
+
+
+def score_csv(csv_path, rubric, output, chunksize=CHUNKSIZE):
+    """
+    Stream the scores of a record CSV to ``output`` (None: count only).
+
+    Returns:
+        Number of records per Dreyfus level (array of 5 counts).
+    """
+    counts = np.zeros(len(DREYFUS_LEVELS), dtype=int)
+    header = True
+    for block in iter_scores(csv_path, rubric, chunksize):
+        if output is not None:
+            block.to_csv(output, mode="w" if header else "a", header=header, index=False)
+            header = False
+        counts += np.bincount(block["Level"] - 1, minlength=len(DREYFUS_LEVELS))
+    return counts
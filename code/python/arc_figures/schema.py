@@ -0,0 +1,257 @@
+"""
+Column schemas of the CSV inputs, checked before anything is plotted.
+
+A :class:`Schema` declares, per column, the dtype the CSV is parsed with
+(explicit ``int64`` / ``float64`` / ``str``, so no column is inferred as
+``object`` and large files parse faster), whether the column is required,
+its valid range and ordering. :func:`validate` checks a set of columns with
+vectorized NumPy reductions and returns every :class:`Violation` with the
+offending row indices (0-based data rows, header excluded); :func:`check`
+raises a :class:`SchemaError` listing them.
+
+:func:`arc_figures.datasets.load_columns` applies a schema to the column
+cache when it is given one; the result is recorded in the cache metadata, so
+a file is validated once per change, not once per figure. The ranges are
+the hard limits of each quantity (normalised scores in [0, 1], positive
+throughput), which is what catches a file on the wrong scale (e.g. a
+sweep's ~1200-scale workload passed where 0-1 workload is expected); the
+typical ranges in ``data/README_DATA.md`` are descriptive and not enforced.
+"""
+
+from dataclasses import dataclass
+import hashlib
+
+import numpy as np
+
+# Row indices quoted per violation in error messages.
+MAX_ROWS_SHOWN = 10
+
+
+class SchemaError(ValueError):
+    """A CSV does not match its schema.
+
+    Attributes:
+        violations: The :class:`Violation` list behind the message.
+    """
+
+    def __init__(self, source, violations):
+        self.source = str(source)
+        self.violations = list(violations)
+        lines = [f"{self.source}: {len(self.violations)} schema violation(s)"]
+        lines += [f"  {v}" for v in self.violations]
+        super().__init__("\n".join(lines))
+
+
+@dataclass(frozen=True)
+class Violation:
+    """One failed rule: column, rule description and offending rows."""
+
+    column: str
+    rule: str
+    rows: tuple = ()
+    count: int = 0
+
+    def __str__(self):
+        if not self.count:
+            return f"{self.column}: {self.rule}"
+        shown = ", ".join(str(r) for r in self.rows[:MAX_ROWS_SHOWN])
+        more = f" (+{self.count - MAX_ROWS_SHOWN} more)" if self.count > MAX_ROWS_SHOWN else ""
+        return f"{self.column}: {self.rule} at {self.count} row(s): {shown}{more}"
+
+
+@dataclass(frozen=True)
+class Column:
+    """
+    Declaration of one CSV column.
+
+    Attributes:
+        name: Header name.
+        dtype: ``"int64"``, ``"float64"`` or ``"str"``.
+        required: Whether the file must have the column.
+        min, max: Inclusive bounds (None: unbounded).
+        positive: Values must be > 0 (for quantities where 0 is invalid).
+        increasing: Values must be strictly increasing down the file.
+        nullable: Missing (NaN / empty) values are allowed.
+    """
+
+    name: str
+    dtype: str = "float64"
+    required: bool = True
+    min: float = None
+    max: float = None
+    positive: bool = False
+    increasing: bool = False
+    nullable: bool = False
+
+
+@dataclass(frozen=True)
+class Schema:
+    """Named set of column declarations; columns not declared are allowed."""
+
+    name: str
+    columns: tuple
+
+    def dtypes(self, header=None):
+        """``pd.read_csv`` dtype mapping (restricted to ``header`` if given)."""
+        return {c.name: (str if c.dtype == "str" else c.dtype) for c in self.columns
+                if header is None or c.name in header}
+
+    def key(self):
+        """Identifier that changes whenever the declarations change."""
+        digest = hashlib.sha256(repr(self.columns).encode()).hexdigest()[:12]
+        return f"{self.name}:{digest}"
+
+
+def _violation(column, rule, mask):
+    rows = np.flatnonzero(mask)
+    return Violation(column, rule, tuple(int(r) for r in rows[:MAX_ROWS_SHOWN]), len(rows))
+
+
+def _check_column(spec, values):
+    """Violations of one column's rules (``values`` as parsed or cached)."""
+    values = np.asarray(values)
+    if spec.dtype == "str":
+        if values.dtype.kind not in "OUS":
+            return []  # all-numeric labels are still labels
+        text = values.astype(str)
+        if spec.nullable:
+            return []
+        missing = (text == "") | (text == "nan")
+        return [_violation(spec.name, "missing value", missing)] if missing.any() else []
+
+    if values.dtype.kind not in "iufb":
+        return [Violation(spec.name, f"not numeric (parsed as {values.dtype})")]
+    found = []
+    numbers = values.astype(float, copy=False)
+    nan = np.isnan(numbers)
+    if not spec.nullable and nan.any():
+        found.append(_violation(spec.name, "missing value", nan))
+    infinite = np.isinf(numbers)
+    if infinite.any():
+        found.append(_violation(spec.name, "infinite value", infinite))
+    if spec.dtype == "int64" and values.dtype.kind == "f":
+        fractional = ~nan & ~infinite & (numbers != np.round(numbers))
+        if fractional.any():
+            found.append(_violation(spec.name, "not an integer", fractional))
+    with np.errstate(invalid="ignore"):
+        if spec.min is not None and (numbers < spec.min).any():
+            found.append(_violation(spec.name, f"below {spec.min:g}", numbers < spec.min))
+        if spec.max is not None and (numbers > spec.max).any():
+            found.append(_violation(spec.name, f"above {spec.max:g}", numbers > spec.max))
+        if spec.positive and (numbers <= 0).any():
+            found.append(_violation(spec.name, "not positive", numbers <= 0))
+        if spec.increasing and len(numbers) > 1:
+            steps = np.diff(numbers) <= 0
+            if steps.any():
+                found.append(_violation(spec.name, "not strictly increasing",
+                                        np.r_[False, steps]))
+    return found
+
+
+def validate(columns, schema):
+    """
+    Check columns against ``schema``.
+
+    Args:
+        columns: Mapping of column name to array (e.g. the memory-mapped
+            cache of :func:`arc_figures.datasets.load_columns`).
+        schema: Schema to check.
+
+    Returns:
+        List of violations (empty if the columns conform).
+    """
+    found = []
+    lengths = {len(v) for v in columns.values()}
+    if len(lengths) > 1:
+        found.append(Violation("*", f"columns of unequal length {sorted(lengths)}"))
+    for spec in schema.columns:
+        if spec.name not in columns:
+            if spec.required:
+                found.append(Violation(spec.name, "missing column"))
+            continue
+        found += _check_column(spec, columns[spec.name])
+    return found
+
+
+def check(columns, schema, source):
+    """Like :func:`validate`, raising :class:`SchemaError` on any violation."""
+    found = validate(columns, schema)
+    if found:
+        raise SchemaError(source, found)
+
+
+def locate_parse_errors(csv_path, schema, header, skip=0, nrows=None):
+    """
+    Rows of a CSV block whose fields do not parse as their declared dtype.
+
+    Used after ``pd.read_csv`` rejected a block parsed with the schema's
+    dtypes, to report where (re-reads the block as text).
+
+    Args:
+        skip: Data rows before the block.
+        nrows: Rows in the block (None: to the end).
+
+    Returns:
+        List of violations (row indices relative to the whole file).
+    """
+    import pandas as pd
+
+    numeric = [c for c in schema.columns if c.dtype != "str" and c.name in header]
+    block = pd.read_csv(csv_path, usecols=[c.name for c in numeric], dtype=str,
+                        skiprows=range(1, skip + 1), nrows=nrows, keep_default_na=False)
+    found = []
+    for spec in numeric:
+        text = block[spec.name].str.strip()
+        parsed = pd.to_numeric(text.where(text != ""), errors="coerce").to_numpy(dtype=float)
+        bad = np.isnan(parsed) & (text != "").to_numpy()
+        if spec.dtype == "int64":
+            bad |= ~np.isnan(parsed) & (parsed != np.round(parsed))
+            bad |= (text == "").to_numpy()
+        if bad.any():
+            rows = np.flatnonzero(bad) + skip
+            found.append(Violation(spec.name, f"not parseable as {spec.dtype}",
+                                   tuple(int(r) for r in rows[:MAX_ROWS_SHOWN]), len(rows)))
+    return found
+
+
+HRC_SCHEMA = Schema("hrc", (
+    Column("Episode", "int64", min=1, increasing=True),
+    Column("Throughput", positive=True),
+    Column("Workload", min=0.0, max=1.0),
+    Column("Safety", min=0.0, max=1.0),
+))
+
+# Aggregated sweeps (Std_* columns) and per-trial sweeps share the schema.
+SENSITIVITY_SCHEMA = Schema("sensitivity", (
+    Column("Parameter", "str"),
+    Column("Value", positive=True),
+    Column("Throughput", min=0.0),
+    Column("Workload", min=0.0),
+    Column("Safety", min=0.0, max=1.0),
+    Column("Std_Throughput", required=False, min=0.0, nullable=True),
+    Column("Std_Workload", required=False, min=0.0, nullable=True),
+    Column("Std_Safety", required=False, min=0.0, nullable=True),
+    Column("Trials", "int64", required=False, min=1),
+))
+
+STUDIES_SCHEMA = Schema("studies", (
+    Column("Authors", "str"),
+    Column("Year", "int64", min=1900, max=2100),
+    Column("g"),
+    Column("SE", positive=True),
+    Column("Tech_Level", "str", required=False, nullable=True),
+    Column("N", "int64", required=False, min=1),
+))
+
+# Institution profiles scored by arc_figures.decision (answers are checked
+# against the decision model's vocabularies there).
+PROFILE_SCHEMA = Schema("profiles", (
+    Column("budget", min=0.0),
+    Column("students", "int64", min=1),
+    Column("student_level", "str"),
+    Column("prior_experience", "str"),
+    Column("learning_objectives", "str"),
+    Column("lab_space", "str"),
+    Column("safety_systems", "str"),
+    Column("support_staff", "str"),
+))
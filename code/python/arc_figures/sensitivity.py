@@ -0,0 +1,269 @@
+"""
+One-at-a-time parameter sweeps (Figure 5).
+
+A sweep is a table with one row per trial: a ``Parameter`` column naming the
+varied parameter, a ``Value`` column with its multiplier (1.0 = baseline) and
+one column per metric. :func:`aggregate` reduces any grid of parameters x
+levels x trials to per-cell means and standard deviations in one groupby, in
+the layout of ``Sensitivity_Results_Fanuc_Shaded.csv``;
+:func:`plot_sensitivity` derives the Figure 5 layout (groups, baseline bars,
+labels) from that table, so sweeps of any size render without code changes.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from .datasets import load_table
+from .schema import SENSITIVITY_SCHEMA
+from .style import FigureSpec, rounded_box, save_figure
+
+METRICS = ("Throughput", "Workload", "Safety")
+BASELINE = 1.0
+
+# Display names of the parameters of the shipped sweep; others use their own name.
+PARAMETER_LABELS = {
+    "fatigueRate": ("Fatigue Rate", "Fatigue Rate"),
+    "w1": ("Reward w₁", "Reward Weight w₁"),
+    "w3": ("Reward w₃", "Reward Weight w₃"),
+    "auctionFrequency": ("Auction Freq.", "Auction Frequency"),
+}
+# Trials per cell of the shipped sweep (see data/README_DATA.md); aggregated
+# files carry no count column.
+DEFAULT_TRIALS = 10
+GROUP_COLORS = ("lightgray", "lightgreen", "lightyellow", "lightcoral")
+# Bars per axes row before the figure wraps onto further rows.
+CONFIGS_PER_ROW = 12
+
+# Figure 5 (its style is also used when rendering sweeps from the command line).
+FIGURE_SPEC = FigureSpec("Figure5_Sensitivity_Analysis.png", font_size=12)
+
+# Figure 5 display scales: workload / 100, safety x 100.
+DISPLAY = {
+    "Throughput": (1.0, "Throughput (tasks/hour)", "#b5cbf0"),
+    "Workload": (0.01, "Human Workload (0-15)", "#A23B72"),
+    "Safety": (100.0, "Safety Score (0-100)", "#F18F01"),
+}
+
+
+def aggregate(trials, metrics=METRICS):
+    """
+    Mean and standard deviation of every metric per (Parameter, Value) cell.
+
+    Args:
+        trials: One row per trial with Parameter, Value and metric columns.
+        metrics: Metric columns to aggregate.
+
+    Returns:
+        DataFrame with Parameter, Value, the metric means, ``Std_<metric>``
+        (sample SD) and ``Trials``; parameters keep their order of first
+        appearance and values are ascending within each parameter.
+    """
+    metrics = list(metrics)
+    grouped = trials.groupby(["Parameter", "Value"], sort=False)[metrics]
+    means = grouped.mean()
+    stds = grouped.std().add_prefix("Std_")
+    counts = grouped.size().rename("Trials")
+    table = pd.concat([means, stds, counts], axis=1).reset_index()
+    return _order(table)
+
+
+def _order(table):
+    order = {p: i for i, p in enumerate(pd.unique(table["Parameter"]))}
+    table = table.assign(_order=table["Parameter"].map(order))
+    table = table.sort_values(["_order", "Value"], kind="stable")
+    return table.drop(columns="_order").reset_index(drop=True)
+
+
+def load_sensitivity(name="Sensitivity_Results_Fanuc_Shaded.csv", metrics=METRICS):
+    """
+    Load a sweep, aggregating it first if it holds per-trial rows.
+
+    A table that already has ``Std_<metric>`` columns is taken as aggregated.
+    Either layout is checked against
+    :data:`arc_figures.schema.SENSITIVITY_SCHEMA` first.
+    """
+    table = load_table(name, schema=SENSITIVITY_SCHEMA)
+    if all(f"Std_{m}" in table.columns for m in metrics):
+        table = table.copy()
+        if "Trials" not in table.columns:
+            table["Trials"] = DEFAULT_TRIALS
+        return _order(table)
+    return aggregate(table, metrics)
+
+
+def level_label(value, baseline=BASELINE):
+    """``Baseline`` or the signed percent change from the baseline multiplier."""
+    if math.isclose(value, baseline):
+        return "Baseline"
+    return f"{(value / baseline - 1) * 100:+.0f}%"
+
+
+def layout(table, per_row=CONFIGS_PER_ROW):
+    """
+    Bar positions and parameter groups of the Figure 5 layout.
+
+    Returns:
+        ``(table, groups)``: ``table`` gains Row, X, Label and Is_Baseline
+        columns; ``groups`` has one dict per parameter with its Row, Start,
+        End (bar positions within the row), Baseline_X, Label, Short and
+        Color.
+    """
+    table = table.reset_index(drop=True).copy()
+    sizes = table.groupby("Parameter", sort=False).size()
+    per_row = max(per_row, int(sizes.max()))
+    row, used, groups = 0, 0, []
+    for i, (parameter, size) in enumerate(sizes.items()):
+        if used and used + size > per_row:
+            row, used = row + 1, 0
+        short, long = PARAMETER_LABELS.get(parameter, (parameter, parameter))
+        groups.append({
+            "Parameter": parameter, "Row": row, "Start": used, "End": used + size,
+            "Label": long, "Short": short, "Color": GROUP_COLORS[i % len(GROUP_COLORS)],
+        })
+        used += size
+
+    first = {g["Parameter"]: g for g in groups}
+    table["Row"] = table["Parameter"].map(lambda p: first[p]["Row"])
+    table["X"] = table.groupby("Parameter", sort=False).cumcount() \
+        + table["Parameter"].map(lambda p: first[p]["Start"])
+    table["Is_Baseline"] = np.isclose(table["Value"], BASELINE)
+    table["Label"] = [f"{first[p]['Short']}\n({level_label(v)})"
+                      for p, v in zip(table["Parameter"], table["Value"])]
+    for group in groups:
+        rows = table[table["Parameter"] == group["Parameter"]]
+        base = rows[rows["Is_Baseline"]]
+        anchor = base["X"].iloc[0] if len(base) else (group["Start"] + group["End"] - 1) / 2
+        group["Baseline_X"] = anchor
+    return table, groups
+
+
+def influence(table, metrics=METRICS):
+    """
+    Largest relative deviation of any metric mean from its baseline, per parameter.
+
+    Parameters without a baseline row (or with a zero baseline mean) are
+    left out.
+
+    Returns:
+        Series indexed by parameter, largest deviation first (0.02 = 2 %).
+    """
+    deviations = {}
+    for parameter, rows in table.groupby("Parameter", sort=False):
+        base = rows[np.isclose(rows["Value"], BASELINE)]
+        if base.empty:
+            continue
+        means = rows[list(metrics)].to_numpy(dtype=float)
+        reference = base[list(metrics)].to_numpy(dtype=float)[0]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            relative = np.abs(means / reference - 1)[:, reference != 0]
+        if relative.size:
+            deviations[parameter] = float(relative.max())
+    return pd.Series(deviations, dtype=float).sort_values(ascending=False, kind="stable")
+
+
+def insight_text(table):
+    """Caption of the Figure 5 insight box, derived from the sweep."""
+    spread = np.abs(table["Value"] / BASELINE - 1).max() * 100
+    trials = table["Trials"].min() if "Trials" in table.columns else DEFAULT_TRIALS
+    lo = math.floor(table["Workload"].min() / 100) * 100
+    hi = math.ceil(table["Workload"].max() / 100) * 100
+    ranked = influence(table)
+    if ranked.empty:
+        summary = f"Robustness Analysis: ±{spread:.0f}% parameter variations."
+        leaders = ""
+    else:
+        summary = (f"Robustness Analysis: metrics stay within ±{ranked.iloc[0] * 100:.1f}% "
+                   f"of baseline under ±{spread:.0f}% parameter variations.")
+        names = [PARAMETER_LABELS.get(p, (p, p))[1] for p in ranked.index[:2]]
+        verb = "deviates" if len(names) == 1 else "deviate"
+        leaders = f" {' and '.join(names)}\n{verb} most from baseline."
+    return (
+        f"{summary}\n"
+        f"Baseline values (100%) shown with vertical dotted lines.{leaders} Error bars: ±1 SD "
+        f"(n={trials} trials).\n"
+        f"Workload scale normalized for visualization (actual range: {lo}-{hi})."
+    )
+
+
+def plot_sensitivity(table, path, dpi=300, per_row=CONFIGS_PER_ROW):
+    """
+    Render the Figure 5 grouped bar chart of an aggregated sweep.
+
+    Args:
+        table: Output of :func:`aggregate` / :func:`load_sensitivity`.
+        path: Output image path.
+        per_row: Bars per axes row before wrapping onto another row.
+    """
+    import matplotlib.pyplot as plt
+
+    table, groups = layout(table, per_row)
+    n_rows = int(table["Row"].max()) + 1
+    height = 10 if n_rows == 1 else 6 * n_rows
+    fig, axes = plt.subplots(n_rows, 1, figsize=(16, height), squeeze=False)
+    width = 0.25
+
+    for r, ax in enumerate(axes[:, 0]):
+        rows = table[table["Row"] == r]
+        x = rows["X"].to_numpy()
+        bars = {}
+        for offset, metric in zip((-width, 0, width), METRICS):
+            scale, label, color = DISPLAY[metric]
+            values = rows[metric] * scale
+            bars[metric] = ax.bar(x + offset, values, width, label=label, color=color,
+                                  alpha=0.85, edgecolor="black", linewidth=1.5)
+            ax.errorbar(x + offset, values, yerr=rows[f"Std_{metric}"] * scale,
+                        fmt="none", ecolor="black", capsize=4, capthick=1.5,
+                        alpha=0.6, linewidth=1.2)
+
+        # Valores sobre barras baseline
+        baseline = rows["Is_Baseline"].to_numpy()
+        for metric, drop in (("Throughput", 0.3), ("Safety", 2.0)):
+            scale = DISPLAY[metric][0]
+            for bar, val, is_base in zip(bars[metric], rows[metric] * scale, baseline):
+                if is_base:
+                    ax.text(bar.get_x() + bar.get_width() / 2., bar.get_height() - drop,
+                            f"{val:.2f}", ha="center", va="top", fontsize=14,
+                            fontweight="bold", color="black")
+
+        ax.set_xticks(x)
+        ax.set_xticklabels(rows["Label"], rotation=0, ha="center", fontsize=12)
+        ax.tick_params(axis="y", labelsize=12)
+        ax.set_ylabel("Performance Metrics (Normalized Scale)", fontsize=15, fontweight="bold")
+        ax.grid(True, alpha=0.3, linestyle="--", axis="y", linewidth=1)
+        ax.set_axisbelow(True)
+        ax.set_ylim([0, 105])
+        y_max = ax.get_ylim()[1]
+
+        for group in (g for g in groups if g["Row"] == r):
+            ax.axvspan(group["Start"] - 0.5, group["End"] - 0.5,
+                       alpha=0.08, color=group["Color"], zorder=0)
+            x_center = group["Baseline_X"] + width
+            ax.text(x_center, y_max * 0.988, group["Label"],
+                    ha="center", va="top", fontsize=13, fontweight="bold",
+                    bbox=rounded_box(0.4, facecolor=group["Color"], edgecolor="gray",
+                                     alpha=0.7, linewidth=1.5))
+            ax.axvline(x=x_center, color="red", linestyle=":", linewidth=2, alpha=0.3)
+
+    top, bottom = axes[0, 0], axes[-1, 0]
+    bottom.set_xlabel("Parameter Variation", fontsize=15, fontweight="bold", labelpad=10)
+    top.set_title("Sensitivity Analysis: Parameter Robustness in Industrial HRC Systems",
+                  fontsize=17, fontweight="bold", pad=15)
+    legend = top.legend(loc="center right", fontsize=13, frameon=True,
+                        fancybox=True, shadow=True, ncol=1)
+    legend.get_frame().set_alpha(0.95)
+    legend.get_frame().set_edgecolor("black")
+    legend.get_frame().set_linewidth(1.5)
+
+    box = rounded_box(0.6, facecolor="lightyellow", edgecolor="orange",
+                      linewidth=2.5, alpha=0.95)
+    if n_rows == 1:
+        top.text(0.4615, 0.3, insight_text(table), transform=top.transAxes,
+                 fontsize=13, ha="left", va="bottom", bbox=box)
+        save_figure(fig, path, dpi)
+    else:
+        fig.text(0.5, 0.01, insight_text(table), fontsize=13, ha="center",
+                 va="bottom", bbox=box)
+        save_figure(fig, path, dpi, layout_rect=(0, 0.06, 1, 1))
+    return table
@@ -0,0 +1,99 @@
+"""
+Data-only outputs: the statistics behind Figures 4 and 5, as JSON.
+
+``python -m arc_figures stats`` reports what ``Generate_Figure4_HRC.py`` and
+``Generate_Figure5_Sensitivity.py`` print (metric means, Pareto-optimal
+episodes, the sensitivity table) without importing Matplotlib or rendering
+anything. The HRC statistics are computed with NumPy alone from the column
+cache of :mod:`arc_figures.datasets`; pandas is imported only for the
+sensitivity table (or when a CSV is parsed for the first time).
+
+Usage (from ``code/python``)::
+
+    python -m arc_figures stats                     # both sections, JSON on stdout
+    python -m arc_figures stats --only hrc --episodes 0 -o hrc_stats.json
+"""
+
+import math
+
+from .hrc import hrc_statistics
+
+HRC_FILE = "HRC_Aggregated_Fanuc.csv"
+SENSITIVITY_FILE = "Sensitivity_Results_Fanuc_Shaded.csv"
+# Episodes plotted (and summarised) by Figure 4.
+FIGURE4_EPISODES = 200
+SECTIONS = ("hrc", "sensitivity")
+
+
+def json_number(value):
+    """JSON-safe float (None for NaN/inf)."""
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+def hrc_stats(path=HRC_FILE, limit=FIGURE4_EPISODES):
+    """
+    Figure 4 statistics of an episode log.
+
+    Args:
+        path: HRC episode CSV (see :func:`arc_figures.datasets.resolve_data_path`).
+        limit: Episodes to summarise (None: the whole log).
+
+    Returns:
+        Dict with the episode count, metric means, panel (d) quantile
+        thresholds and the Pareto-optimal episodes.
+    """
+    return summary_stats(hrc_statistics(path, limit=limit), path)
+
+
+def summary_stats(summary, source):
+    """JSON-ready dict of an :class:`arc_figures.hrc.HRCSummary`."""
+    front = summary.front_episodes
+    front = [] if front is None else [int(e) for e in front]
+    stats = {
+        "source": str(source),
+        "episodes": summary.episodes,
+        "means": {m: json_number(v) for m, v in summary.means.items()},
+        "thresholds": {m: json_number(v) for m, v in summary.thresholds.items()},
+        "exact": summary.exact,
+        "pareto_points": len(front),
+        "pareto_episodes": front,
+    }
+    if summary.stds is not None:
+        stats["stds"] = {m: json_number(v) for m, v in summary.stds.items()}
+    return stats
+
+
+def sensitivity_stats(path=SENSITIVITY_FILE):
+    """
+    Figure 5 sensitivity table (aggregated per parameter and level).
+
+    Returns:
+        Dict with the parameter and configuration counts and one record per
+        configuration.
+    """
+    from .sensitivity import load_sensitivity
+
+    table = load_sensitivity(path)
+    records = [{k: (v if isinstance(v, (str, int)) else json_number(v)) for k, v in row.items()}
+               for row in table.to_dict("records")]
+    return {
+        "source": str(path),
+        "parameters": int(table["Parameter"].nunique()),
+        "configurations": len(table),
+        "table": records,
+    }
+
+
+def collect(sections=SECTIONS, hrc_path=HRC_FILE, limit=FIGURE4_EPISODES,
+            sensitivity_path=SENSITIVITY_FILE):
+    """Statistics of the requested ``sections``, keyed by section name."""
+    unknown = set(sections) - set(SECTIONS)
+    if unknown:
+        raise ValueError(f"unknown stats section(s): {', '.join(sorted(unknown))}")
+    result = {}
+    if "hrc" in sections:
+        result["hrc"] = hrc_stats(hrc_path, limit)
+    if "sensitivity" in sections:
+        result["sensitivity"] = sensitivity_stats(sensitivity_path)
+    return result
@@ -0,0 +1,166 @@
+"""
+Shared figure style and rendering.
+
+Every figure uses the same serif (Palatino) configuration, white background
+and 300 DPI ``bbox_inches='tight'`` output; this module holds that setup
+once. A :class:`FigureSpec` declares a figure's output file, base font size,
+font fallback list and layout; :func:`apply_style` / :func:`style_context`
+install its rcParams and :meth:`FigureSpec.save` (or :func:`render`, for a
+drawing callable) lays it out, saves and closes it.
+
+Font fallback is resolved once per process (:func:`resolve_serif`, backed
+by the on-disk font index of :mod:`arc_figures.fonts`): the family
+Matplotlib would end up using is put first in ``font.serif``, so figures
+rendered in a warm process (see :mod:`arc_figures.build`) neither repeat the
+search through uninstalled families nor warn about each of them. The
+resolved family is the one the fallback list selects anyway, so output is
+unchanged. Layout and saving run with the persistent text-extent cache of
+:func:`arc_figures.fonts.text_extents`, and saving goes through
+:func:`arc_figures.export.export_figure`, which also writes any extra
+formats/resolutions requested with ``ARC_EXPORT``.
+"""
+
+from dataclasses import dataclass
+import functools
+
+from .export import export_figure, optimize_requested, requested_exports
+from .fonts import resolve_family, text_extents
+
+# Font fallback lists used by the figures (Figures 2 and 6 prefer TeX Gyre
+# Pagella, the free Palatino clone).
+PALATINO = ("Palatino Linotype", "Palatino", "URW Palladio L", "serif")
+PAGELLA = ("TeX Gyre Pagella", *PALATINO)
+
+DPI = 300
+SAVE_OPTIONS = {"bbox_inches": "tight", "facecolor": "white"}
+
+
+@dataclass(frozen=True)
+class FigureSpec:
+    """
+    Declarative description of one figure.
+
+    Attributes:
+        output: File the figure is saved to.
+        font_size: Base ``font.size``.
+        serif: Font fallback list for ``font.serif``.
+        figsize: Figure size in inches (used by :func:`render`).
+        dpi: Output resolution.
+        layout_rect: ``tight_layout`` rectangle, or None for the full figure.
+    """
+
+    output: str
+    font_size: float = 11
+    serif: tuple = PALATINO
+    figsize: tuple = None
+    dpi: int = DPI
+    layout_rect: tuple = None
+
+    def rc(self):
+        """rcParams of this figure's style."""
+        return style_rc(self.font_size, self.serif)
+
+    def save(self, fig, path=None):
+        """Lay out, save (to ``path`` or :attr:`output`) and close ``fig``."""
+        return save_figure(fig, path or self.output, self.dpi, self.layout_rect)
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_serif(serif=PALATINO):
+    """
+    Family name of the font Matplotlib selects for ``serif``.
+
+    Args:
+        serif: Fallback list, tried in order like ``font.serif``.
+
+    Returns:
+        Name of the first installed family, or of Matplotlib's default
+        family when none of them is installed.
+    """
+    return resolve_family(serif)
+
+
+def style_rc(font_size=11, serif=PALATINO):
+    """rcParams of the paper style with ``font.serif`` resolved."""
+    serif = tuple(serif)
+    resolved = resolve_serif(serif)
+    return {
+        "font.family": "serif",
+        "font.serif": [resolved, *(f for f in serif if f != resolved)],
+        "font.size": font_size,
+    }
+
+
+def apply_style(spec):
+    """Install the style of ``spec`` (a FigureSpec) in the global rcParams."""
+    import matplotlib.pyplot as plt
+
+    plt.rcParams.update(spec.rc())
+
+
+def style_context(spec):
+    """Context manager applying the style of ``spec`` temporarily."""
+    import matplotlib
+
+    return matplotlib.rc_context(spec.rc())
+
+
+def save_figure(fig, path, dpi=DPI, layout_rect=None):
+    """
+    Lay out, save and close a figure with the paper's output options.
+
+    Exports requested through ``ARC_EXPORT`` are written from the same
+    layout pass (see :mod:`arc_figures.export`).
+
+    Args:
+        fig: Figure to save.
+        path: Output file.
+        dpi: Output resolution.
+        layout_rect: ``tight_layout`` rectangle, or None for the full figure.
+
+    Returns:
+        List of the files written, ``path`` first.
+    """
+    import matplotlib.pyplot as plt
+
+    with text_extents():
+        if layout_rect is None:
+            fig.tight_layout()
+        else:
+            fig.tight_layout(rect=list(layout_rect))
+        written = export_figure(fig, path, dpi, requested_exports(), optimize_requested(),
+                                facecolor=SAVE_OPTIONS["facecolor"])
+    plt.close(fig)
+    return written
+
+
+def render(spec, draw):
+    """
+    Render a figure from its spec and a drawing callable.
+
+    Args:
+        spec: FigureSpec.
+        draw: Callable receiving the new (empty) Figure and drawing on it.
+
+    Returns:
+        Path of the saved figure.
+    """
+    import matplotlib.pyplot as plt
+
+    with style_context(spec):
+        fig = plt.figure(figsize=spec.figsize)
+        draw(fig)
+        spec.save(fig)
+    return spec.output
+
+
+def rounded_box(pad, **props):
+    """``bbox`` properties of a rounded text box (``boxstyle='round'``)."""
+    return dict(boxstyle=f"round,pad={pad}", **props)
+
+
+def rounded_patch(xy, width, height, pad, **props):
+    """Rounded rectangle patch (FancyBboxPatch) at ``xy``."""
+    from matplotlib.patches import FancyBboxPatch
+
+    return FancyBboxPatch(xy, width, height, boxstyle=f"round,pad={pad}", **props)
@@ -0,0 +1,13 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keep column caches out of the repository's ``data/`` directory."""
+    monkeypatch.setenv("ARC_CACHE_DIR", str(tmp_path / "cache"))
+    return tmp_path / "cache"
@@ -0,0 +1,352 @@
+"""Checks of the arc_figures numerics against reference implementations."""
+
+import os
+
+import numpy as np
+import pytest
+
+from arc_figures import datasets
+from arc_figures.datasets import cache_dir_for, load_columns
+from arc_figures.hrc import METRICS, QuantileSketch
+from arc_figures.live import OnlineHRC
+from arc_figures.meta import group_counts, rma, studies_table
+from arc_figures.portfolio import PortfolioOptimizer
+from arc_figures.pareto import ParetoArchive, nondominated_sort, pareto_front
+
+Q = np.linspace(0, 1, 41)
+
+
+def test_quantile_sketch_exact_below_capacity():
+    values = np.random.default_rng(0).normal(size=1000)
+    sketch = QuantileSketch(capacity=1024)
+    for part in np.array_split(values, 7):
+        sketch.update(part)
+    assert sketch.exact
+    np.testing.assert_allclose(sketch.quantile(Q), np.quantile(values, Q))
+
+
+def test_quantile_sketch_merge_and_compression():
+    values = np.random.default_rng(1).lognormal(size=200_000)
+    sketches = [QuantileSketch(capacity=4096) for _ in range(4)]
+    for sketch, part in zip(sketches, np.array_split(values, 4)):
+        for block in np.array_split(part, 10):
+            sketch.update(block)
+    merged = sketches[0]
+    for sketch in sketches[1:]:
+        merged.merge(sketch)
+    assert not merged.exact and merged.count == len(values)
+    assert merged.quantile(0.0) == values.min() and merged.quantile(1.0) == values.max()
+    # Rank error of a compressed sketch stays within one bucket width.
+    ranks = np.searchsorted(np.sort(values), merged.quantile(Q[1:-1])) / len(values)
+    assert np.abs(ranks - Q[1:-1]).max() < 1 / (4096 // 2)
+
+
+def test_quantile_sketch_ignores_nan():
+    sketch = QuantileSketch()
+    sketch.update([1.0, np.nan, 3.0])
+    assert sketch.count == 2
+    assert sketch.quantile(0.5) == pytest.approx(2.0)
+
+
+def _write_csv(path, rows):
+    path.write_text("id,value\n" + "".join(f"{i},{v}\n" for i, v in rows), encoding="utf-8")
+
+
+@pytest.mark.parametrize("text_row", [0, 11])
+def test_column_cache_keeps_rows_when_a_column_changes_kind(tmp_path, monkeypatch, text_row):
+    monkeypatch.setattr(datasets, "CONVERT_CHUNKSIZE", 5)
+    values = [str(i * 1.5) for i in range(15)]
+    values[text_row] = "foo"
+    csv = tmp_path / "mixed.csv"
+    _write_csv(csv, enumerate(values))
+    columns = load_columns(csv)
+    assert len(columns["id"]) == len(columns["value"]) == 15
+    np.testing.assert_array_equal(columns["id"], np.arange(15))
+    assert list(columns["value"]) == values
+
+
+def test_column_cache_widens_integer_columns(tmp_path, monkeypatch):
+    monkeypatch.setattr(datasets, "CONVERT_CHUNKSIZE", 5)
+    values = [str(i) for i in range(10)] + ["10.5"] + [str(i) for i in range(11, 15)]
+    csv = tmp_path / "widen.csv"
+    _write_csv(csv, enumerate(values))
+    column = load_columns(csv)["value"]
+    assert column.dtype == np.float64
+    np.testing.assert_array_equal(column, np.array(values, dtype=float))
+
+
+def test_column_cache_invalidation(tmp_path):
+    csv = tmp_path / "data.csv"
+    _write_csv(csv, enumerate(range(10)))
+    np.testing.assert_array_equal(load_columns(csv)["value"], np.arange(10))
+    cached = cache_dir_for(csv) / "value.npy"
+    built = cached.stat().st_mtime_ns
+
+    # Same content, new mtime (e.g. a fresh checkout): revalidated by hash.
+    os.utime(csv, ns=(csv.stat().st_atime_ns, csv.stat().st_mtime_ns + 10**9))
+    np.testing.assert_array_equal(load_columns(csv)["value"], np.arange(10))
+    assert cached.stat().st_mtime_ns == built
+
+    # Changed content: rebuilt.
+    _write_csv(csv, enumerate(range(10, 22)))
+    np.testing.assert_array_equal(load_columns(csv)["value"], np.arange(10, 22))
+
+
+def _brute_front(F):
+    """Non-dominated mask by comparing every pair of points (minimisation)."""
+    weak = np.ones((len(F), len(F)), dtype=bool)
+    strict = np.zeros((len(F), len(F)), dtype=bool)
+    for column in F.T:
+        weak &= column[None, :] <= column[:, None]
+        strict |= column[None, :] < column[:, None]
+    return ~(weak & strict).any(axis=1)
+
+
+@pytest.mark.parametrize("m", [1, 2, 3, 4])
+@pytest.mark.parametrize("n", [50, 6000])
+def test_pareto_front_matches_brute_force(m, n):
+    # Few distinct values, so ties and duplicate points are common; 6000
+    # rows take the block-screening path for three or more objectives.
+    points = np.random.default_rng(m * n).integers(0, 12, (n, m)).astype(float)
+    maximize = np.arange(m) % 2 == 0
+    np.testing.assert_array_equal(pareto_front(points, maximize),
+                                  _brute_front(np.where(maximize, -points, points)))
+
+
+def test_nondominated_sort_peels_brute_force_fronts():
+    points = np.random.default_rng(7).normal(size=(300, 3))
+    ranks = nondominated_sort(points)
+    remaining = np.arange(len(points))
+    rank = 0
+    while len(remaining):
+        front = _brute_front(points[remaining])
+        np.testing.assert_array_equal(ranks[remaining[front]], rank)
+        remaining = remaining[~front]
+        rank += 1
+
+
+def test_pareto_archive_matches_front_of_all_points():
+    points = np.random.default_rng(3).integers(0, 20, (2000, 3)).astype(float)
+    archive = ParetoArchive(3, maximize=(True, False, True))
+    for start in range(0, 1500, 100):
+        archive.add(points[start:start + 100], row=np.arange(start, start + 100))
+    for row in range(1500, 2000):  # single-point live updates
+        archive.add(points[row], row=[row])
+    expected = np.flatnonzero(pareto_front(points, (True, False, True)))
+    np.testing.assert_array_equal(np.sort(archive.labels["row"]), expected)
+
+
+@pytest.mark.parametrize("method", ["REML", "DL"])
+def test_meta_figure7_matches_metafor(method):
+    # metafor 4.x output recorded in REPRODUCE.md for the 12 Figure 7 studies.
+    # tau^2 is zero under both estimators (Q = 10.75 < 11 df), so they agree.
+    studies = studies_table()
+    fit = rma(studies["g"], studies["Variance"], method=method)
+    assert fit.k == 12 and fit.tau2 == 0.0
+    assert fit.estimate == pytest.approx(0.786, abs=5e-4)
+    assert (fit.ci_lb, fit.ci_ub) == pytest.approx((0.726, 0.846), abs=5e-4)
+
+
+# BCG vaccine trials (metafor's dat.bcg): log risk ratios and variances.
+BCG = np.array([
+    [4, 119, 11, 128], [6, 300, 29, 274], [3, 228, 11, 209], [62, 13536, 248, 12619],
+    [33, 5036, 47, 5761], [180, 1361, 372, 1079], [8, 2537, 10, 619],
+    [505, 87886, 499, 87892], [29, 7470, 45, 7232], [17, 1699, 65, 1600],
+    [186, 50448, 141, 27197], [5, 2493, 3, 2338], [27, 16886, 29, 17825],
+], dtype=float)
+
+
+@pytest.mark.parametrize("method, expected", [
+    # rma(yi, vi, data=dat.bcg, method=...) as printed in metafor's documentation.
+    ("REML", dict(tau2=0.3132, estimate=-0.7145, se=0.1798, ci_lb=-1.0669,
+                  ci_ub=-0.3622, Q=152.2330, I2=92.22, H2=12.86)),
+    ("DL", dict(tau2=0.3088, estimate=-0.7141, se=0.1787, ci_lb=-1.0644,
+                ci_ub=-0.3638, Q=152.2330, I2=92.12, H2=12.69)),
+])
+def test_meta_heterogeneous_matches_metafor(method, expected):
+    tpos, tneg, cpos, cneg = BCG.T
+    yi = np.log(tpos / (tpos + tneg)) - np.log(cpos / (cpos + cneg))
+    vi = 1 / tpos - 1 / (tpos + tneg) + 1 / cpos - 1 / (cpos + cneg)
+    fit = rma(yi, vi, method=method)
+    for name, value in expected.items():
+        printed = 2 if name in ("I2", "H2") else 4  # decimals metafor prints
+        assert getattr(fit, name) == pytest.approx(value, abs=0.5 * 10 ** -printed), name
+
+
+def _restricted_loglik(tau2, y, v):
+    w = 1 / (v + tau2)
+    mu = (w * y).sum() / w.sum()
+    return -0.5 * (np.log(v + tau2).sum() + np.log(w.sum()) + (w * (y - mu) ** 2).sum())
+
+
+def test_meta_subgroup_tau2_matches_direct_estimates():
+    from scipy.optimize import minimize_scalar
+
+    studies = studies_table()
+    groups, counts = group_counts(studies["Tech_Level"])
+    reml = rma(studies["g"], studies["Variance"], counts, method="REML")
+    dl = rma(studies["g"], studies["Variance"], counts, method="DL")
+    assert reml.tau2[groups.index("Industrial")] > 0
+    for b, group in enumerate(groups):
+        member = counts[b] > 0
+        if member.sum() < 2:
+            continue
+        y = studies["g"].to_numpy()[member]
+        v = studies["Variance"].to_numpy()[member]
+        w = 1 / v
+        Q = (w * (y - (w * y).sum() / w.sum()) ** 2).sum()
+        closed_dl = max(0.0, (Q - (len(y) - 1)) / (w.sum() - (w ** 2).sum() / w.sum()))
+        assert dl.tau2[b] == pytest.approx(closed_dl, abs=1e-12), group
+        best = minimize_scalar(lambda t: -_restricted_loglik(t, y, v),
+                               bounds=(0, 1), method="bounded", options={"xatol": 1e-9})
+        assert reml.tau2[b] == pytest.approx(best.x, abs=1e-5), group
+        assert reml.estimate[b] == pytest.approx(rma(y, v).estimate), group
+
+
+@pytest.mark.parametrize("window", [1, 20])
+def test_online_rolling_means_match_pandas(window):
+    pd = pytest.importorskip("pandas")
+    rng = np.random.default_rng(window)
+    n = 1000
+    frame = pd.DataFrame({"Episode": np.arange(n), "Throughput": rng.normal(50, 5, n),
+                          "Workload": rng.uniform(0, 1, n), "Safety": rng.uniform(0, 1, n)})
+    frame.loc[[100, 101, 500], "Safety"] = np.nan  # skipped by the aggregator
+    valid = frame.dropna().reset_index(drop=True)
+    valid["Workload_100"] = valid["Workload"] * 100
+    valid["Safety_100"] = valid["Safety"] * 100
+
+    aggregator = OnlineHRC(window=window, keep=n)
+    # Batches of uneven size, including single episodes and ones shorter
+    # than the window.
+    cuts = [0, 1, 2, 7, 30, 31, 250, 600, 601, n]
+    rolled = []
+    for lo, hi in zip(cuts[:-1], cuts[1:]):
+        batch = aggregator.extend({c: frame[c].to_numpy()[lo:hi] for c in frame})
+        if batch is not None:
+            rolled.append(batch)
+    assert aggregator.skipped == 3 and aggregator.episodes == len(valid)
+    for metric in METRICS:
+        expected = valid[metric].rolling(window).mean().to_numpy()
+        ours = np.concatenate([batch[f"{metric}_MA"] for batch in rolled])
+        np.testing.assert_allclose(ours, expected, rtol=1e-12, atol=1e-12)
+        assert aggregator.rolling()[metric] == pytest.approx(expected[-1], rel=1e-12)
+        assert aggregator.means()[metric] == pytest.approx(valid[metric].mean(), rel=1e-12)
+        assert aggregator.stds()[metric] == pytest.approx(valid[metric].std(), rel=1e-9)
+
+
+try:
+    from scipy.optimize import milp
+except ImportError:
+    milp = None
+needs_milp = pytest.mark.skipif(milp is None, reason="needs scipy>=1.9 (milp)")
+
+
+@needs_milp
+@pytest.mark.parametrize("students", [1, 7, 120])
+def test_portfolio_dp_matches_ilp(students):
+    optimizer = PortfolioOptimizer()
+    budgets = np.linspace(0, students * optimizer.costs.max(), 23).round(-2)
+    for budget in budgets:
+        dp = optimizer.solve(budget, students, method="dp")
+        ilp = optimizer.solve(budget, students, method="ilp")
+        assert dp.effect == pytest.approx(ilp.effect, abs=1e-9), budget
+        assert dp.cost <= budget and ilp.cost <= budget
+        assert dp.counts.sum() <= students and ilp.counts.sum() <= students
+
+
+@needs_milp
+def test_portfolio_auto_uses_ilp_cold_and_dp_tables_warm():
+    optimizer = PortfolioOptimizer()
+    assert optimizer.solve(250_000, 120).method == "ilp"
+    frontier = optimizer.frontier(120)
+    assert {a.method for a in frontier} == {"dp"}
+    # Each frontier budget is where the optimum improves, so it is exact.
+    for allocation in frontier[::50]:
+        warm = optimizer.solve(allocation.budget, 120)
+        assert warm.method == "dp" and warm.effect == pytest.approx(allocation.effect)
+
+
+# One profile per "Best For" audience of the workbook's Technology Levels
+# sheet, plus budgets only the remote laboratory fits: expected option and level.
+REFERENCE_PROFILES = [
+    # budget, students, level, experience, objectives, lab, safety, staff
+    ((30_000, 30, "k-12", "none", "introductory", "none", "none", "none"),
+     "Level 1-2", 1),
+    ((30_000, 30, "early undergraduate", "basic", "introductory", "shared", "none", "none"),
+     "Level 1-2", 1),
+    ((200_000, 30, "undergraduate", "basic", "programming", "shared", "basic", "part-time"),
+     "Level 3", 3),
+    ((180_000, 30, "technical program", "basic", "programming", "shared", "basic",
+      "part-time"), "Level 3", 3),
+    ((500_000, 20, "advanced undergraduate", "basic", "system integration", "dedicated",
+      "basic", "part-time"), "Level 4", 4),
+    ((500_000, 20, "graduate", "intermediate", "system integration", "dedicated", "basic",
+      "dedicated"), "Level 4", 4),
+    ((1_000_000, 10, "professional", "advanced", "industrial practice", "dedicated",
+      "industrial", "dedicated"), "Level 5", 5),
+    ((2_000, 30, "k-12", "none", "introductory", "none", "none", "none"),
+     "Level 5 Remote", 1),
+    ((3_000, 40, "undergraduate", "basic", "programming", "none", "none", "none"),
+     "Level 5 Remote", 3),
+    ((6_000, 80, "graduate", "advanced", "research", "none", "none", "none"),
+     "Level 5 Remote", 5),
+]
+PROFILE_COLUMNS = ("budget", "students", "student_level", "prior_experience",
+                   "learning_objectives", "lab_space", "safety_systems", "support_staff")
+
+
+def test_decision_reference_profiles():
+    pytest.importorskip("openpyxl")
+    from arc_figures.decision import recommend
+
+    answers = list(zip(*(profile for profile, _, _ in REFERENCE_PROFILES)))
+    result = recommend(dict(zip(PROFILE_COLUMNS, map(np.array, answers))))
+    assert list(result["Option"]) == [option for _, option, _ in REFERENCE_PROFILES]
+    assert list(result["Level"]) == [level for _, _, level in REFERENCE_PROFILES]
+
+
+@pytest.fixture(scope="module")
+def rubrics():
+    pytest.importorskip("openpyxl")
+    from arc_figures.rubrics import load_rubrics
+
+    return load_rubrics()
+
+
+# Weighted score -> band index, on and just below every boundary.
+RUBRIC_BOUNDARIES = {
+    # Percentage bands: Unsatisfactory <60, Developing 60-69, Proficient 70-84,
+    # Exemplary 85-100.
+    "technical": [(0, 0), (59.99, 0), (60, 1), (69.99, 1), (70, 2), (84.99, 2),
+                  (85, 3), (100, 3)],
+    # Ratings 1-4 go to the nearest band, halves rounding up.
+    "project": [(1, 0), (1.49, 0), (1.5, 1), (2.49, 1), (2.5, 2), (3.49, 2), (3.5, 3), (4, 3)],
+    "overall": [(1, 0), (1.49, 0), (1.5, 1), (2.5, 2), (3.49, 2), (3.5, 3), (4.49, 3),
+                (4.5, 4), (5, 4)],
+}
+
+
+@pytest.mark.parametrize("key", sorted(RUBRIC_BOUNDARIES))
+def test_rubric_band_boundaries(rubrics, key):
+    rubric = rubrics[key]
+    scores, bands = map(np.array, zip(*RUBRIC_BOUNDARIES[key]))
+    # Every criterion at the score, so the weighted sum carries rounding error.
+    result = rubric.score(np.repeat(scores[:, None], len(rubric.criteria), axis=1))
+    np.testing.assert_allclose(result["score"], scores)
+    np.testing.assert_array_equal(result["band"], bands)
+    np.testing.assert_array_equal(result["level"], rubric.levels[bands])
+
+
+def test_rubric_boundary_survives_floating_point_sum(rubrics):
+    rubric = rubrics["overall"]
+    # Weighted sum exactly 3.5 (Proficient), computed as 3.4999999999999996.
+    record = np.array([[2.5, 5.0, 2.0, 4.5, 4.0, 4.0]])
+    assert (record @ rubric.weights)[0] < 3.5
+    result = rubric.score(record)
+    assert rubric.bands[result["band"][0]] == "Proficient"
+    assert result["level"][0] == 4
+
+
+def test_rubric_levels_reach_expert_only_on_overall(rubrics):
+    assert rubrics["overall"].levels.max() == 5
+    assert rubrics["technical"].levels.max() == rubrics["project"].levels.max() == 4
@@ -2,8 +2,9 @@
 # ARC Framework: Generate All Figures (PowerShell)
 # ==============================================================================
 # This script generates all figures from the paper.
-# Prerequisites: Python 3.8+, R 4.0+, required packages installed
-# Usage: .\generate_all_figures.ps1
+# Prerequisites: Python 3.8+, required packages installed
+# Usage: .\generate_all_figures.ps1 [--force]
+#   Unchanged figures are skipped; --force re-renders every figure.
 # ==============================================================================
 
 Write-Host "======================================================================" -ForegroundColor Cyan
@@ -38,7 +39,7 @@ try {
 Write-Host "Checking Python packages..."
 $packagesOk = $true
 try {
-    python -c "import matplotlib, pandas, numpy" 2>$null
+    python -c "import matplotlib, pandas, numpy, scipy" 2>$null
     if ($LASTEXITCODE -ne 0) {
         $packagesOk = $false
     }
@@ -51,31 +52,11 @@ if (-not $packagesOk) {
     Write-Host "Please run: pip install -r requirements.txt"
     exit 1
 }
-Write-Host "  ✓ matplotlib, pandas, numpy found" -ForegroundColor Green
-
-# Check R installation (optional, only needed for Figure 7)
-$R_INSTALLED = $false
-try {
-    $rVersion = (Rscript --version 2>&1 | Select-String -Pattern "version").ToString()
-    Write-Host "  ✓ R found" -ForegroundColor Green
-    $R_INSTALLED = $true
-    
-    # Check metafor package
-    Rscript -e "library(metafor)" 2>$null
-    if ($LASTEXITCODE -ne 0) {
-        Write-Host "  ⚠ R package 'metafor' not installed. Figure 7 will be skipped." -ForegroundColor Yellow
-        Write-Host "    To install: Rscript -e `"install.packages('metafor')`""
-        $R_INSTALLED = $false
-    } else {
-        Write-Host "  ✓ R package 'metafor' found" -ForegroundColor Green
-    }
-} catch {
-    Write-Host "  ⚠ R not found. Figure 7 will be skipped." -ForegroundColor Yellow
-}
+Write-Host "  ✓ matplotlib, pandas, numpy, scipy found" -ForegroundColor Green
 
 Write-Host ""
 Write-Host "======================================================================" -ForegroundColor Cyan
-Write-Host "Generating Python Figures (2, 3, 4, 5, 6)" -ForegroundColor Cyan
+Write-Host "Generating Python Figures (2, 3, 4, 5, 6, 7)" -ForegroundColor Cyan
 Write-Host "======================================================================" -ForegroundColor Cyan
 Write-Host ""
 
@@ -85,49 +66,16 @@ $PYTHON_SCRIPTS = @(
     "Generate_Figure3_CostEffectiveness.py",
     "Generate_Figure4_HRC.py",
     "Generate_Figure5_Sensitivity.py",
-    "Generate_Figure6_Competency.py"
+    "Generate_Figure6_Competency.py",
+    "Generate_Figure7_Forest.py"
 )
 
-# Generate Python figures
-$PYTHON_SUCCESS = 0
-foreach ($script in $PYTHON_SCRIPTS) {
-    Write-Host "Running: $script" -ForegroundColor White
-    Set-Location "$START_DIR\code\python"
-    python $script
-    if ($LASTEXITCODE -eq 0) {
-        Write-Host "  ✓ Success" -ForegroundColor Green
-        $PYTHON_SUCCESS++
-    } else {
-        Write-Host "  ✗ Failed" -ForegroundColor Red
-    }
-    Write-Host ""
-    Set-Location $START_DIR
-}
-
-Write-Host ""
-Write-Host "======================================================================" -ForegroundColor Cyan
-Write-Host "Generating R Figure (7)" -ForegroundColor Cyan
-Write-Host "======================================================================" -ForegroundColor Cyan
-Write-Host ""
-
-# Generate R figure if R is available
-$R_SUCCESS = 0
-if ($R_INSTALLED) {
-    Write-Host "Running: Paper_Figure_7.R" -ForegroundColor White
-    Set-Location "$START_DIR\code\r"
-    Rscript Paper_Figure_7.R
-    if ($LASTEXITCODE -eq 0) {
-        Write-Host "  ✓ Success" -ForegroundColor Green
-        $R_SUCCESS = 1
-    } else {
-        Write-Host "  ✗ Failed" -ForegroundColor Red
-    }
-    Write-Host ""
-    Set-Location $START_DIR
-} else {
-    Write-Host "Skipping Figure 7 (R not available)" -ForegroundColor Yellow
-    Write-Host ""
-}
+# Generate Python figures (one warm process pool, see code\python\arc_figures)
+Set-Location "$START_DIR\code\python"
+python -m arc_figures build @args @PYTHON_SCRIPTS
+$PYTHON_FAILED = [Math]::Min($LASTEXITCODE, $PYTHON_SCRIPTS.Count)
+$PYTHON_SUCCESS = $PYTHON_SCRIPTS.Count - $PYTHON_FAILED
+Set-Location $START_DIR
 
 Write-Host ""
 Write-Host "======================================================================" -ForegroundColor Cyan
@@ -135,9 +83,6 @@ Write-Host "Summary" -ForegroundColor Cyan
 Write-Host "======================================================================" -ForegroundColor Cyan
 Write-Host ""
 Write-Host "Python figures generated: $PYTHON_SUCCESS / $($PYTHON_SCRIPTS.Count)"
-if ($R_INSTALLED) {
-    Write-Host "R figures generated: $R_SUCCESS / 1"
-}
 Write-Host ""
 Write-Host "Generated figures are in: figures\"
 Write-Host ""
@@ -149,14 +94,8 @@ Get-ChildItem "figures\*.png" -ErrorAction SilentlyContinue | ForEach-Object {
     Write-Host "   $($_.Name) - $size"
 }
 
-$TOTAL_SUCCESS = $PYTHON_SUCCESS + $R_SUCCESS
-$TOTAL_EXPECTED = $PYTHON_SCRIPTS.Count
-if ($R_INSTALLED) {
-    $TOTAL_EXPECTED++
-}
-
 Write-Host ""
-if ($TOTAL_SUCCESS -eq $TOTAL_EXPECTED) {
+if ($PYTHON_SUCCESS -eq $PYTHON_SCRIPTS.Count) {
     Write-Host "✓ All figures generated successfully!" -ForegroundColor Green
     exit 0
 } else {
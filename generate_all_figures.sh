@@ -3,8 +3,9 @@
 # ARC Framework: Generate All Figures
 # ==============================================================================
 # This script generates all figures from the paper.
-# Prerequisites: Python 3.8+, R 4.0+, required packages installed
-# Usage: bash generate_all_figures.sh
+# Prerequisites: Python 3.8+, required packages installed
+# Usage: bash generate_all_figures.sh [--force]
+#   Unchanged figures are skipped; --force re-renders every figure.
 # ==============================================================================
 
 echo "======================================================================"
@@ -37,37 +38,17 @@ echo "  ✓ Python $PYTHON_VERSION found"
 
 # Check required Python packages
 echo "Checking Python packages..."
-python3 -c "import matplotlib, pandas, numpy" 2>/dev/null
+python3 -c "import matplotlib, pandas, numpy, scipy" 2>/dev/null
 if [ $? -ne 0 ]; then
     echo "ERROR: Required Python packages not installed."
     echo "Please run: pip install -r requirements.txt"
     exit 1
 fi
-echo "  ✓ matplotlib, pandas, numpy found"
-
-# Check R installation (optional, only needed for Figure 7)
-R_INSTALLED=false
-if command -v Rscript &> /dev/null; then
-    R_VERSION=$(Rscript --version 2>&1 | head -1 | awk '{print $5}')
-    echo "  ✓ R $R_VERSION found"
-    R_INSTALLED=true
-    
-    # Check metafor package
-    Rscript -e "library(metafor)" 2>/dev/null
-    if [ $? -ne 0 ]; then
-        echo "  ⚠ R package 'metafor' not installed. Figure 7 will be skipped."
-        echo "    To install: Rscript -e \"install.packages('metafor')\""
-        R_INSTALLED=false
-    else
-        echo "  ✓ R package 'metafor' found"
-    fi
-else
-    echo "  ⚠ R not found. Figure 7 will be skipped."
-fi
+echo "  ✓ matplotlib, pandas, numpy, scipy found"
 
 echo ""
 echo "======================================================================"
-echo "Generating Python Figures (2, 3, 4, 5, 6)"
+echo "Generating Python Figures (2, 3, 4, 5, 6, 7)"
 echo "======================================================================"
 echo ""
 
@@ -78,48 +59,18 @@ PYTHON_SCRIPTS=(
     "Generate_Figure4_HRC.py"
     "Generate_Figure5_Sensitivity.py"
     "Generate_Figure6_Competency.py"
+    "Generate_Figure7_Forest.py"
 )
 
-# Generate Python figures
-PYTHON_SUCCESS=0
-for script in "${PYTHON_SCRIPTS[@]}"; do
-    echo "Running: $script"
-    cd "$START_DIR/code/python" || exit 1
-    python3 "$script"
-    if [ $? -eq 0 ]; then
-        echo "  ✓ Success"
-        ((PYTHON_SUCCESS++))
-    else
-        echo "  ✗ Failed"
-    fi
-    echo ""
-    cd "$START_DIR" || exit 1
-done
-
-echo ""
-echo "======================================================================"
-echo "Generating R Figure (7)"
-echo "======================================================================"
-echo ""
-
-# Generate R figure if R is available
-R_SUCCESS=0
-if [ "$R_INSTALLED" = true ]; then
-    echo "Running: Paper_Figure_7.R"
-    cd "$START_DIR/code/r" || exit 1
-    Rscript Paper_Figure_7.R
-    if [ $? -eq 0 ]; then
-        echo "  ✓ Success"
-        R_SUCCESS=1
-    else
-        echo "  ✗ Failed"
-    fi
-    echo ""
-    cd "$START_DIR" || exit 1
-else
-    echo "Skipping Figure 7 (R not available)"
-    echo ""
+# Generate Python figures (one warm process pool, see code/python/arc_figures)
+cd "$START_DIR/code/python" || exit 1
+python3 -m arc_figures build "$@" "${PYTHON_SCRIPTS[@]}"
+PYTHON_FAILED=$?
+if [ $PYTHON_FAILED -gt ${#PYTHON_SCRIPTS[@]} ]; then
+    PYTHON_FAILED=${#PYTHON_SCRIPTS[@]}
 fi
+PYTHON_SUCCESS=$((${#PYTHON_SCRIPTS[@]} - PYTHON_FAILED))
+cd "$START_DIR" || exit 1
 
 echo ""
 echo "======================================================================"
@@ -127,9 +78,6 @@ echo "Summary"
 echo "======================================================================"
 echo ""
 echo "Python figures generated: $PYTHON_SUCCESS / ${#PYTHON_SCRIPTS[@]}"
-if [ "$R_INSTALLED" = true ]; then
-    echo "R figures generated: $R_SUCCESS / 1"
-fi
 echo ""
 echo "Generated figures are in: figures/"
 echo ""
@@ -138,10 +86,7 @@ echo ""
 echo "Files in figures/ directory:"
 ls -lh figures/*.png 2>/dev/null | awk '{print "  ", $9, "-", $5}'
 
-TOTAL_SUCCESS=$((PYTHON_SUCCESS + R_SUCCESS))
-TOTAL_EXPECTED=$((${#PYTHON_SCRIPTS[@]} + (R_INSTALLED ? 1 : 0)))
-
-if [ $TOTAL_SUCCESS -eq $TOTAL_EXPECTED ]; then
+if [ $PYTHON_SUCCESS -eq ${#PYTHON_SCRIPTS[@]} ]; then
     echo ""
     echo "✓ All figures generated successfully!"
     exit 0